@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+# Benchmarks for the syllabifier.
+#
+# Each case is timed several times and its best time is divided by the best time
+# of a fixed pure-Python calibration loop, so results from different machines can
+# be compared. The loop runs for several milliseconds and is timed between every
+# measurement of every case, so a slow spell of the machine shifts both alike
+# instead of skewing every relative time at once. Results are written as JSON and
+# compared against a stored baseline; a case that is slower than the baseline by
+# more than the tolerance is measured again with the full number of repeats, and
+# the run fails if it is still slower.
+#
+#   python benchmarks/run.py                    # compare against benchmarks/baseline.json
+#   python benchmarks/run.py --save-baseline    # record a new baseline
+#   python benchmarks/run.py --quick -k cmudict # one measurement, only matching cases
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import timeit
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from syllabifier import syllabifyARPA  # noqa: E402
+from syllabifier.constants import CONSONANTS  # noqa: E402
+from syllabifier.constants import PHONESET  # noqa: E402
+from syllabifier.io import readLexicon  # noqa: E402
+
+BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+CMUDICT = os.path.join(ROOT, 'tests', 'cmudict.txt')
+
+SHORT_WORD = 'K AE1 T'
+LONG_WORD = 'AH0 S F IH1 K S IY0 EY2 T AH0 D'
+BAD_WORD = 'AE1 G R P'
+
+CASES = {}
+
+# Iterations of the calibration loop, and times it is measured between two
+# measurements of the cases
+CALIBRATION_LOOPS = 100000
+CALIBRATION_REPEAT = 3
+
+# Times a case over the tolerance is measured again before it counts as a
+# regression
+CONFIRM_RUNS = 2
+
+
+def benchmark(name, number=1):
+    """
+    Registers a benchmark case. The decorated function is called once to set
+    the case up and returns the function to time, which is run number times
+    per measurement.
+    """
+    def register(setup):
+        CASES[name] = (setup, number)
+        return setup
+    return register
+
+
+def calibration():
+    total = 0
+    for i in range(CALIBRATION_LOOPS):
+        total += i % 7
+    return total
+
+
+@benchmark('single_word_short', number=10000)
+def singleWordShort():
+    return lambda: syllabifyARPA(SHORT_WORD)
+
+
+@benchmark('single_word_long', number=10000)
+def singleWordLong():
+    return lambda: syllabifyARPA(LONG_WORD)
+
+
+@benchmark('error_path_raise', number=10000)
+def errorPathRaise():
+    def run():
+        try:
+            syllabifyARPA(BAD_WORD)
+        except ValueError:
+            pass
+    return run
+
+
+@benchmark('error_path_silenced', number=10000)
+def errorPathSilenced():
+    return lambda: syllabifyARPA(BAD_WORD, silence_warnings=True)
+
+
+@benchmark('cmudict_throughput')
+def cmudictThroughput():
+    prons = [pron for word, pron, variant in readLexicon(CMUDICT)]
+
+    def run():
+        for pron in prons:
+            syllabifyARPA(pron, silence_warnings=True)
+    return run
+
+
+@benchmark('cvc_syllables')
+def cvcSyllables():
+    # The syllables of test_CVC_syllables in tests/test_syllabifier.py
+    vowels = PHONESET - CONSONANTS
+    syllables = [list(syllable) for syllable in itertools.product(
+        CONSONANTS - {'NG'}, vowels, CONSONANTS - {'HH', 'W', 'Y'})]
+
+    def run():
+        for syllable in syllables:
+            syllabifyARPA(syllable)
+    return run
+
+
+def runBenchmarks(pattern=None, repeat=5, names=None):
+    """
+    Runs the benchmark cases whose names contain pattern, or only the cases in
+    names if given. Each of the repeat rounds measures every case once, with the
+    calibration loop measured before each case and at the end, and the best
+    times are kept.
+
+    Returns:
+        Dictionary with the machine, the calibration time and, for each case,
+        its time per call in seconds and that time relative to the calibration.
+    """
+    cases = [(name, setup(), number) for name, (setup, number) in sorted(CASES.items())
+             if (not pattern or pattern in name) and (names is None or name in names)]
+    calibrations = []
+    times = {name: [] for name, function, number in cases}
+    for i in range(repeat):
+        for name, function, number in cases:
+            calibrations.extend(timeit.repeat(calibration, number=1, repeat=CALIBRATION_REPEAT))
+            times[name].append(timeit.timeit(function, number=number) / number)
+    calibrations.extend(timeit.repeat(calibration, number=1, repeat=CALIBRATION_REPEAT))
+
+    reference = min(calibrations)
+    results = {}
+    for name, seconds in times.items():
+        results[name] = {'seconds': min(seconds), 'relative': min(seconds) / reference}
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'calibration_seconds': reference,
+        'results': results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares relative times against a baseline.
+
+    Returns:
+        List of (name, baseline, current, ratio) tuples, one for each case that
+        is in both, and the list of names of the cases that regressed.
+    """
+    rows = []
+    regressions = []
+    for name, result in sorted(results['results'].items()):
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['relative']
+        ratio = result['relative'] / before
+        rows.append((name, before, result['relative'], ratio))
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return rows, regressions
+
+
+def confirmRegressions(results, baseline, tolerance, repeat):
+    """
+    Measures the cases that regressed again, up to CONFIRM_RUNS times, keeping
+    the best relative time of each, so a slow spell of the machine during one
+    measurement (most likely with --quick) is not reported as a regression.
+
+    Returns:
+        The rows and regressions of compare for the updated results.
+    """
+    rows, regressions = compare(results, baseline, tolerance)
+    for i in range(CONFIRM_RUNS):
+        if not regressions:
+            break
+        print('Measuring %s again' % ', '.join(regressions))
+        again = runBenchmarks(repeat=repeat, names=regressions)
+        for name, result in again['results'].items():
+            if result['relative'] < results['results'][name]['relative']:
+                results['results'][name] = result
+        rows, regressions = compare(results, baseline, tolerance)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the syllabifier benchmarks.')
+    parser.add_argument('-k', dest='pattern', help='only run cases whose names contain this')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='measurements per case (default: %(default)s)')
+    parser.add_argument('--quick', action='store_true',
+                        help='measure each case once (regressions are still measured '
+                        'again with --repeat)')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (default: %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE,
+                        help='baseline JSON file (default: benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write the results to the baseline file instead of comparing')
+    parser.add_argument('-o', '--output', help='also write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    results = runBenchmarks(args.pattern, 1 if args.quick else args.repeat)
+    for name, result in sorted(results['results'].items()):
+        print('%-24s %12.3f us %12.4g x calibration' % (
+            name, result['seconds'] * 1e6, result['relative']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Saved baseline to %s' % args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline at %s; run with --save-baseline first' % args.baseline)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows, regressions = confirmRegressions(results, baseline, args.tolerance, args.repeat)
+    print()
+    for name, before, after, ratio in rows:
+        print('%-24s %12.4g -> %12.4g  (%+.0f%%)%s' % (
+            name, before, after, (ratio - 1) * 100,
+            '  REGRESSION' if name in regressions else ''))
+    if regressions:
+        print('%d case(s) regressed by more than %.0f%%' % (len(regressions), args.tolerance * 100))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+# Startup benchmarks for the syllabifier.
+#
+# Short-lived processes pay for importing the package and for the first call on
+# top of the per-word cost measured by run.py. Each run starts a fresh
+# interpreter with -X importtime and reports the median over all runs of:
+#
+#   importtime: cumulative import time of the syllabifier package as reported by
+#               -X importtime
+#   import:     wall-clock time of `import syllabifier`
+#   first_call: wall-clock time of the first syllabifyARPA call after that
+#
+#   python benchmarks/startup.py              # with the legality table cache
+#   python benchmarks/startup.py --cold       # rebuilding the tables every run
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+# json is imported after measuring, as it imports modules (re, enum, ...) that
+# would otherwise not be counted for the package
+CHILD = '''
+import time
+start = time.perf_counter()
+import syllabifier
+imported = time.perf_counter()
+syllabifier.syllabifyARPA('HH AE1 NG M AE2 N')
+called = time.perf_counter()
+import json
+print(json.dumps({'import': imported - start, 'first_call': called - imported}))
+'''
+
+
+def runChild(env):
+    """
+    Runs one fresh interpreter.
+
+    Returns:
+        Dictionary from measurement name to seconds.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], env=env,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             universal_newlines=True, check=True)
+    times = json.loads(process.stdout)
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == 'syllabifier':
+            times['importtime'] = int(fields[1]) / 1e6
+    return times
+
+
+def runStartup(runs=10, cold=False):
+    """
+    Measures startup over several fresh interpreters.
+
+    Returns:
+        Dictionary from measurement name to its median in seconds.
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    samples = []
+    with tempfile.TemporaryDirectory() as cache:
+        env['SYLLABIFIER_CACHE_DIR'] = cache if not cold else ''
+        # Fills the table cache and the bytecode cache before measuring
+        runChild(env)
+        for i in range(runs):
+            samples.append(runChild(env))
+    return {name: statistics.median(sample[name] for sample in samples)
+            for name in samples[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure syllabifier startup time.')
+    parser.add_argument('-n', '--runs', type=int, default=10,
+                        help='interpreters to start (default: %(default)s)')
+    parser.add_argument('--cold', action='store_true',
+                        help='turn off the legality table cache')
+    parser.add_argument('-o', '--output', help='also write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    results = runStartup(args.runs, args.cold)
+    for name, seconds in sorted(results.items()):
+        print('%-12s %10.2f ms' % (name, seconds * 1e3))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,6 @@ import nox
 @nox.session
 def tests(session):
     session.install('pytest')
-    session.install('.')
+    session.install('.[numpy]')
     session.run('pytest')
 
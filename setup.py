@@ -16,11 +16,18 @@ setuptools.setup(
     long_description=long_description,
     packages=setuptools.find_packages(where='src', exclude=('tests',)),
     package_dir={'': 'src'},
-    python_requires='>= 3.5',
+    package_data={'syllabifier': ['*.json']},
+    python_requires='>= 3.7',
     setup_requires=requirements,
     install_requires=requirements,
+    extras_require={
+        'numpy': ['numpy'],
+    },
     tests_require='pytest',
     include_package_data=True,
+    entry_points={
+        'console_scripts': ['syllabifier=syllabifier.__main__:main'],
+    },
     platforms='any',
     classifiers=[
         'Natural Language :: English',
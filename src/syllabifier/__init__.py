@@ -1,2 +1,39 @@
 #!/usr/bin/env python3
+from syllabifier.phones import decode
+from syllabifier.phones import encode
+from syllabifier.result import Syllabification
+from syllabifier.syllabifyARPA import Status
+from syllabifier.syllabifyARPA import syllabify
 from syllabifier.syllabifyARPA import syllabifyARPA
+from syllabifier.syllabifyARPA import syllabifyIDs
+from syllabifier.syllabifyARPA import syllabify_many
+
+# Names whose modules import more of the standard library (multiprocessing,
+# mmap, ...) are only imported when first used
+LAZY_NAMES = {
+    'CachedSyllabifier': 'syllabifier.cache',
+    'IncrementalSyllabifier': 'syllabifier.incremental',
+    'SyllabificationLattice': 'syllabifier.lattice',
+    'SyllabifiedLexicon': 'syllabifier.index',
+    'SyllableInventory': 'syllabifier.inventory',
+    'SyllableStats': 'syllabifier.stats',
+    'lexicon_stats': 'syllabifier.stats',
+    'syllabify_lattice': 'syllabifier.lattice',
+    'syllabify_lexicon': 'syllabifier.lexicon',
+    'syllabify_phrase': 'syllabifier.phrase',
+    'syllabify_phrases': 'syllabifier.phrase',
+}
+
+
+def __getattr__(name):
+    if name not in LAZY_NAMES:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    # __import__ returns the module itself when given a fromlist, and saves
+    # importing importlib
+    value = getattr(__import__(LAZY_NAMES[name], fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(LAZY_NAMES))
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+import argparse
+import itertools
+import os
+import sys
+
+from syllabifier.io import DEFAULT_ENCODING
+from syllabifier.io import SYLLABLE_SEPARATOR
+from syllabifier.io import writeLexicon
+from syllabifier.lexicon import syllabify_lexicon
+
+
+def main(argv=None):
+    """
+    Runs 'syllabifier [options] [lexicon ...]' to syllabify lexicons to standard
+    output, or 'syllabifier COMMAND ...' for the commands in COMMANDS.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    return syllabifyMain(argv)
+
+
+def syllabifyMain(argv):
+    parser = argparse.ArgumentParser(
+        prog='syllabifier', description='Syllabify CMUdict-format lexicons. Other commands: %s.'
+        % ', '.join(sorted(COMMANDS)))
+    parser.add_argument('lexicons', nargs='*', default=['-'], metavar='lexicon',
+                        help='lexicons to syllabify (default: standard input)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('--chunksize', type=int, default=1000,
+                        help='entries sent to a worker at a time (default: 1000)')
+    parser.add_argument('--encoding', default=DEFAULT_ENCODING,
+                        help='encoding of the lexicons (default: %(default)s)')
+    parser.add_argument('--separator', default=SYLLABLE_SEPARATOR,
+                        help='string between syllables (default: %(default)r)')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='do not report unsyllabifiable entries on standard error')
+    parser.add_argument('--syllabic-consonants', action='store_true',
+                        help='let L, M, N and R be nuclei in entries that cannot be '
+                             'syllabified otherwise')
+    parser.add_argument('--rules',
+                        help='syllabify with the rules in this file instead of the default ones')
+    parser.add_argument('--dedup', action='store_true',
+                        help='syllabify each distinct pronunciation once')
+    parser.add_argument('--ignore-stress', action='store_true',
+                        help='with --dedup, also share work between pronunciations that only '
+                             'differ in stress')
+    args = parser.parse_args(argv)
+
+    engine = 'table'
+    if args.rules:
+        from syllabifier.rules import RuleSet
+        engine = RuleSet.load(args.rules).splitRun
+
+    results = itertools.chain.from_iterable(
+        syllabify_lexicon(lexicon, args.workers, args.chunksize, args.encoding, engine=engine,
+                          syllabic_consonants=args.syllabic_consonants, dedup=args.dedup,
+                          ignore_stress=args.ignore_stress)
+        for lexicon in args.lexicons)
+    try:
+        writeLexicon(sys.stdout, results, args.separator,
+                     errors=None if args.quiet else sys.stderr)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+def indexMain(argv):
+    from syllabifier.index import buildIndex
+
+    parser = argparse.ArgumentParser(
+        prog='syllabifier index',
+        description='Build a syllabified lexicon index for SyllabifiedLexicon.')
+    parser.add_argument('lexicon', help="lexicon to index ('-' for standard input)")
+    parser.add_argument('output', help='path of the index file to write')
+    parser.add_argument('--encoding', default=DEFAULT_ENCODING,
+                        help='encoding of the lexicon (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    written, skipped = buildIndex(args.lexicon, args.output, args.encoding)
+    print('Indexed %d pronunciations, skipped %d unsyllabifiable ones' % (written, skipped),
+          file=sys.stderr)
+    return 0
+
+
+def serveMain(argv):
+    from syllabifier.service import serve
+
+    parser = argparse.ArgumentParser(
+        prog='syllabifier serve',
+        description='Serve syllabification over TCP as newline-delimited JSON.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='port to listen on (default: %(default)s)')
+    parser.add_argument('--max-batch', type=int, default=256,
+                        help='largest batch of words syllabified at once (default: %(default)s)')
+    parser.add_argument('--max-delay', type=float, default=0.002,
+                        help='seconds a word waits for its batch to fill (default: %(default)s)')
+    parser.add_argument('--max-pending', type=int, default=4096,
+                        help='words queued before callers wait (default: %(default)s)')
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                        help='syllabify batches in this many processes '
+                             '(default: a thread of the server process)')
+    args = parser.parse_args(argv)
+
+    executor = None
+    if args.workers > 0:
+        import concurrent.futures
+        executor = concurrent.futures.ProcessPoolExecutor(args.workers)
+    print('Serving on %s:%d' % (args.host, args.port), file=sys.stderr)
+    try:
+        serve(args.host, args.port, max_batch=args.max_batch, max_delay=args.max_delay,
+              max_pending=args.max_pending, executor=executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return 0
+
+
+def verifyMain(argv):
+    from syllabifier.verify import UNKNOWN_CLUSTER
+    from syllabifier.verify import summarizeDiffs
+    from syllabifier.verify import verify_lexicon
+
+    parser = argparse.ArgumentParser(
+        prog='syllabifier verify',
+        description='Compare the syllabification of a whole lexicon against a reference '
+                    'file or another engine. Exits with status 1 if anything differs.')
+    parser.add_argument('lexicon', help="lexicon to verify ('-' for standard input)")
+    reference = parser.add_mutually_exclusive_group(required=True)
+    reference.add_argument('--reference', metavar='FILE',
+                           help='syllabified lexicon to compare against, in lexicon order '
+                                '(e.g. earlier output of the syllabifier command)')
+    reference.add_argument('--reference-engine', metavar='ENGINE',
+                           help='engine to compare against')
+    parser.add_argument('--engine', default='table',
+                        help='engine to verify (default: %(default)s)')
+    parser.add_argument('--rules', metavar='FILE',
+                        help='verify the rules in this file instead of an engine')
+    parser.add_argument('--diffs', metavar='FILE',
+                        help='write every difference to this file as it is found, one '
+                             'tab-separated WORD CLUSTER EXPECTED ACTUAL line each')
+    parser.add_argument('--examples', type=int, default=3,
+                        help='example words shown per cluster (default: %(default)s)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('--chunksize', type=int, default=1000,
+                        help='entries sent to a worker at a time (default: 1000)')
+    parser.add_argument('--encoding', default=DEFAULT_ENCODING,
+                        help='encoding of the lexicon and reference (default: %(default)s)')
+    parser.add_argument('--separator', default=SYLLABLE_SEPARATOR,
+                        help='string between syllables in the reference (default: %(default)r)')
+    args = parser.parse_args(argv)
+
+    engine = args.engine
+    if args.rules:
+        from syllabifier.rules import RuleSet
+        engine = RuleSet.load(args.rules).splitRun
+
+    diffs = verify_lexicon(args.lexicon, args.reference, engine, args.reference_engine,
+                           args.workers, args.chunksize, args.encoding, args.separator)
+    if args.diffs:
+        diffs = writeDiffs(args.diffs, diffs, args.separator, args.encoding)
+    summary = summarizeDiffs(diffs, args.examples)
+
+    total = sum(count for cluster, count, words in summary)
+    print('%d entries differ in %d clusters' % (total, len(summary)))
+    for cluster, count, words in summary:
+        print('%8d  %-16s %s' % (count, cluster or UNKNOWN_CLUSTER, ' '.join(words)))
+    return 1 if total else 0
+
+
+def statsMain(argv):
+    from syllabifier.stats import FORMATS
+    from syllabifier.stats import lexicon_stats
+    from syllabifier.stats import writeStats
+
+    parser = argparse.ArgumentParser(
+        prog='syllabifier stats',
+        description='Count syllables, onsets, codas, CV templates, syllables per word and '
+                    'rejection reasons over lexicons.')
+    parser.add_argument('lexicons', nargs='*', default=['-'], metavar='lexicon',
+                        help='lexicons to count (default: standard input)')
+    parser.add_argument('--format', choices=FORMATS, default='json',
+                        help='report format (default: %(default)s)')
+    parser.add_argument('-o', '--output', help='write the report to this file')
+    parser.add_argument('--frequencies', action='store_true',
+                        help='weight each entry by the token frequency at the end of its line')
+    parser.add_argument('--engine', default='table',
+                        help='syllabification engine (default: %(default)s)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('--chunksize', type=int, default=1000,
+                        help='entries sent to a worker at a time (default: 1000)')
+    parser.add_argument('--encoding', default=DEFAULT_ENCODING,
+                        help='encoding of the lexicons (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    stats = lexicon_stats(args.lexicons[0], args.workers, args.chunksize, args.encoding,
+                          args.engine, args.frequencies)
+    for lexicon in args.lexicons[1:]:
+        stats.merge(lexicon_stats(lexicon, args.workers, args.chunksize, args.encoding,
+                                  args.engine, args.frequencies))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            writeStats(f, stats, args.format)
+        return 0
+    try:
+        writeStats(sys.stdout, stats, args.format)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+def writeDiffs(path, diffs, separator, encoding):
+    """
+    Writes differences to a file as they pass through.
+    """
+    with open(path, 'w', encoding=encoding) as f:
+        for diff in diffs:
+            f.write('%s\t%s\t%s\t%s\n' % (diff.word, diff.cluster, separator.join(diff.expected),
+                                          separator.join(diff.actual)))
+            yield diff
+
+
+COMMANDS = {
+    'index': indexMain,
+    'serve': serveMain,
+    'stats': statsMain,
+    'verify': verifyMain,
+}
+
+
+if __name__ == '__main__':
+    sys.exit(main())
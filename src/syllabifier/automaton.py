@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# automaton:
+# The 'fsa' syllabification engine. The legal onsets and codas are a finite
+# language over consonant IDs, so they are compiled once into two deterministic
+# automata: one that reads onsets backwards from the vowel, and one that reads
+# codas forwards. Splitting a consonant run is then one backwards scan to find the
+# longest legal onset and one forwards scan over what is left, with no list
+# copying between steps. The automata are recompiled when useRules switches rules.
+
+import sys
+
+from syllabifier.syllabifyARPA import INITIAL
+from syllabifier.syllabifyARPA import MEDIAL
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+
+class Automaton(object):
+    """
+    Deterministic automaton accepting a finite set of phone ID sequences. States
+    are numbered from 0 (the start state); transitions[state] maps a phone ID to
+    the next state and accepting[state] tells if the sequence read so far is in
+    the set.
+
+    Args:
+        sequences: An iterable of tuples of phone IDs
+    """
+
+    def __init__(self, sequences):
+        self.transitions = [{}]
+        self.accepting = [False]
+        for sequence in sequences:
+            state = 0
+            for phone_id in sequence:
+                if phone_id not in self.transitions[state]:
+                    self.transitions[state][phone_id] = len(self.transitions)
+                    self.transitions.append({})
+                    self.accepting.append(False)
+                state = self.transitions[state][phone_id]
+            self.accepting[state] = True
+
+    def accepts(self, run, end):
+        """
+        Tests if run[:end] is in the set.
+        """
+        transitions = self.transitions
+        state = 0
+        for i in range(end):
+            state = transitions[state].get(run[i])
+            if state is None:
+                return False
+        return self.accepting[state]
+
+    def longestSuffix(self, run):
+        """
+        Returns the length of the longest suffix of run whose reversal is in the
+        set, reading run backwards until no transition is left.
+        """
+        transitions = self.transitions
+        accepting = self.accepting
+        state = 0
+        longest = 0
+        for length in range(1, len(run) + 1):
+            state = transitions[state].get(run[-length])
+            if state is None:
+                break
+            if accepting[state]:
+                longest = length
+        return longest
+
+
+def compileAutomata(rules):
+    """
+    Compiles the onset and coda automata of a RuleSet.
+
+    Returns:
+        Tuple of the onset automaton, which reads onsets backwards, and the
+        coda automaton.
+    """
+    return Automaton(onset[::-1] for onset in rules.onset_ids), Automaton(rules.coda_ids)
+
+
+def useRules(rules):
+    """
+    Recompiles the automata for the rules that syllabifyARPA.useRules
+    switched to.
+    """
+    global AUTOMATA
+    AUTOMATA = compileAutomata(rules)
+
+
+AUTOMATA = compileAutomata(CORE.RULES)
+CORE.RULE_HOOKS.append(useRules)
+
+
+def splitRun(run, position):
+    """
+    Splits a run of consonant IDs like syllabifyARPA.splitRun, using the
+    compiled automata.
+    """
+    onset_automaton, coda_automaton = AUTOMATA
+    if position == MEDIAL:
+        onset = onset_automaton.longestSuffix(run)
+        return onset if coda_automaton.accepts(run, len(run) - onset) else None
+    if position == INITIAL:
+        return len(run) if onset_automaton.longestSuffix(run) == len(run) else None
+    return 0 if coda_automaton.accepts(run, len(run)) else None
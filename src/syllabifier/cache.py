@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# cache:
+# Opt-in memoization for workloads where the same pronunciations come up again and
+# again, e.g. running text in a TTS front-end.
+
+import functools
+import sys
+
+from syllabifier.phones import PHONE_IDS
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import ERROR_MESSAGES
+from syllabifier.syllabifyARPA import SYLLABIC_RESCUES
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import joinSyllables
+from syllabifier.syllabifyARPA import scanPhoneIDs
+from syllabifier.syllabifyARPA import scanSyllabic
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+
+class CachedSyllabifier(object):
+    """
+    syllabifyARPA with a bounded LRU cache keyed on the upper-cased phone tuple,
+    the engine and syllabic_consonants options and the rules in use, so results
+    from before useRules are not returned after it. Syllabifications are returned as tuples, so callers cannot modify cached
+    entries, and inputs are never modified.
+
+    Args:
+        maxsize: Maximum number of cached pronunciations (default 65536), or
+        None for an unbounded cache
+    """
+
+    def __init__(self, maxsize=65536):
+        self._syllabify = functools.lru_cache(maxsize=maxsize)(syllabifyPhones)
+
+    def __call__(self, arpa_arr, silence_warnings=False, engine='table',
+                 syllabic_consonants=False):
+        """
+        Syllabifies an ARPABET transcription like syllabifyARPA does, with the
+        same arguments.
+
+        Returns:
+            Tuple of strings with syllables in each row, which is empty if the
+            input is unsyllabifiable and silence_warnings is set.
+        """
+        phones = tuple(tokenize(arpa_arr)[0])
+
+        status, syllables = self._syllabify(phones, CORE.RULES.key, engine, syllabic_consonants)
+        if status and not silence_warnings:
+            raise ValueError(ERROR_MESSAGES[status] % ' '.join(phones))
+        return syllables
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maxsize and currsize of the cache as a named
+        tuple, like functools.lru_cache does.
+        """
+        return self._syllabify.cache_info()
+
+    def cache_clear(self):
+        """
+        Empties the cache and resets its statistics.
+        """
+        self._syllabify.cache_clear()
+
+
+def syllabifyPhones(phones, rules, engine='table', syllabic_consonants=False):
+    """
+    Syllabifies a tuple of upper-case ARPABET phones with the rules in use.
+
+    Args:
+        phones: The tuple of phones
+        rules: The key of the rules in use, which only serves as a cache key
+        engine: Name of the syllabification engine, or a splitRun function
+        syllabic_consonants: Boolean to rescan with syllabic consonants, see
+        scanSyllabic
+
+    Returns:
+        Tuple of a Status and a tuple of syllable strings, which is empty unless
+        the status is Status.OK.
+    """
+    ids = [PHONE_IDS.get(phone) for phone in phones]
+    status, starts = scanPhoneIDs(ids, getEngine(engine))
+    if status in SYLLABIC_RESCUES and syllabic_consonants:
+        status, starts = scanSyllabic(ids, status, getEngine(engine))
+    if status:
+        return status, ()
+    return status, tuple(joinSyllables(phones, starts))
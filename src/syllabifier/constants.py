@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import re
 
 # Sets required to check for valid onset and coda clusters
 VOICELESS = set(['K', 'P', 'T', 'F', 'HH', 'S', 'SH', 'TH', 'CH'])
@@ -12,6 +11,9 @@ NASALS = set(['M', 'N', 'NG'])
 APPROXIMANTS = set(['L', 'R', 'W', 'Y'])
 CONSONANTS = STOPS.union(FRICATIVES).union(AFFRICATES).union(NASALS).union(APPROXIMANTS)
 
+VOICELESS_STOPS = VOICELESS.intersection(STOPS)
+VOICELESS_FRICATIVES = VOICELESS.intersection(FRICATIVES)
+
 S_EXTENDED_CODAS = set(['K', 'P', 'T', 'F', 'TH', 'D', 'NG'])
 Z_EXTENDED_CODAS = set(['G', 'B', 'D', 'DH', 'V', 'M', 'N', 'NG', 'L'])
 
@@ -24,5 +26,27 @@ PHONESET = set(['AA', 'AE', 'AH', 'AO', 'AW', 'AY', 'B',
                 'NG', 'OW', 'OY', 'P', 'R', 'S', 'SH', 'T',
                 'TH', 'UH', 'UW', 'V', 'W', 'Y', 'Z', 'ZH'])
 
+VOWELS = PHONESET.difference(CONSONANTS)
+
+# Sonorants that can be the nucleus of a syllable without a vowel after an
+# obstruent, e.g. the L of B IY T L (beetle); R stands in for a syllabic ER
+SYLLABIC_CONSONANTS = set(['L', 'M', 'N', 'R'])
+OBSTRUENTS = STOPS.union(FRICATIVES).union(AFFRICATES)
+STRESS_MARKERS = ['', '0', '1', '2']
+
+# Every vowel with and without a stress marker, for constant-time vowel checks
+STRESSED_VOWELS = set(vowel + stress for vowel in VOWELS for stress in STRESS_MARKERS)
+
 # Optional stress markers (0,1,2) after the vowel for flexibility
-VOWELS_REGEX = re.compile(r'(?:AA|AE|AH|AO|AW|AY|EH|ER|EY|IH|IY|OW|OY|UW|UH)[012]?')
+VOWELS_PATTERN = r'(?:AA|AE|AH|AO|AW|AY|EH|ER|EY|IH|IY|OW|OY|UW|UH)[012]?'
+
+
+def __getattr__(name):
+    # VOWELS_REGEX is compiled on first use, so importing the package does not
+    # load re
+    if name == 'VOWELS_REGEX':
+        import re
+        global VOWELS_REGEX
+        VOWELS_REGEX = re.compile(VOWELS_PATTERN)
+        return VOWELS_REGEX
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# diskcache:
+# On-disk cache of tables that are derived from the syllabification rules, so
+# short-lived processes load them with marshal instead of rebuilding them on every
+# import. Entries are keyed on a hash of the files the tables are built from
+# and the marshal format, so editing the rules or upgrading Python rebuilds them.
+# The cache lives in $SYLLABIFIER_CACHE_DIR (default ~/.cache/syllabifier); set
+# it to an empty string to turn caching off. Only the MAX_ENTRIES most recently
+# used entries of each table are kept, so edited rule files do not pile up.
+
+import marshal
+import os
+import sys
+
+# Entries kept per table name
+MAX_ENTRIES = 8
+
+
+def cacheDir():
+    """
+    Returns the cache directory, or None if caching is turned off.
+    """
+    path = os.environ.get('SYLLABIFIER_CACHE_DIR')
+    if path is None:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        path = os.path.join(base, 'syllabifier')
+    return path or None
+
+
+def sourceKey(sources, data=b''):
+    """
+    Returns a BLAKE2 hash of the contents of source files and of extra data
+    bytes as a hex string, or None if one of the files cannot be read (e.g. when
+    running from a zip file).
+    """
+    # Imported here, as only loading rules needs it. hashlib takes several times
+    # longer to import than _blake2, which it takes blake2b from in CPython.
+    try:
+        from _blake2 import blake2b
+    except ImportError:
+        from hashlib import blake2b
+    checksum = blake2b(digest_size=16)
+    checksum.update(('%s %d\0' % (sys.implementation.cache_tag, marshal.version)).encode())
+    checksum.update(b'%d\0' % len(data))
+    checksum.update(data)
+    try:
+        for source in sources:
+            with open(source, 'rb') as f:
+                checksum.update(f.read())
+    except OSError:
+        return None
+    return checksum.hexdigest()
+
+
+def loadCached(name, sources, build, data=b'', key=None):
+    """
+    Loads a table from the cache, or builds it and stores it in the cache.
+
+    Args:
+        name: Name of the table, used in its file name
+        sources: Paths of the files the table is built from
+        build: Function without arguments that builds the table. Its result must
+        be serializable with marshal.
+        data: Bytes the table is built from besides the files, e.g. rule data
+        key: The sourceKey of sources and data, if the caller has it already
+
+    Returns:
+        The table.
+    """
+    directory = cacheDir()
+    if directory and key is None:
+        key = sourceKey(sources, data)
+    if not directory or key is None:
+        return build()
+
+    path = os.path.join(directory, '%s-%s.marshal' % (name, key))
+    try:
+        with open(path, 'rb') as f:
+            table = marshal.load(f)
+        # Marks the entry as recently used for pruneCache
+        os.utime(path)
+        return table
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    table = build()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        writeMarshal(path, table)
+        pruneCache(directory, name)
+    except OSError:
+        pass
+    return table
+
+
+def pruneCache(directory, name):
+    """
+    Deletes all but the MAX_ENTRIES most recently used entries of a table.
+    """
+    prefix = name + '-'
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.startswith(prefix) and entry.name.endswith('.marshal'):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                pass
+    entries.sort(reverse=True)
+    for mtime, path in entries[MAX_ENTRIES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def writeMarshal(path, value):
+    """
+    Writes a value with marshal under a temporary name and renames it to path,
+    so readers never see a partial file.
+    """
+    temp = '%s.%d.tmp' % (path, os.getpid())
+    with open(temp, 'wb') as f:
+        marshal.dump(value, f)
+    os.replace(temp, path)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# incremental:
+# Syllabification of phones that arrive one at a time, e.g. from a recognizer.
+# A syllable is final as soon as the vowel after it arrives, because that is when
+# the consonant run between the two vowels is split into coda and onset, so each
+# syllable is emitted then instead of at the end of the word. Only the syllable in
+# progress and the consonant run after it are kept.
+
+from syllabifier.phones import ID_PHONES
+from syllabifier.phones import PHONE_IDS
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.phones import normalizePhone
+from syllabifier.syllabifyARPA import ERROR_MESSAGES
+from syllabifier.syllabifyARPA import FINAL
+from syllabifier.syllabifyARPA import INITIAL
+from syllabifier.syllabifyARPA import MEDIAL
+from syllabifier.syllabifyARPA import Status
+from syllabifier.syllabifyARPA import engineRules
+from syllabifier.syllabifyARPA import getEngine
+
+
+class IncrementalSyllabifier(object):
+    """
+    Syllabifies one word at a time from a stream of phones. push() each phone,
+    then flush() at the end of the word; together they return the same
+    syllables as syllabifyARPA on the whole word.
+
+    Errors are reported as soon as they are found, so syllables emitted before
+    them stay emitted, and the rest of the word is skipped until flush(). Error
+    messages name the phones that were still buffered rather than the whole
+    word.
+
+    Args:
+        silence_warnings: Boolean (default False) to suppress ValueErrors
+        engine: Name of the syllabification engine (default 'table')
+    """
+
+    def __init__(self, silence_warnings=False, engine='table'):
+        self.silence_warnings = silence_warnings
+        self.engine = engine
+        self.reset()
+
+    def push(self, phone):
+        """
+        Adds the next phone of the word.
+
+        Args:
+            phone: An ARPABET phone with an optional stress marker. Case does
+            not matter.
+
+        Returns:
+            List of the syllable strings that became final, which is empty
+            unless phone is a vowel.
+
+        Raises:
+            ValueError if the phone is not ARPABET or the word cannot be
+            syllabified, unless silence_warnings is set.
+        """
+        if self.status:
+            return []
+        if self._split is None:
+            self._split = getEngine(self.engine)
+            # Longest consonant run that can be split legally; longer runs are
+            # only counted
+            rules = engineRules(self._split)
+            self._max_run = rules.max_onset + rules.max_coda
+
+        phone_id = PHONE_IDS.get(phone)
+        if phone_id is None:
+            phone_id = PHONE_IDS.get(normalizePhone(phone))
+            if phone_id is None:
+                return self._fail(Status.NON_ARPABET, [normalizePhone(phone)])
+
+        if phone_id not in VOWEL_IDS:
+            if len(self._run) < self._max_run:
+                self._run.append(phone_id)
+            else:
+                self._overflow = True
+            return []
+
+        if not self._syllable:
+            if self._overflow or self._split(tuple(self._run), INITIAL) is None:
+                return self._fail(Status.BAD_ONSET, [ID_PHONES[phone_id]])
+            self._syllable = self._run + [phone_id]
+            self._run = []
+            return []
+
+        onset = None if self._overflow else self._split(tuple(self._run), MEDIAL)
+        if onset is None:
+            return self._fail(Status.BAD_CODA, [ID_PHONES[phone_id]])
+        coda = len(self._run) - onset
+        syllable = self._syllable + self._run[:coda]
+        self._syllable = self._run[coda:] + [phone_id]
+        self._run = []
+        return [' '.join(ID_PHONES[phone_id] for phone_id in syllable)]
+
+    def flush(self):
+        """
+        Ends the word and starts a new one.
+
+        Returns:
+            List of the remaining syllable strings, which is empty if the word
+            could not be syllabified.
+
+        Raises:
+            ValueError if the word has no vowel or ends in an illegal coda,
+            unless silence_warnings is set.
+        """
+        try:
+            if self.status:
+                return []
+            if not self._syllable:
+                if self._run or self._overflow:
+                    return self._fail(Status.NO_VOWEL, [])
+                return []
+            if self._overflow or self._split(tuple(self._run), FINAL) is None:
+                return self._fail(Status.BAD_CODA, [])
+            return [' '.join(ID_PHONES[phone_id] for phone_id in self._syllable + self._run)]
+        finally:
+            self.reset()
+
+    def reset(self):
+        """
+        Drops the word in progress.
+        """
+        self.status = Status.OK
+        # The engine is looked up when the first phone of the word arrives
+        self._split = None
+        self._syllable = []
+        self._run = []
+        self._overflow = False
+
+    def _fail(self, status, phones):
+        self.status = status
+        if not self.silence_warnings:
+            buffered = [ID_PHONES[phone_id] for phone_id in self._syllable + self._run]
+            raise ValueError(ERROR_MESSAGES[status] % ' '.join(buffered + phones))
+        return []
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+# index:
+# Precomputed syllabifications of a whole lexicon in a compact file that is read
+# through mmap, so lookups deserialize nothing up front and every process that
+# opens the same index shares its pages.
+#
+# File layout (all integers little-endian uint32):
+#   magic, number of words N
+#   N + 1 offsets of each word in the keys block, relative to its start
+#   N + 1 offsets of each word's record in the records block, relative to its start
+#   keys block: UTF-8 words, sorted by their bytes
+#   records block: for each pronunciation variant of the word, one byte with its
+#   CMUdict variant number, one byte with its number of phones L, L phone IDs and
+#   a bitmask of ceil(L / 8) bytes whose bit i is set when a syllable starts at
+#   phone i
+
+import mmap
+import struct
+
+from syllabifier.io import DEFAULT_ENCODING
+from syllabifier.io import readLexicon
+from syllabifier.phones import ID_PHONES
+from syllabifier.phones import PHONE_IDS
+from syllabifier.syllabifyARPA import joinSyllables
+from syllabifier.syllabifyARPA import scanPhoneIDs
+
+MAGIC = b'SYI2'
+HEADER = struct.Struct('<4sI')
+OFFSET = struct.Struct('<I')
+
+
+def buildIndex(lexicon, path, encoding=DEFAULT_ENCODING):
+    """
+    Syllabifies a CMUdict-format lexicon and writes the results as an index for
+    SyllabifiedLexicon. Entries that cannot be syllabified, or whose variant
+    number or number of phones does not fit in a byte, are left out.
+
+    Args:
+        lexicon: Path to a CMUdict-format lexicon, or anything else readLexicon
+        accepts
+        path: Path of the index file to write
+        encoding: Encoding of the lexicon (default latin-1)
+
+    Returns:
+        Tuple of the number of pronunciations written and the number left out.
+    """
+    records = {}
+    written = skipped = 0
+
+    for word, pron, variant in readLexicon(lexicon, encoding):
+        phones = pron.upper().split()
+        ids = [PHONE_IDS.get(phone) for phone in phones]
+        status, starts = scanPhoneIDs(ids)
+        if status or len(ids) > 255 or variant > 255:
+            skipped += 1
+            continue
+        records.setdefault(word.encode('utf-8'), []).append((variant, ids, starts))
+        written += 1
+
+    keys = sorted(records)
+    key_offsets = [0]
+    record_blocks = []
+    record_offsets = [0]
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key))
+        block = b''.join(packRecord(variant, ids, starts) for variant, ids, starts
+                         in sorted(records[key], key=lambda record: record[0]))
+        record_blocks.append(block)
+        record_offsets.append(record_offsets[-1] + len(block))
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(keys)))
+        f.write(struct.pack('<%dI' % len(key_offsets), *key_offsets))
+        f.write(struct.pack('<%dI' % len(record_offsets), *record_offsets))
+        f.writelines(keys)
+        f.writelines(record_blocks)
+
+    return written, skipped
+
+
+def packRecord(variant, ids, starts):
+    """
+    Packs one syllabified pronunciation as its variant number, length, phone IDs
+    and syllable start bitmask.
+    """
+    mask = bytearray((len(ids) + 7) // 8)
+    for start in starts:
+        mask[start // 8] |= 1 << (start % 8)
+    return bytes([variant, len(ids)]) + bytes(ids) + bytes(mask)
+
+
+class SyllabifiedLexicon(object):
+    """
+    Read-only view of an index written by buildIndex.
+
+    Args:
+        path: Path of the index file
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC or len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError('%s is not a syllabified lexicon index' % path)
+        self._size = HEADER.unpack_from(self._mmap, 0)[1]
+
+        self._key_offsets = HEADER.size
+        self._record_offsets = self._key_offsets + OFFSET.size * (self._size + 1)
+        self._keys = self._record_offsets + OFFSET.size * (self._size + 1)
+        self._records = self._keys + self._offset(self._key_offsets, self._size)
+
+    def lookup(self, word):
+        """
+        Looks up the syllabifications of a word. Words are matched exactly.
+
+        Returns:
+            List with the syllabification of each pronunciation variant of the
+            word, in variant order, each a list of syllable strings like
+            syllabifyARPA returns. Empty if the word is not in the index.
+            Variants that could not be syllabified are left out, so use
+            variants() to find a variant by its number.
+        """
+        return list(self.variants(word).values())
+
+    def variants(self, word):
+        """
+        Looks up the syllabifications of a word by CMUdict variant number
+        (1 for the first pronunciation, 2 for WORD(2) and so on). Words are
+        matched exactly.
+
+        Returns:
+            Dictionary from variant number to syllabification, in variant
+            order. Empty if the word is not in the index.
+        """
+        i = self._find(word.encode('utf-8'))
+        if i is None:
+            return {}
+
+        position = self._records + self._offset(self._record_offsets, i)
+        end = self._records + self._offset(self._record_offsets, i + 1)
+        syllabifications = {}
+        while position < end:
+            variant, length = self._mmap[position], self._mmap[position + 1]
+            position += 2
+            phones = [ID_PHONES[phone_id] for phone_id in self._mmap[position:position + length]]
+            position += length
+            mask = self._mmap[position:position + (length + 7) // 8]
+            position += len(mask)
+            starts = [bit for bit in range(length) if mask[bit // 8] >> (bit % 8) & 1]
+            syllabifications[variant] = joinSyllables(phones, starts)
+        return syllabifications
+
+    def __contains__(self, word):
+        return self._find(word.encode('utf-8')) is not None
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _offset(self, table, i):
+        return OFFSET.unpack_from(self._mmap, table + OFFSET.size * i)[0]
+
+    def _key(self, i):
+        return self._mmap[self._keys + self._offset(self._key_offsets, i):
+                          self._keys + self._offset(self._key_offsets, i + 1)]
+
+    def _find(self, key):
+        # Binary search over the sorted keys
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._size and self._key(lo) == key:
+            return lo
+        return None
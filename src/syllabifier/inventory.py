@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# inventory:
+# Interned syllables for syllabified lexicons kept in memory. A lexicon has a few
+# thousand distinct syllables repeated over millions of words, so each distinct
+# syllable is stored once and numbered, and words become arrays of syllable IDs:
+# two bytes per syllable instead of a list of freshly joined strings. The arrays
+# also make syllable n-gram counting cheap.
+
+import array
+
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import ERROR_MESSAGES
+from syllabifier.syllabifyARPA import SYLLABIC_RESCUES
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import scanPhoneIDs
+from syllabifier.syllabifyARPA import scanSyllabic
+
+# Largest number of syllables whose IDs fit in an array('H')
+SHORT_IDS = 1 << 16
+
+
+class SyllableInventory(object):
+    """
+    Numbers distinct syllables in the order they are first seen.
+
+    Args:
+        syllables: An iterable of syllable strings (phones joined by spaces) to
+        number first, e.g. a saved inventory
+    """
+
+    def __init__(self, syllables=()):
+        self.syllables = []
+        self.ids = {}
+        # Syllable IDs by the bytes of the phone IDs of the syllable, so that
+        # syllabify does not join the phones of syllables it has seen
+        self.phone_ids = {}
+        for syllable in syllables:
+            self.intern(syllable)
+
+    def __len__(self):
+        return len(self.syllables)
+
+    def __contains__(self, syllable):
+        return syllable in self.ids
+
+    def __getitem__(self, syllable_id):
+        """
+        Returns the syllable string with a syllable ID.
+        """
+        return self.syllables[syllable_id]
+
+    @property
+    def typecode(self):
+        """
+        The array typecode of syllable IDs: 'H' while there are at most
+        SHORT_IDS syllables, 'I' after that.
+        """
+        return 'H' if len(self.syllables) <= SHORT_IDS else 'I'
+
+    def intern(self, syllable):
+        """
+        Returns the ID of a syllable string, numbering it if it is new.
+        """
+        syllable_id = self.ids.get(syllable)
+        if syllable_id is None:
+            syllable_id = self.ids[syllable] = len(self.syllables)
+            self.syllables.append(syllable)
+        return syllable_id
+
+    def get(self, syllable):
+        """
+        Returns the ID of a syllable string, or None if it has not been seen.
+        """
+        return self.ids.get(syllable)
+
+    def encode(self, syllables):
+        """
+        Interns a list of syllable strings, e.g. from syllabifyARPA.
+
+        Returns:
+            An array of syllable IDs, with the inventory's typecode.
+        """
+        syllable_ids = [self.intern(syllable) for syllable in syllables]
+        return array.array(self.typecode, syllable_ids)
+
+    def decode(self, syllable_ids):
+        """
+        Returns the list of syllable strings with a sequence of syllable IDs.
+
+        Raises:
+            ValueError if a syllable ID is not in the inventory.
+        """
+        try:
+            return [self.syllables[syllable_id] for syllable_id in syllable_ids]
+        except IndexError:
+            raise ValueError('Syllable IDs %s are not all in the inventory'
+                             % list(syllable_ids))
+
+    def syllabify(self, arpa_arr, silence_warnings=False, engine='table',
+                  syllabic_consonants=False):
+        """
+        Syllabifies an ARPABET transcription like syllabifyARPA, interning its
+        syllables.
+
+        Returns:
+            An array of syllable IDs, with the inventory's typecode. In case the
+            input is unsyllabifiable, an empty array is returned.
+
+        Raises:
+            ValueError like syllabifyARPA.
+        """
+        phones, ids = tokenize(arpa_arr)
+        status, starts = scanPhoneIDs(ids, getEngine(engine))
+        if status in SYLLABIC_RESCUES and syllabic_consonants:
+            status, starts = scanSyllabic(ids, status, getEngine(engine))
+        if status:
+            if not silence_warnings:
+                raise ValueError(ERROR_MESSAGES[status] % ' '.join(phones))
+            return array.array(self.typecode)
+
+        syllable_ids = []
+        ends = starts[1:] + [len(ids)]
+        for start, end in zip(starts, ends):
+            key = bytes(ids[start:end])
+            syllable_id = self.phone_ids.get(key)
+            if syllable_id is None:
+                syllable_id = self.phone_ids[key] = self.intern(' '.join(phones[start:end]))
+            syllable_ids.append(syllable_id)
+        return array.array(self.typecode, syllable_ids)
+
+    def save(self, path):
+        """
+        Writes the syllables to a text file, one per line in ID order.
+        """
+        with open(path, 'w', encoding='ascii') as f:
+            for syllable in self.syllables:
+                f.write(syllable + '\n')
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an inventory written by save.
+        """
+        with open(path, encoding='ascii') as f:
+            return cls(line.rstrip('\n') for line in f)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+# io:
+# Streaming reader and writer for CMUdict-format lexicons. Lines are read and
+# written one at a time, so lexicons of any size run in constant memory.
+
+import collections
+import contextlib
+import io
+import os
+import re
+import sys
+import warnings
+
+from syllabifier.syllabifyARPA import ERROR_MESSAGES
+
+COMMENT_PREFIXES = (';;;', '##')
+DEFAULT_ENCODING = 'latin-1'
+SYLLABLE_SEPARATOR = ' - '
+
+VARIANT_REGEX = re.compile(r'^(.*)\((\d+)\)$')
+
+Entry = collections.namedtuple('Entry', ['word', 'pron', 'variant'])
+Entry.__doc__ = """
+A lexicon entry: the word without its variant marker, its pronunciation string
+and the variant index (1 for entries without a marker, 2 for WORD(2), ...).
+"""
+
+
+def readLexicon(source, encoding=DEFAULT_ENCODING):
+    """
+    Parses a CMUdict-format lexicon one line at a time, skipping blank and
+    comment lines. Words and pronunciations may be separated by any whitespace.
+    Lines with a word but no pronunciation are skipped with a warning, so one
+    damaged line does not stop the rest of the lexicon.
+
+    Args:
+        source: Path to a lexicon, '-' for standard input, an open text or binary
+        file, or any iterable of lines
+        encoding: Encoding of paths, standard input and binary lines
+        (default latin-1, which accepts any byte)
+
+    Yields:
+        Entry tuples.
+    """
+    with openLines(source, encoding) as lines:
+        for number, line in enumerate(lines, 1):
+            if isinstance(line, bytes):
+                line = line.decode(encoding)
+            if not line.strip() or line.startswith(COMMENT_PREFIXES):
+                continue
+            try:
+                word, pron = line.split(None, 1)
+            except ValueError:
+                warnings.warn('Skipping lexicon line %d with no pronunciation: %r'
+                              % (number, line))
+                continue
+            word, variant = splitVariant(word)
+            yield Entry(word, ' '.join(pron.split()), variant)
+
+
+def splitVariant(word):
+    """
+    Splits a lexicon key such as 'WORD(2)' into the word and its variant index.
+
+    Returns:
+        Tuple of the word and the variant index, which is 1 without a marker.
+    """
+    match = VARIANT_REGEX.match(word)
+    if match is None:
+        return word, 1
+    return match.group(1), int(match.group(2))
+
+
+def formatWord(word, variant=1):
+    """
+    Joins a word and its variant index back into a lexicon key such as 'WORD(2)'.
+    """
+    return word if variant == 1 else '%s(%d)' % (word, variant)
+
+
+def writeLexicon(f, results, separator=SYLLABLE_SEPARATOR, errors=None):
+    """
+    Writes syllabified lexicon entries, one 'WORD  SYL - SYL' line each.
+
+    Args:
+        f: A text file to write to
+        results: An iterable of (word, pronunciation, Status, syllables) tuples,
+        as yielded by syllabify_lexicon
+        separator: String placed between syllables (default ' - ')
+        errors: Optional text file that gets a line for each entry that could
+        not be syllabified. These entries are skipped otherwise.
+
+    Returns:
+        Number of entries written to f.
+    """
+    written = 0
+    for word, pron, status, syllables in results:
+        if status:
+            if errors is not None:
+                errors.write('%s: %s\n' % (word, ERROR_MESSAGES[status] % pron))
+            continue
+        f.write('%s  %s\n' % (word, separator.join(syllables)))
+        written += 1
+    return written
+
+
+def readSyllabified(source, separator=SYLLABLE_SEPARATOR, encoding=DEFAULT_ENCODING):
+    """
+    Parses a syllabified lexicon as written by writeLexicon, one line at a time.
+
+    Args:
+        source: Anything readLexicon accepts
+        separator: String between syllables (default ' - ')
+        encoding: Encoding of paths, standard input and binary lines
+
+    Yields:
+        Tuples of a word, with its variant marker, and its list of syllable
+        strings.
+    """
+    # Surrounding whitespace is normalized along with the rest of the line
+    separator = separator.strip() or separator
+    for word, pron, variant in readLexicon(source, encoding):
+        yield (formatWord(word, variant),
+               [' '.join(syllable.split()) for syllable in pron.split(separator)])
+
+
+@contextlib.contextmanager
+def openLines(source, encoding=DEFAULT_ENCODING):
+    """
+    Context manager giving an iterable of lines for a path, '-' (standard input),
+    an open file or an iterable of lines. Only paths are closed on exit.
+    """
+    if source == '-':
+        stdin = io.TextIOWrapper(sys.stdin.buffer, encoding=encoding)
+        try:
+            yield stdin
+        finally:
+            stdin.detach()
+    elif isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'r', encoding=encoding) as f:
+            yield f
+    else:
+        yield source
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+# lattice:
+# Every legal syllabification of a word, not just the onset-maximal one. Each run
+# of consonants between two vowels can usually be split in more than one legal
+# way (M IH S . T R IY T and M IH . S T R IY T for mistreat), and the choices for
+# different runs are independent, so the syllabifications are kept as a lattice:
+# the legal split points of each run. Syllabifications are only built when they
+# are iterated over or ranked, so long words never expand into every combination.
+
+import heapq
+import itertools
+import sys
+
+from syllabifier.phones import CONSONANT_IDS
+from syllabifier.phones import PHONE_IDS
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import ERROR_MESSAGES
+from syllabifier.syllabifyARPA import Status
+from syllabifier.syllabifyARPA import joinSyllables
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+
+def onsetScore(coda, onset):
+    """
+    The default score of a split: the number of consonants in the onset, which
+    ranks onset-maximal syllabifications first.
+    """
+    return len(onset)
+
+
+class SyllabificationLattice(object):
+    """
+    The legal syllabifications of a word.
+
+    Args:
+        phones: A sequence of upper-case ARPABET phones
+        options: For each run of consonants between two vowels, the offsets in
+        phones at which the syllable after it may start, onset-maximal first
+
+    Attributes:
+        phones: Tuple of the phones
+        options: Tuple of tuples of start offsets, one tuple per run
+    """
+
+    __slots__ = ('phones', 'options')
+
+    def __init__(self, phones, options):
+        self.phones = tuple(phones)
+        self.options = tuple(tuple(starts) for starts in options)
+
+    def __len__(self):
+        """
+        Returns the number of syllabifications.
+        """
+        count = 1
+        for starts in self.options:
+            count *= len(starts)
+        return count
+
+    def __iter__(self):
+        """
+        Yields every syllabification as a list of syllable strings, starting
+        with the onset-maximal one.
+        """
+        for choice in itertools.product(*self.options):
+            yield self.syllables(choice)
+
+    def syllables(self, choice):
+        """
+        Returns the syllable strings for one start offset of each run.
+        """
+        starts = [0] + list(choice) if self.phones else []
+        return joinSyllables(self.phones, starts)
+
+    def ranked(self, score=None):
+        """
+        Yields the syllabifications from the highest total score to the lowest.
+        Each one costs a heap operation per run, however many there are.
+
+        Args:
+            score: Function of the coda and onset tuples of phones on either side
+            of a split, returning a number (default onsetScore). The score of a
+            syllabification is the sum over its splits. Ties keep lattice order.
+
+        Yields:
+            Tuples of the score and the list of syllable strings.
+        """
+        if score is None:
+            score = onsetScore
+
+        # Each run's options, best first
+        vowels = [i for i, phone in enumerate(self.phones) if PHONE_IDS[phone] in VOWEL_IDS]
+        runs = []
+        for before, after, starts in zip(vowels, vowels[1:], self.options):
+            scored = [(score(self.phones[before + 1:start], self.phones[start:after]), start)
+                      for start in starts]
+            scored.sort(key=lambda option: -option[0])
+            runs.append(scored)
+
+        # Best-first search over the choices for each run. A choice is reached
+        # only from the choice with its last advanced run stepped back, so each
+        # one is pushed once, and advancing a run never raises the score.
+        first = (0,) * len(runs)
+        heap = [(-sum(scored[0][0] for scored in runs), first, 0)]
+        while heap:
+            total, choice, last = heapq.heappop(heap)
+            yield -total, self.syllables([runs[i][j][1] for i, j in enumerate(choice)])
+            for i in range(last, len(runs)):
+                if choice[i] + 1 < len(runs[i]):
+                    step = runs[i][choice[i]][0] - runs[i][choice[i] + 1][0]
+                    advanced = choice[:i] + (choice[i] + 1,) + choice[i + 1:]
+                    heapq.heappush(heap, (total + step, advanced, i))
+
+    def best(self, k=1, score=None):
+        """
+        Returns the k syllabifications with the highest scores, as lists of
+        syllable strings. See ranked.
+        """
+        return [syllables for total, syllables in itertools.islice(self.ranked(score), k)]
+
+    def __repr__(self):
+        return 'SyllabificationLattice(%r, %r)' % (list(self.phones), list(self.options))
+
+
+def syllabify_lattice(arpa_arr, silence_warnings=False):
+    """
+    Finds every legal syllabification of an ARPABET transcription, using the
+    same legal onsets and codas as syllabifyARPA.
+
+    Args:
+        arpa_arr: A string or array of ARPABET phones with optional stress markers
+        on the vowels
+        silence_warnings: Boolean (default False) to suppress ValueErrors
+
+    Returns:
+        A SyllabificationLattice, or None if the input is unsyllabifiable and
+        silence_warnings is set.
+
+    Raises:
+        ValueError like syllabifyARPA. Words whose onset-maximal split has an
+        illegal coda but that can be split legally otherwise are not errors.
+    """
+    phones, ids = tokenize(arpa_arr)
+    status, options = splitOptions(ids)
+    if status:
+        if not silence_warnings:
+            raise ValueError(ERROR_MESSAGES[status] % ' '.join(phones))
+        return None
+    return SyllabificationLattice(phones, options)
+
+
+def splitOptions(ids):
+    """
+    Lists the legal split points of each run of consonants between two vowels.
+
+    Returns:
+        Tuple of a Status and, if it is Status.OK, the list of tuples of start
+        offsets for each run, onset-maximal first.
+    """
+    vowels = []
+    for i, phone_id in enumerate(ids):
+        if phone_id in VOWEL_IDS:
+            vowels.append(i)
+        elif phone_id not in CONSONANT_IDS:
+            return Status.NON_ARPABET, None
+    if not vowels:
+        return (Status.NO_VOWEL if ids else Status.OK), []
+    # The rules of the 'table' engine, read once so that useRules cannot switch
+    # them halfway through the word
+    rules = CORE.RULES
+    onset_ids = rules.onset_ids
+    coda_ids = rules.coda_ids
+    if tuple(ids[:vowels[0]]) not in onset_ids:
+        return Status.BAD_ONSET, None
+
+    options = []
+    for before, after in zip(vowels, vowels[1:]):
+        run = tuple(ids[before + 1:after])
+        starts = tuple(after - onset for onset in range(min(len(run), rules.max_onset), -1, -1)
+                       if run[len(run) - onset:] in onset_ids
+                       and run[:len(run) - onset] in coda_ids)
+        if not starts:
+            return Status.BAD_CODA, None
+        options.append(starts)
+
+    if tuple(ids[vowels[-1] + 1:]) not in coda_ids:
+        return Status.BAD_CODA, None
+    return Status.OK, options
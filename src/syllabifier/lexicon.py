@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# lexicon:
+# Syllabify whole pronunciation lexicons, optionally across several processes.
+# Entries are read, syllabified and yielded in chunks, so the parent process only
+# holds the chunks that are in flight. Lexicons with many entries that share a
+# pronunciation (homophones, variants, spelling duplicates) can be deduplicated
+# so each distinct pronunciation is syllabified once.
+
+import collections
+import concurrent.futures
+import functools
+import itertools
+import os
+import sys
+
+from syllabifier.io import DEFAULT_ENCODING
+from syllabifier.io import formatWord
+from syllabifier.io import readLexicon
+from syllabifier.phones import tokenize
+from syllabifier.rules import RuleSet
+from syllabifier.syllabifyARPA import SYLLABIC_RESCUES
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import joinSyllables
+from syllabifier.syllabifyARPA import scanPhoneIDs
+from syllabifier.syllabifyARPA import scanSyllabic
+from syllabifier.syllabifyARPA import syllabify_many
+from syllabifier.syllabifyARPA import useRules
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+# Number of distinct pronunciations whose splits a deduplicated pass remembers
+DEDUP_SIZE = 65536
+
+
+def syllabify_lexicon(lexicon, workers=1, chunksize=1000, encoding=DEFAULT_ENCODING,
+                      engine='table', syllabic_consonants=False, dedup=False,
+                      ignore_stress=False):
+    """
+    Syllabifies every entry of a lexicon, keeping the input order.
+
+    Args:
+        lexicon: Path to a CMUdict-format lexicon ('-' for standard input), or an
+        iterable of (word, pronunciation) tuples
+        workers: Number of worker processes (default 1). With 1 or fewer, the
+        lexicon is syllabified in this process; None uses every CPU.
+        chunksize: Number of entries sent to a worker at a time
+        encoding: Encoding of the lexicon file (default latin-1)
+        engine: Name of the syllabification engine (default 'table')
+        syllabic_consonants: Boolean (default False) to allow syllabic
+        consonants like syllabifyARPA
+        dedup: Boolean (default False) to syllabify each distinct pronunciation
+        once, regardless of case, and reuse the split for the other entries
+        with that pronunciation. The last DEDUP_SIZE pronunciations are kept.
+        ignore_stress: Boolean (default False) to also share the split between
+        pronunciations that only differ in stress markers, which the rules do
+        not look at. Each entry keeps its own stress markers.
+
+    Yields:
+        Tuples of a word (with its variant marker, e.g. 'WORD(2)'), its
+        pronunciation, a Status and the list of syllable
+        strings, which is empty unless the status is Status.OK.
+    """
+    if dedup:
+        yield from dedupLexicon(readEntries(lexicon, encoding), workers, chunksize, engine,
+                                syllabic_consonants, ignore_stress)
+        return
+
+    function = functools.partial(syllabifyChunk, engine=engine,
+                                 syllabic_consonants=syllabic_consonants)
+    for results in mapChunks(function, iterChunks(readEntries(lexicon, encoding), chunksize),
+                             workers):
+        yield from results
+
+
+def readEntries(lexicon, encoding=DEFAULT_ENCODING):
+    """
+    Returns the (word, pronunciation) tuples of a lexicon path, with variant
+    markers on the words, or lexicon itself if it is not a path.
+    """
+    if isinstance(lexicon, (str, bytes, os.PathLike)):
+        return ((formatWord(word, variant), pron)
+                for word, pron, variant in readLexicon(lexicon, encoding))
+    return lexicon
+
+
+def mapChunks(function, chunks, workers=1):
+    """
+    Applies a function to every chunk, in worker processes if workers is more
+    than 1 (None for every CPU), and yields the results in chunk order. Workers
+    use the rules that useRules switched this process to.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield function(chunk)
+        return
+
+    # Keep a couple of chunks per worker in flight and yield them in submission
+    # order, so results stream back in input order with bounded memory
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=initWorker,
+                                                initargs=(CORE.RULES.data,)) as executor:
+        pending = collections.deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(function, chunk))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def initWorker(rules):
+    """
+    Switches a worker process to the rules of its parent, given as RuleSet
+    data, unless it uses them already (e.g. when it was forked).
+    """
+    if CORE.RULES.data != rules:
+        useRules(RuleSet(rules))
+
+
+def syllabifyChunk(chunk, engine='table', syllabic_consonants=False):
+    """
+    Syllabifies a list of (word, pronunciation) tuples.
+
+    Returns:
+        List of tuples of a word, its pronunciation, a Status and a list of
+        syllable strings.
+    """
+    results = syllabify_many((pron for word, pron in chunk), engine, syllabic_consonants)
+    return [(word, pron, status, syllables) for (word, pron), (status, syllables)
+            in zip(chunk, results)]
+
+
+def dedupLexicon(entries, workers=1, chunksize=1000, engine='table', syllabic_consonants=False,
+                 ignore_stress=False):
+    """
+    Syllabifies (word, pronunciation) tuples like syllabify_lexicon, sending
+    only the pronunciations it has not split yet to syllabifyKeys. Splits are
+    remembered in an LRU table of DEDUP_SIZE pronunciations, and each chunk
+    keeps the splits it needs until its results are yielded.
+
+    Yields:
+        Tuples of a word, its pronunciation, a Status and a list of syllable
+        strings, in input order.
+    """
+    known = collections.OrderedDict()
+    in_flight = collections.deque()
+
+    def missingKeys():
+        for chunk in iterChunks(entries, chunksize):
+            prons = [pron.upper() if isinstance(pron, str) else ' '.join(tokenize(pron)[0])
+                     for word, pron in chunk]
+            keys = [unstressedKey(pron) for pron in prons] if ignore_stress else prons
+            found = {}
+            missing = []
+            for key in keys:
+                if key in found:
+                    continue
+                if key in known:
+                    known.move_to_end(key)
+                    found[key] = known[key]
+                else:
+                    found[key] = None
+                    missing.append(key)
+            in_flight.append((chunk, prons, keys, found, missing))
+            yield missing
+
+    function = functools.partial(syllabifyKeys, engine=engine,
+                                 syllabic_consonants=syllabic_consonants)
+    for results in mapChunks(function, missingKeys(), workers):
+        chunk, prons, keys, found, missing = in_flight.popleft()
+        for key, result in zip(missing, results):
+            found[key] = known[key] = result
+            if len(known) > DEDUP_SIZE:
+                known.popitem(last=False)
+        # Each entry's own phones are joined, so its stress markers are kept
+        for (word, pron), upper, key in zip(chunk, prons, keys):
+            status, starts = found[key]
+            yield word, pron, status, joinSyllables(upper.split(), starts) if not status else []
+
+
+def unstressedKey(pron):
+    """
+    Returns the phone IDs of a transcription with the stress markers of its
+    vowels masked out, as a tuple. Non-ARPABET phones stay None, so they are
+    still rejected.
+    """
+    return tuple(phone_id & ~3 if phone_id is not None else None
+                 for phone_id in tokenize(pron)[1])
+
+
+def syllabifyKeys(keys, engine='table', syllabic_consonants=False):
+    """
+    Syllabifies a list of upper-case ARPABET transcriptions, or of tuples of
+    phone IDs from unstressedKey.
+
+    Returns:
+        List of tuples of a Status and the list of offsets at which each
+        syllable starts, which is None unless the status is Status.OK.
+    """
+    split = getEngine(engine)
+    results = []
+    for key in keys:
+        ids = key if isinstance(key, tuple) else tokenize(key)[1]
+        status, starts = scanPhoneIDs(ids, split)
+        if status in SYLLABIC_RESCUES and syllabic_consonants:
+            status, starts = scanSyllabic(ids, status, split)
+        results.append((status, starts))
+    return results
+
+
+def iterChunks(iterable, chunksize):
+    """
+    Splits an iterable into lists of at most chunksize items.
+    """
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunksize))
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+# memo:
+# The 'memo' syllabification engine. A lexicon of a hundred thousand words has
+# only a few thousand distinct consonant runs, so the split of each run (with its
+# position in the word) is memoized in a bounded LRU table in front of another
+# engine. Unlike a cache of whole words, the table also pays off for words it has
+# never seen. It can be warmed from a lexicon and saved to and loaded from disk.
+# useRules replaces the shared memo, whose splits would follow the old rules.
+
+import collections
+import marshal
+import sys
+
+from syllabifier.diskcache import writeMarshal
+from syllabifier.io import DEFAULT_ENCODING
+from syllabifier.lexicon import readEntries
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import engineRules
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import scanPhoneIDs
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+MemoInfo = collections.namedtuple('MemoInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class SplitMemo(object):
+    """
+    A splitRun function that memoizes the splits of another engine. Instances
+    can be passed as the engine of any syllabification function.
+
+    Args:
+        engine: Name of the engine whose splits are memoized (default 'table'),
+        or a function with the signature of splitRun
+        maxsize: Maximum number of memoized runs (default 65536), or None for an
+        unbounded table
+
+    The engine is bound when the memo is made, so make a new memo after
+    switching rules with useRules.
+
+    A memo can be shared between threads without a lock: a run evicted by
+    another thread is split again the next time, and the statistics may miss
+    a few counts.
+
+    Attributes:
+        rules: The RuleSet the engine followed when it was bound
+        hits: Number of runs found in the table
+        misses: Number of runs split by the engine
+    """
+
+    def __init__(self, engine='table', maxsize=65536):
+        self.engine = engine
+        self.maxsize = maxsize
+        self.splits = collections.OrderedDict()
+        self.hits = self.misses = 0
+        self._split = getEngine(engine)
+        self.rules = engineRules(self._split)
+
+    def __call__(self, run, position):
+        """
+        Splits a run of consonant IDs like splitRun.
+        """
+        key = (run, position)
+        try:
+            onset = self.splits[key]
+        except KeyError:
+            self.misses += 1
+            onset = self.splits[key] = self._split(run, position)
+            if self.maxsize is not None and len(self.splits) > self.maxsize:
+                try:
+                    self.splits.popitem(last=False)
+                except KeyError:
+                    # Emptied by another thread
+                    pass
+            return onset
+        self.hits += 1
+        try:
+            self.splits.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread since the lookup, which still found the
+            # right onset
+            pass
+        return onset
+
+    def __len__(self):
+        return len(self.splits)
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of runs found in the table, 0.0 before the first run.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maxsize and currsize of the table as a named
+        tuple, like functools.lru_cache does.
+        """
+        return MemoInfo(self.hits, self.misses, self.maxsize, len(self.splits))
+
+    def cache_clear(self):
+        """
+        Empties the table and resets its statistics.
+        """
+        self.splits.clear()
+        self.hits = self.misses = 0
+
+    def warm(self, lexicon, encoding=DEFAULT_ENCODING):
+        """
+        Memoizes the runs of every pronunciation in a lexicon, without counting
+        them in the statistics.
+
+        Args:
+            lexicon: Path to a CMUdict-format lexicon ('-' for standard input),
+            or an iterable of (word, pronunciation) tuples
+            encoding: Encoding of the lexicon file (default latin-1)
+        """
+        hits, misses = self.hits, self.misses
+        for word, pron in readEntries(lexicon, encoding):
+            scanPhoneIDs(tokenize(pron)[1], self)
+        self.hits, self.misses = hits, misses
+
+    def engineName(self):
+        """
+        Returns the name of the memoized engine, or None if it is a function.
+        """
+        return self.engine if isinstance(self.engine, str) else None
+
+    def save(self, path):
+        """
+        Writes the table to a file, least recently used runs first.
+        """
+        writeMarshal(path, {
+            'rules': self.rules.key,
+            'engine': self.engineName(),
+            'splits': [(run, position, onset) for (run, position), onset in self.splits.items()],
+        })
+
+    def load(self, path):
+        """
+        Adds the runs in a file written by save to the table, as the most
+        recently used ones.
+
+        Raises:
+            ValueError if the file is damaged or was saved for another engine or
+            with different syllabification rules.
+        """
+        with open(path, 'rb') as f:
+            try:
+                saved = marshal.load(f)
+                rules, engine, splits = saved['rules'], saved['engine'], saved['splits']
+            except (EOFError, ValueError, TypeError, KeyError):
+                raise ValueError('%s is not a split memo' % path)
+        if rules != self.rules.key or engine != self.engineName():
+            raise ValueError('%s was saved for another engine or other rules' % path)
+        for run, position, onset in splits:
+            key = (run, position)
+            self.splits[key] = onset
+            self.splits.move_to_end(key)
+            if self.maxsize is not None and len(self.splits) > self.maxsize:
+                self.splits.popitem(last=False)
+
+
+def useRules(rules):
+    """
+    Replaces the shared memo with an empty one for the rules that
+    syllabifyARPA.useRules switched to.
+    """
+    global MEMO
+    MEMO = SplitMemo(MEMO.engine, MEMO.maxsize)
+    if 'memo' in CORE.LOADED_ENGINES:
+        CORE.LOADED_ENGINES['memo'] = MEMO
+
+
+# Shared by everything that asks for the 'memo' engine by name
+MEMO = SplitMemo()
+CORE.RULE_HOOKS.append(useRules)
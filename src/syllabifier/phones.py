@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+# phones:
+# Integer encoding of ARPABET phones. Each phone ID is 4 * (index of the phone in
+# PHONES) + (index of its stress marker in STRESS_MARKERS), so every ID fits in a
+# byte and the stress marker of a vowel is ID & 3 (0 for no marker).
+
+from syllabifier.constants import OBSTRUENTS
+from syllabifier.constants import PHONESET
+from syllabifier.constants import STRESS_MARKERS
+from syllabifier.constants import SYLLABIC_CONSONANTS
+from syllabifier.constants import VOWELS
+
+PHONES = tuple(sorted(PHONESET))
+
+
+def buildPhoneIDs():
+    """
+    Numbers every phone in PHONES, with each stress marker for the vowels.
+
+    Returns:
+        Dictionary from upper-case phones to phone IDs.
+    """
+    phone_ids = {}
+    for index, phone in enumerate(PHONES):
+        for slot, stress in enumerate(STRESS_MARKERS if phone in VOWELS else ['']):
+            phone_ids[phone + stress] = 4 * index + slot
+    return phone_ids
+
+
+PHONE_IDS = buildPhoneIDs()
+
+ID_PHONES = {phone_id: phone for phone, phone_id in PHONE_IDS.items()}
+
+VOWEL_IDS = frozenset(PHONE_IDS[phone] for phone in PHONE_IDS if phone[:2] in VOWELS)
+CONSONANT_IDS = frozenset(PHONE_IDS.values()).difference(VOWEL_IDS)
+SYLLABIC_IDS = frozenset(PHONE_IDS[phone] for phone in SYLLABIC_CONSONANTS)
+
+# (previous phone ID, phone ID) pairs in which the second phone is syllabic
+SYLLABIC_PAIRS = frozenset((PHONE_IDS[obstruent], PHONE_IDS[phone])
+                           for obstruent in OBSTRUENTS for phone in SYLLABIC_CONSONANTS)
+
+BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+def tokenize(arpa_arr):
+    """
+    Splits an ARPABET transcription into upper-case phones and looks up their
+    phone IDs. The input is never modified, and a sequence of phones that are
+    already upper-case is returned as it is rather than copied.
+
+    Args:
+        arpa_arr: A string, an ASCII bytes-like object or a sequence of phones
+        (strings or bytes). Case does not matter.
+
+    Returns:
+        Tuple of the sequence of upper-case phones and the list of their phone
+        IDs, with None for non-ARPABET phones.
+    """
+    get_id = PHONE_IDS.get
+
+    if isinstance(arpa_arr, BYTES_TYPES):
+        # Undecodable bytes become U+FFFD, which is reported as non-ARPABET
+        arpa_arr = str(arpa_arr, 'ascii', 'replace')
+    if isinstance(arpa_arr, str):
+        if not arpa_arr.isupper():
+            arpa_arr = arpa_arr.upper()
+        phones = arpa_arr.split()
+        return phones, [get_id(phone) for phone in phones]
+
+    ids = [get_id(phone) for phone in arpa_arr]
+    if None not in ids:
+        return arpa_arr, ids
+    phones = [normalizePhone(phone) for phone in arpa_arr]
+    return phones, [get_id(phone) for phone in phones]
+
+
+def normalizePhone(phone):
+    """
+    Converts one phone to an upper-case string.
+    """
+    if isinstance(phone, BYTES_TYPES):
+        phone = str(phone, 'ascii', 'replace')
+    return phone if phone.isupper() else phone.upper()
+
+
+def encode(arpa_arr):
+    """
+    Encodes an ARPABET transcription as phone IDs.
+
+    Args:
+        arpa_arr: A string or array of ARPABET phones with optional stress markers
+        on the vowels, in any form tokenize accepts. Case does not matter.
+
+    Returns:
+        List of phone IDs.
+
+    Raises:
+        ValueError if input contains non-ARPABET phones.
+    """
+    phones, ids = tokenize(arpa_arr)
+    if None in ids:
+        raise ValueError('Input %s contains non-ARPABET phones' % ' '.join(phones))
+    return ids
+
+
+def decode(ids):
+    """
+    Decodes phone IDs into ARPABET phones.
+
+    Args:
+        ids: A sequence of phone IDs
+
+    Returns:
+        List of upper-case ARPABET phones.
+
+    Raises:
+        ValueError if input contains IDs that are not phone IDs.
+    """
+    try:
+        return [ID_PHONES[phone_id] for phone_id in ids]
+    except KeyError as e:
+        raise ValueError('%r is not a phone ID' % e.args[0])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+# phrase:
+# Syllabification of whole phrases in one call. Word boundaries (#) and morpheme
+# boundaries inside compounds (+) are marked in the transcription and act as hard
+# syllable breaks, which the rules cannot find on their own (e.g. M IH S + T R IY
+# T for mistreat, not M IH + S T R IY T). Syllables are returned grouped by word.
+
+import itertools
+
+from syllabifier.phones import CONSONANT_IDS
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import ERROR_MESSAGES
+from syllabifier.syllabifyARPA import FINAL
+from syllabifier.syllabifyARPA import INITIAL
+from syllabifier.syllabifyARPA import MEDIAL
+from syllabifier.syllabifyARPA import Status
+from syllabifier.syllabifyARPA import getEngine
+
+WORD_BOUNDARY = '#'
+MORPHEME_BOUNDARY = '+'
+BOUNDARIES = frozenset([WORD_BOUNDARY, MORPHEME_BOUNDARY])
+
+
+def syllabify_phrase(arpa_arr, silence_warnings=False, engine='table'):
+    """
+    Syllabifies an ARPABET transcription of a phrase with boundary markers.
+
+    Args:
+        arpa_arr: A string or array of ARPABET phones with optional stress markers
+        on the vowels, with '#' between words and '+' between the morphemes of a
+        compound as separate tokens. Every word and morpheme must be
+        syllabifiable on its own.
+        silence_warnings: Boolean (default False) to suppress ValueErrors
+        engine: Name of the syllabification engine (default 'table')
+
+    Returns:
+        List with the list of syllable strings of each word. Empty words (e.g.
+        from a leading '#') are left out. In case the input is unsyllabifiable,
+        an empty list is returned.
+
+    Raises:
+        ValueError like syllabifyARPA, naming the first word or morpheme that
+        cannot be syllabified.
+    """
+    phones, ids = tokenize(arpa_arr)
+    status, words = scanPhrase(phones, ids, getEngine(engine))
+    if status:
+        if not silence_warnings:
+            raise ValueError(ERROR_MESSAGES[status] % words)
+        return []
+    return words
+
+
+def syllabify_phrases(arpa_arrs, engine='table'):
+    """
+    Syllabifies many phrases like syllabify_phrase without raising on the ones
+    that cannot be syllabified. Results are yielded lazily in input order.
+
+    Yields:
+        Tuples of a Status and the list of words that syllabify_phrase would
+        return, which is empty unless the status is Status.OK.
+    """
+    split = getEngine(engine)
+    for arpa_arr in arpa_arrs:
+        status, words = scanPhrase(*tokenize(arpa_arr), split)
+        yield status, [] if status else words
+
+
+def scanPhrase(phones, ids, split):
+    """
+    Syllabifies a phrase in a single left-to-right pass, like scanPhoneIDs but
+    closing the last syllable at each boundary marker.
+
+    Args:
+        phones: A sequence of upper-case phones and boundary markers
+        ids: Their phone IDs, None for boundary markers and non-ARPABET phones
+        split: The engine's splitRun function
+
+    Returns:
+        Tuple of a Status and, if it is Status.OK, the list of syllable strings
+        of each word; otherwise the phones of the word or morpheme that failed,
+        joined by spaces.
+    """
+    words = []
+    word = []
+    segment_start = run_start = 0
+    syllable_start = None
+
+    for i, phone_id in enumerate(itertools.chain(ids, [None])):
+        if phone_id in VOWEL_IDS:
+            onset = split(tuple(ids[run_start:i]), INITIAL if syllable_start is None else MEDIAL)
+            if onset is None:
+                status = Status.BAD_ONSET if syllable_start is None else Status.BAD_CODA
+                return status, segmentPhones(phones, ids, segment_start)
+            if syllable_start is not None:
+                word.append(' '.join(phones[syllable_start:i - onset]))
+            syllable_start = i - onset
+            run_start = i + 1
+        elif phone_id not in CONSONANT_IDS:
+            boundary = phones[i] if i < len(ids) else WORD_BOUNDARY
+            if boundary not in BOUNDARIES:
+                return Status.NON_ARPABET, segmentPhones(phones, ids, segment_start)
+
+            # Close the word or morpheme
+            if syllable_start is not None:
+                if split(tuple(ids[run_start:i]), FINAL) is None:
+                    return Status.BAD_CODA, segmentPhones(phones, ids, segment_start)
+                word.append(' '.join(phones[syllable_start:i]))
+            elif run_start < i:
+                return Status.NO_VOWEL, segmentPhones(phones, ids, segment_start)
+            if boundary == WORD_BOUNDARY and word:
+                words.append(word)
+                word = []
+            segment_start = run_start = i + 1
+            syllable_start = None
+
+    return Status.OK, words
+
+
+def segmentPhones(phones, ids, start):
+    """
+    Returns the phones of the word or morpheme starting at start, up to the next
+    boundary marker, joined by spaces.
+    """
+    end = start
+    while end < len(ids) and not (ids[end] is None and phones[end] in BOUNDARIES):
+        end += 1
+    return ' '.join(phones[start:end])
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+# profiling:
+# Opt-in instrumentation of syllabification. While enabled, the stages used by
+# syllabifyARPA, syllabify, syllabify_many and syllabifyIDs are swapped for timed
+# and counted versions; when disabled the original functions are put back, so
+# there is no cost at all. Stages:
+#
+#   tokenize: splitting the input and the phoneset check
+#   scan:     finding the vowels and consonant runs (not counting split)
+#   split:    onset maximization and coda validation of each consonant run
+#   join:     building the syllable strings
+#
+# Words that scanSyllabic rescans are counted once, with the status of the rescan.
+# The modules of the package that import these functions by name (lexicon, stats,
+# memo, ...) are instrumented too if they are imported before profiling is
+# enabled. Only this process is instrumented, not the workers of
+# syllabify_lexicon.
+
+import collections
+import contextlib
+import sys
+import threading
+import time
+
+from syllabifier.syllabifyARPA import FINAL
+from syllabifier.syllabifyARPA import INITIAL
+from syllabifier.syllabifyARPA import MEDIAL
+from syllabifier.syllabifyARPA import Status
+
+# The syllabifyARPA module; the package attribute of that name is the function
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+STAGES = ('tokenize', 'scan', 'split', 'join')
+POSITIONS = {INITIAL: 'initial', MEDIAL: 'medial', FINAL: 'final'}
+
+
+class Profile(object):
+    """
+    Counters collected while profiling is enabled.
+
+    Attributes:
+        words: Number of transcriptions scanned
+        seconds: Dictionary from stage name to cumulative seconds
+        rejections: Counter of Status names of the transcriptions rejected
+        cluster_lengths: Counter of (position, length) of the consonant runs
+        split, position being 'initial', 'medial' or 'final'
+        onset_repairs: Counter of the number of consonants of a medial run that
+        are moved from the onset of the next syllable to the coda, i.e. the run
+        length minus its longest legal onset
+        rejected_clusters: Counter of the positions of runs that could not be
+        split legally
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Sets every counter back to zero.
+        """
+        with self._lock:
+            self.words = 0
+            self.seconds = dict.fromkeys(STAGES, 0.0)
+            self.rejections = collections.Counter()
+            self.cluster_lengths = collections.Counter()
+            self.onset_repairs = collections.Counter()
+            self.rejected_clusters = collections.Counter()
+
+    def as_dict(self):
+        """
+        Returns a snapshot of the counters as a JSON-serializable dictionary.
+        """
+        with self._lock:
+            return {
+                'words': self.words,
+                'seconds': dict(self.seconds),
+                'rejections': dict(self.rejections),
+                'cluster_lengths': {position: {length: count for (key, length), count
+                                               in sorted(self.cluster_lengths.items())
+                                               if key == position}
+                                    for position in POSITIONS.values()},
+                'onset_repairs': dict(sorted(self.onset_repairs.items())),
+                'rejected_clusters': dict(self.rejected_clusters),
+            }
+
+    def prometheus(self, prefix='syllabifier'):
+        """
+        Returns a snapshot of the counters in the Prometheus text exposition
+        format, with the cluster lengths and onset repairs as histograms.
+        """
+        snapshot = self.as_dict()
+        lines = []
+
+        def metric(name, kind, description, samples):
+            lines.append('# HELP %s_%s %s' % (prefix, name, description))
+            lines.append('# TYPE %s_%s %s' % (prefix, name, kind))
+            for suffix, labels, value in samples:
+                labels = ','.join('%s="%s"' % label for label in labels)
+                lines.append('%s_%s%s%s %s' % (prefix, name, suffix,
+                                               '{%s}' % labels if labels else '', value))
+
+        def histogram(counts, labels=()):
+            samples = []
+            total = 0
+            for length in sorted(counts):
+                total += counts[length]
+                samples.append(('_bucket', labels + (('le', length),), total))
+            samples.append(('_bucket', labels + (('le', '+Inf'),), total))
+            samples.append(('_sum', labels, sum(length * count for length, count
+                                                in counts.items())))
+            samples.append(('_count', labels, total))
+            return samples
+
+        metric('words_total', 'counter', 'Transcriptions scanned.',
+               [('', (), snapshot['words'])])
+        metric('stage_seconds_total', 'counter', 'Cumulative time spent in each stage.',
+               [('', (('stage', stage),), repr(seconds))
+                for stage, seconds in snapshot['seconds'].items()])
+        metric('rejections_total', 'counter', 'Transcriptions rejected, by reason.',
+               [('', (('reason', status.name),), snapshot['rejections'].get(status.name, 0))
+                for status in Status if status])
+        metric('rejected_clusters_total', 'counter',
+               'Consonant runs that could not be split legally, by position.',
+               [('', (('position', position),), snapshot['rejected_clusters'].get(position, 0))
+                for position in POSITIONS.values()])
+        metric('cluster_length', 'histogram', 'Lengths of the consonant runs split.',
+               [sample for position, counts in snapshot['cluster_lengths'].items()
+                for sample in histogram(counts, (('position', position),))])
+        metric('onset_repair_consonants', 'histogram',
+               'Consonants of a medial run moved from the onset to the coda.',
+               histogram(snapshot['onset_repairs']))
+        return '\n'.join(lines) + '\n'
+
+
+PROFILE = Profile()
+
+# The (module, name, original function) of each function replaced while
+# profiling is enabled
+ORIGINALS = []
+
+
+def enable(profile=None):
+    """
+    Starts collecting counters into profile (default PROFILE).
+
+    Raises:
+        RuntimeError if profiling is already enabled.
+    """
+    if ORIGINALS:
+        raise RuntimeError('Profiling is already enabled')
+    if profile is None:
+        profile = PROFILE
+
+    tokenize = CORE.tokenize
+    scanPhoneIDs = CORE.scanPhoneIDs
+    scanSyllabic = CORE.scanSyllabic
+    joinSyllables = CORE.joinSyllables
+    getEngine = CORE.getEngine
+    splits = {}
+    # Split time of the scan in progress in each thread, and whether it is the
+    # rescan of a word that was counted already
+    pending = threading.local()
+
+    def timedTokenize(arpa_arr):
+        start = time.perf_counter()
+        try:
+            return tokenize(arpa_arr)
+        finally:
+            elapsed = time.perf_counter() - start
+            with profile._lock:
+                profile.seconds['tokenize'] += elapsed
+
+    def timedScan(ids, split=None):
+        split = countedGetEngine(CORE.splitRun if split is None else split)
+        pending.split = 0.0
+        start = time.perf_counter()
+        status, starts = scanPhoneIDs(ids, split)
+        elapsed = time.perf_counter() - start
+        with profile._lock:
+            # Split time is counted by the split stage
+            profile.seconds['scan'] += elapsed - pending.split
+            if not getattr(pending, 'rescan', False):
+                profile.words += 1
+                if status:
+                    profile.rejections[status.name] += 1
+        return status, starts
+
+    def countedSyllabic(ids, status, split=None):
+        pending.rescan = True
+        try:
+            rescanned, starts = scanSyllabic(ids, status, split)
+        finally:
+            pending.rescan = False
+        if rescanned != status:
+            with profile._lock:
+                # The first scan counted the word as rejected with status
+                profile.rejections[status.name] -= 1
+                if not profile.rejections[status.name]:
+                    del profile.rejections[status.name]
+                if rescanned:
+                    profile.rejections[rescanned.name] += 1
+        return rescanned, starts
+
+    def timedJoin(phones, starts):
+        start = time.perf_counter()
+        try:
+            return joinSyllables(phones, starts)
+        finally:
+            elapsed = time.perf_counter() - start
+            with profile._lock:
+                profile.seconds['join'] += elapsed
+
+    def countedGetEngine(engine):
+        split = getEngine(engine)
+        if split in splits.values():
+            return split
+        if split not in splits:
+            splits[split] = countedSplit(split)
+        return splits[split]
+
+    def countedSplit(split):
+        def counted(run, position):
+            start = time.perf_counter()
+            onset = split(run, position)
+            elapsed = time.perf_counter() - start
+            pending.split = getattr(pending, 'split', 0.0) + elapsed
+            with profile._lock:
+                profile.seconds['split'] += elapsed
+                profile.cluster_lengths[POSITIONS[position], len(run)] += 1
+                if onset is None:
+                    profile.rejected_clusters[POSITIONS[position]] += 1
+                elif position == MEDIAL:
+                    profile.onset_repairs[len(run) - onset] += 1
+            return onset
+        return counted
+
+    replacements = {tokenize: timedTokenize, scanPhoneIDs: timedScan,
+                    scanSyllabic: countedSyllabic, joinSyllables: timedJoin,
+                    getEngine: countedGetEngine}
+    for module in list(sys.modules.values()):
+        if not getattr(module, '__name__', '').startswith('syllabifier.'):
+            continue
+        for name, function in list(vars(module).items()):
+            if callable(function) and function in replacements:
+                ORIGINALS.append((module, name, function))
+                setattr(module, name, replacements[function])
+    return profile
+
+
+def disable():
+    """
+    Stops collecting counters and puts the original functions back.
+    """
+    for module, name, function in ORIGINALS:
+        setattr(module, name, function)
+    ORIGINALS.clear()
+
+
+def isEnabled():
+    """
+    Tests if profiling is enabled.
+    """
+    return bool(ORIGINALS)
+
+
+@contextlib.contextmanager
+def profiling(profile=None):
+    """
+    Context manager that enables profiling for the duration of a block.
+
+    Args:
+        profile: The Profile to collect counters into (default: a new one)
+
+    Yields:
+        The Profile.
+    """
+    profile = enable(Profile() if profile is None else profile)
+    try:
+        yield profile
+    finally:
+        disable()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+# result:
+# Compact syllabification results. A Syllabification keeps the phones of a word
+# once, plus the offset at which each syllable starts, and slices syllables out
+# on demand instead of holding one joined string per syllable.
+
+from syllabifier.constants import STRESSED_VOWELS
+from syllabifier.constants import SYLLABIC_CONSONANTS
+
+
+class Syllabification(object):
+    """
+    A syllabified transcription.
+
+    Args:
+        phones: A sequence of upper-case ARPABET phones
+        starts: The offsets in phones at which each syllable starts
+    """
+
+    __slots__ = ('phones', 'starts')
+
+    def __init__(self, phones, starts):
+        self.phones = tuple(phones)
+        # Offsets are stored as bytes when they fit, which is all real words
+        self.starts = bytes(starts) if len(self.phones) < 256 else tuple(starts)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def syllable(self, i):
+        """
+        Returns the phones of syllable i as a tuple.
+        """
+        start, end = self._bounds(i)
+        return self.phones[start:end]
+
+    def syllables(self):
+        """
+        Returns the phones of each syllable as a tuple of tuples.
+        """
+        return tuple(self.syllable(i) for i in range(len(self)))
+
+    def as_strings(self):
+        """
+        Returns the syllables in the format of syllabifyARPA: a list of strings
+        with the phones of each syllable joined by spaces.
+        """
+        return [' '.join(syllable) for syllable in self.syllables()]
+
+    def onset(self, i):
+        """
+        Returns the phones of syllable i before its nucleus as a tuple.
+        """
+        start, end = self._bounds(i)
+        return self.phones[start:self._nucleus(start, end)]
+
+    def nucleus(self, i):
+        """
+        Returns the nucleus (vowel or syllabic consonant) of syllable i.
+        """
+        start, end = self._bounds(i)
+        return self.phones[self._nucleus(start, end)]
+
+    def coda(self, i):
+        """
+        Returns the phones of syllable i after its nucleus as a tuple.
+        """
+        start, end = self._bounds(i)
+        return self.phones[self._nucleus(start, end) + 1:end]
+
+    def stress(self, i):
+        """
+        Returns the stress marker (0, 1 or 2) of syllable i as an int, or None
+        if its nucleus has no stress marker.
+        """
+        nucleus = self.nucleus(i)
+        return int(nucleus[2]) if len(nucleus) > 2 else None
+
+    def __eq__(self, other):
+        if not isinstance(other, Syllabification):
+            return NotImplemented
+        return self.phones == other.phones and tuple(self.starts) == tuple(other.starts)
+
+    def __hash__(self):
+        return hash((self.phones, tuple(self.starts)))
+
+    def __repr__(self):
+        return 'Syllabification(%r)' % self.as_strings()
+
+    def _bounds(self, i):
+        i = range(len(self.starts))[i]
+        end = self.starts[i + 1] if i + 1 < len(self.starts) else len(self.phones)
+        return self.starts[i], end
+
+    def _nucleus(self, start, end):
+        for position in range(start, end):
+            if self.phones[position] in STRESSED_VOWELS:
+                return position
+        # Syllables from syllabic_consonants=True may have a consonant nucleus
+        for position in range(start, end):
+            if self.phones[position] in SYLLABIC_CONSONANTS:
+                return position
+        raise ValueError('Syllable %s has no nucleus' % ' '.join(self.phones[start:end]))
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+# rules:
+# Syllabification rules as data. A rule file (english.json holds the default
+# General American rules) names classes of phones and lists the legal onset and
+# coda clusters as patterns over them, plus the final /s/, /z/, /t/ and /d/ that
+# may extend a legal coda. Rules are compiled into the tables of legal clusters
+# that the engines look runs up in, and the tables are kept in the disk cache
+# keyed on the rule data, so a process only compiles rules it has not seen.
+#
+# A class or pattern slot is a string of space-separated terms: phones or names
+# of classes defined before it. Terms starting with '-' are taken out, e.g.
+# "CONSONANTS -NG" is every consonant but NG.
+
+import itertools
+import os
+
+from syllabifier.diskcache import loadCached
+from syllabifier.diskcache import sourceKey
+from syllabifier.phones import CONSONANT_IDS
+from syllabifier.phones import PHONE_IDS
+
+# Positions of a consonant run in a word, for splitRun
+INITIAL = 0
+MEDIAL = 1
+FINAL = 2
+
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'english.json')
+
+# The files the compiled tables depend on besides the rule data
+COMPILER_SOURCES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                    for name in ('rules.py', 'phones.py', 'constants.py')]
+
+# Tables already compiled in this process, by rule data
+COMPILED = {}
+
+
+class RuleSet(object):
+    """
+    A compiled set of syllabification rules. Its splitRun method is a
+    syllabification engine.
+
+    Args:
+        data: The rules as JSON (bytes or a string, e.g. the contents of a rule
+        file) or as a dictionary in the same format
+
+    Attributes:
+        data: The rules as JSON bytes
+        key: Hash of the rule data and the compiler, as a hex string
+        legal_onsets: Frozenset of the legal onsets as tuples of phones
+        legal_codas: Frozenset of the legal codas as tuples of phones
+        onset_ids: The legal onsets as tuples of phone IDs
+        coda_ids: The legal codas as tuples of phone IDs
+        max_onset: Number of phones in the longest legal onset
+        max_coda: Number of phones in the longest legal coda
+
+    Raises:
+        ValueError if the rules are malformed or use unknown phones or classes.
+    """
+
+    __slots__ = ('data', 'key', 'legal_onsets', 'legal_codas', 'onset_ids', 'coda_ids',
+                 'max_onset', 'max_coda')
+
+    def __init__(self, data):
+        if isinstance(data, dict):
+            import json
+            data = json.dumps(data)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.data = data
+        self.key = sourceKey(COMPILER_SOURCES, data)
+
+        tables = COMPILED.get(data)
+        if tables is None:
+            tables = COMPILED[data] = loadCached('rules', COMPILER_SOURCES,
+                                                 lambda: compileRules(parseRules(data)), data,
+                                                 self.key)
+        self.legal_onsets, self.legal_codas, self.onset_ids, self.coda_ids = tables
+        self.max_onset = max(len(onset) for onset in self.onset_ids)
+        self.max_coda = max(len(coda) for coda in self.coda_ids)
+
+    @classmethod
+    def load(cls, path=DEFAULT_RULES):
+        """
+        Reads and compiles a rule file (default english.json).
+        """
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def __reduce__(self):
+        # Only the rule data is sent to worker processes, which recompile it
+        # or load it from their cache
+        return RuleSet, (self.data,)
+
+    def tables(self):
+        """
+        Returns the legal onsets and codas as phones and as phone IDs, in the
+        order of syllabifyARPA's LEGAL_ONSETS, LEGAL_CODAS, ONSET_IDS and
+        CODA_IDS.
+        """
+        return self.legal_onsets, self.legal_codas, self.onset_ids, self.coda_ids
+
+    def splitRun(self, run, position):
+        """
+        Decides how a run of consonant IDs is split between the coda of one
+        syllable and the onset of the next.
+
+        Args:
+            run: A tuple of consonant IDs
+            position: INITIAL for the run before the first vowel, which must all
+            be onset; FINAL for the run after the last vowel, which must all be
+            coda; MEDIAL for a run between two vowels
+
+        Returns:
+            The number of consonants at the end of the run that form the onset
+            of the next syllable (the longest legal onset), or None if the run
+            cannot be split legally.
+        """
+        if position == MEDIAL:
+            onset_ids = self.onset_ids
+            for onset in range(min(len(run), self.max_onset), 0, -1):
+                if run[-onset:] in onset_ids:
+                    break
+            else:
+                onset = 0
+            return onset if run[:len(run) - onset] in self.coda_ids else None
+        if position == INITIAL:
+            return len(run) if run in self.onset_ids else None
+        return 0 if run in self.coda_ids else None
+
+
+def parseRules(data):
+    """
+    Parses JSON rule data.
+
+    Returns:
+        The rules as a dictionary.
+
+    Raises:
+        ValueError if the data is not a JSON object.
+    """
+    import json
+    rules = json.loads(data.decode('utf-8'))
+    if not isinstance(rules, dict):
+        raise ValueError('Rules must be a JSON object')
+    return rules
+
+
+def compileRules(rules):
+    """
+    Compiles rules into tables of legal onsets and codas.
+
+    Args:
+        rules: Dictionary with
+            classes: Names of phone classes and their terms, in definition order
+            onsets: List of legal onset patterns, each a list of slots
+            codas: List of legal coda patterns, each a list of slots
+            coda_extensions: Optional dictionary from a phone that may be added
+            at the end of a legal coda to the slot of phones it may follow
+            max_coda: Optional maximum number of phones in an extended coda
+
+    Returns:
+        Tuple of frozensets of the legal onsets and codas as tuples of phones,
+        and of the same as tuples of phone IDs.
+
+    Raises:
+        ValueError if the rules are malformed or use unknown phones or classes.
+    """
+    try:
+        classes = {}
+        for name, terms in rules.get('classes', {}).items():
+            classes[name] = expandTerms(terms, classes)
+
+        onsets = expandPatterns(rules['onsets'], classes)
+        codas = expandPatterns(rules['codas'], classes)
+
+        # Extend codas by a phone at a time, so extensions can stack up to
+        # max_coda phones
+        extensions = {phone: expandTerms(terms, classes)
+                      for phone, terms in rules.get('coda_extensions', {}).items()}
+        # The phones added must be consonants too
+        expandTerms(' '.join(extensions), classes)
+        max_coda = rules.get('max_coda', max(len(coda) for coda in codas))
+        extendable = set(coda for coda in codas if coda)
+        while extendable:
+            extendable = set(coda + (phone,) for coda in extendable if len(coda) < max_coda
+                             for phone in extensions if coda[-1] in extensions[phone])
+            extendable.difference_update(codas)
+            codas.update(extendable)
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError('Malformed rules: %r' % e)
+
+    return (frozenset(onsets), frozenset(codas),
+            frozenset(tuple(PHONE_IDS[phone] for phone in onset) for onset in onsets),
+            frozenset(tuple(PHONE_IDS[phone] for phone in coda) for coda in codas))
+
+
+def expandPatterns(patterns, classes):
+    """
+    Lists every cluster matched by a list of patterns.
+
+    Returns:
+        Set of tuples of phones.
+    """
+    return set(cluster for pattern in patterns for cluster in
+               itertools.product(*[sorted(expandTerms(slot, classes)) for slot in pattern]))
+
+
+def expandTerms(terms, classes):
+    """
+    Expands a string of terms into a set of consonant phones.
+
+    Raises:
+        ValueError for terms that are neither consonants nor known classes.
+    """
+    phones = set()
+    excluded = set()
+    for term in terms.split():
+        name = term[1:] if term.startswith('-') else term
+        if name in classes:
+            expansion = classes[name]
+        elif PHONE_IDS.get(name) in CONSONANT_IDS:
+            expansion = [name]
+        else:
+            raise ValueError('%s is neither a consonant nor a phone class' % name)
+        (excluded if term.startswith('-') else phones).update(expansion)
+    return phones.difference(excluded)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+# service:
+# Asyncio front-end for syllabification. Words awaited one at a time by many
+# callers are collected into batches over a short window and syllabified off the
+# event loop in an executor, so bursts of requests neither block the loop nor pay
+# per-call dispatch costs. serve() exposes it over TCP as newline-delimited JSON:
+#
+#   request:  {"id": 1, "pron": "HH AE1 NG M AE2 N"}
+#   response: {"id": 1, "status": "OK", "syllables": ["HH AE1 NG", "M AE2 N"]}
+
+import asyncio
+import json
+
+from syllabifier.phones import BYTES_TYPES
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import ERROR_MESSAGES
+from syllabifier.syllabifyARPA import syllabify_many
+
+
+def syllabifyBatch(arpa_arrs, engine='table'):
+    """
+    Syllabifies a list of transcriptions in an executor.
+
+    Returns:
+        List of (Status, syllables) tuples, as yielded by syllabify_many.
+    """
+    return list(syllabify_many(arpa_arrs, engine))
+
+
+class AsyncSyllabifier(object):
+    """
+    Batches concurrent syllabification requests. Use it as an async context
+    manager, or call close() when done.
+
+    Args:
+        max_batch: Largest number of words sent to the executor at once
+        (default 256)
+        max_delay: Longest time in seconds that a word waits for its batch to
+        fill up (default 0.002)
+        max_pending: Largest number of words queued or being syllabified;
+        further callers wait for a slot (default 4096)
+        executor: concurrent.futures executor the batches run in (default: the
+        event loop's default thread pool). A ProcessPoolExecutor runs batches
+        on several cores.
+        engine: Name of the syllabification engine (default 'table')
+    """
+
+    def __init__(self, max_batch=256, max_delay=0.002, max_pending=4096, executor=None,
+                 engine='table'):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.executor = executor
+        self.engine = engine
+        self._queue = None
+        self._slots = None
+        self._dispatcher = None
+        self._batches = set()
+        self._closed = False
+
+    async def syllabify(self, arpa_arr, silence_warnings=False):
+        """
+        Syllabifies one transcription like syllabifyARPA does.
+
+        Returns:
+            List of strings with syllables in each row, which is empty if the
+            input is unsyllabifiable and silence_warnings is set.
+
+        Raises:
+            ValueError like syllabifyARPA.
+        """
+        status, syllables = await self.submit(arpa_arr)
+        if status and not silence_warnings:
+            raise ValueError(ERROR_MESSAGES[status] % ' '.join(tokenize(arpa_arr)[0]))
+        return syllables
+
+    async def submit(self, arpa_arr):
+        """
+        Syllabifies one transcription without raising.
+
+        Returns:
+            Tuple of a Status and the list of syllable strings, which is empty
+            unless the status is Status.OK.
+
+        Raises:
+            TypeError if the transcription is not a string, bytes-like object or
+            array of them.
+            RuntimeError if the syllabifier is closed, also while waiting for a
+            slot.
+        """
+        # Checked here, so one bad request cannot fail the rest of its batch
+        phone_types = (str,) + BYTES_TYPES
+        if not (isinstance(arpa_arr, phone_types)
+                or all(isinstance(phone, phone_types) for phone in arpa_arr)):
+            raise TypeError('Expected a string, bytes-like object or array of them, got %r'
+                            % (arpa_arr,))
+        arpa_arr = tokenize(arpa_arr)[0]
+
+        if self._closed:
+            raise RuntimeError('AsyncSyllabifier is closed')
+        if self._dispatcher is None:
+            self._start()
+
+        await self._slots.acquire()
+        try:
+            # Callers still waiting for a slot when close() was called are woken
+            # as the words it flushes release theirs, and fail here in turn
+            if self._closed:
+                raise RuntimeError('AsyncSyllabifier is closed')
+            future = asyncio.get_event_loop().create_future()
+            self._queue.put_nowait((arpa_arr, future))
+            return await future
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        """
+        Stops dispatching, then syllabifies the words still queued and waits for
+        every batch to finish. Callers still waiting for a slot, and later
+        callers, get a RuntimeError.
+        """
+        self._closed = True
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self._dispatcher = None
+
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._startBatch(batch)
+        if self._batches:
+            await asyncio.wait(self._batches)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _start(self):
+        # Created here rather than in __init__ so they belong to the running loop
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self):
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await self._fillBatch(batch)
+            finally:
+                # Also when cancelled by close(), so no caller is left waiting
+                self._startBatch(batch)
+
+    async def _fillBatch(self, batch):
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                return
+
+    def _startBatch(self, batch):
+        task = asyncio.ensure_future(self._runBatch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _runBatch(self, batch):
+        arpa_arrs = [arpa_arr for arpa_arr, future in batch]
+        try:
+            results = await asyncio.get_event_loop().run_in_executor(
+                self.executor, syllabifyBatch, arpa_arrs, self.engine)
+        except Exception as e:
+            for arpa_arr, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (arpa_arr, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def startServer(syllabifier, host='127.0.0.1', port=8765, max_requests=256):
+    """
+    Starts a TCP server answering newline-delimited JSON requests with an
+    AsyncSyllabifier. Requests on one connection are answered as they finish,
+    so responses carry the 'id' of their request.
+
+    Args:
+        max_requests: Largest number of requests of one connection answered at
+        once; the connection is not read further until one of them finishes
+        (default 256)
+
+    Returns:
+        The asyncio Server.
+    """
+    async def handleConnection(reader, writer):
+        lock = asyncio.Lock()
+        responses = set()
+        slots = asyncio.Semaphore(max_requests)
+
+        async def respond(line):
+            request_id = None
+            try:
+                request = json.loads(line.decode('utf-8'))
+                if isinstance(request, dict):
+                    request_id = request.get('id')
+                status, syllables = await syllabifier.submit(request['pron'])
+                response = {'id': request_id, 'status': status.name, 'syllables': syllables}
+            except RuntimeError as e:
+                # The syllabifier was closed
+                response = {'id': request_id, 'error': str(e)}
+            except (ValueError, KeyError, TypeError, AttributeError):
+                response = {'id': request_id, 'error': 'Malformed request %r'
+                            % line.decode('utf-8', 'replace').strip()}
+            await write(response)
+
+        async def write(response):
+            async with lock:
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+
+        while True:
+            line = await readLine(reader)
+            if line is None:
+                await write({'id': None, 'error': 'Request line too long'})
+                continue
+            if not line:
+                break
+            await slots.acquire()
+            task = asyncio.ensure_future(respond(line))
+            responses.add(task)
+            task.add_done_callback(responses.discard)
+            task.add_done_callback(lambda task: slots.release())
+        if responses:
+            await asyncio.wait(responses)
+        writer.close()
+
+    return await asyncio.start_server(handleConnection, host, port)
+
+
+async def readLine(reader):
+    """
+    Reads one request line from a stream.
+
+    Returns:
+        The line as bytes, b'' at the end of the stream, or None if the line was
+        longer than the stream's limit, in which case the rest of it is skipped.
+    """
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        consumed = e.consumed
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+
+def serve(host='127.0.0.1', port=8765, **options):
+    """
+    Runs a syllabification server until interrupted.
+
+    Args:
+        host: Address to listen on (default 127.0.0.1)
+        port: Port to listen on (default 8765)
+        **options: Arguments for AsyncSyllabifier
+    """
+    async def run():
+        async with AsyncSyllabifier(**options) as syllabifier:
+            server = await startServer(syllabifier, host, port)
+            async with server:
+                await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
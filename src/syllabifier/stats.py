@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+# stats:
+# Syllable-structure statistics over whole lexicons or corpora: syllable, onset,
+# coda and CV template frequencies, syllables per word and rejection reasons.
+# Entries are streamed through the syllabifier in chunks and counted per chunk,
+# in worker processes if asked to, and the counters are merged as they come back,
+# so memory only grows with the number of distinct syllables, not with the input.
+# Counts can be weighted by a token frequency given with each entry.
+
+import collections
+import functools
+
+from syllabifier.io import DEFAULT_ENCODING
+from syllabifier.lexicon import iterChunks
+from syllabifier.lexicon import mapChunks
+from syllabifier.lexicon import readEntries
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import scanPhoneIDs
+
+# The counters of SyllableStats, in report order
+TABLES = ('syllables_per_word', 'rejections', 'templates', 'onsets', 'codas', 'syllables')
+
+FORMATS = ('json', 'tsv')
+
+
+class SyllableStats(object):
+    """
+    Mergeable syllable-structure counters. Every count but entries is
+    weighted by the token frequency of each entry, which is 1 by default.
+
+    Attributes:
+        entries: Number of entries counted
+        tokens: Total token frequency of the entries counted
+        words: Total token frequency of the syllabified entries
+        syllables_per_word: Counter of the number of syllables of each word
+        rejections: Counter of the Status names of unsyllabifiable entries
+        templates: Counter of the CV templates of syllables, e.g. 'CCVC'
+        onsets: Counter of onsets, phones joined by spaces ('' for none)
+        codas: Counter of codas, phones joined by spaces ('' for none)
+        syllables: Counter of syllables, phones joined by spaces
+    """
+
+    def __init__(self):
+        self.entries = 0
+        self.tokens = 0
+        self.words = 0
+        for name in TABLES:
+            setattr(self, name, collections.Counter())
+
+    def add(self, phones, ids, status, starts, weight=1):
+        """
+        Counts one entry.
+
+        Args:
+            phones: Its upper-case phones
+            ids: Their phone IDs
+            status: The Status of its syllabification
+            starts: The offsets at which its syllables start, if it is Status.OK
+            weight: Its token frequency (default 1)
+        """
+        self.entries += 1
+        self.tokens += weight
+        if status:
+            self.rejections[status.name] += weight
+            return
+
+        self.words += weight
+        self.syllables_per_word[len(starts)] += weight
+        ends = starts[1:] + [len(ids)]
+        for start, end in zip(starts, ends):
+            template = ''.join('V' if phone_id in VOWEL_IDS else 'C'
+                               for phone_id in ids[start:end])
+            nucleus = start + template.find('V')
+            self.templates[template] += weight
+            self.onsets[' '.join(phones[start:nucleus])] += weight
+            self.codas[' '.join(phones[nucleus + 1:end])] += weight
+            self.syllables[' '.join(phones[start:end])] += weight
+
+    def merge(self, other):
+        """
+        Adds the counts of another SyllableStats to these.
+
+        Returns:
+            This SyllableStats.
+        """
+        self.entries += other.entries
+        self.tokens += other.tokens
+        self.words += other.words
+        for name in TABLES:
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def as_dict(self):
+        """
+        Returns the counts as a dictionary that can be written as JSON, with
+        each counter from the most to the least frequent.
+        """
+        report = {'entries': self.entries, 'tokens': self.tokens, 'words': self.words}
+        for name in TABLES:
+            report[name] = collections.OrderedDict(
+                (str(key), count) for key, count in mostCommon(getattr(self, name)))
+        return report
+
+    def rows(self):
+        """
+        Yields the counts as (table, key, count) tuples, with the totals in an
+        'entries' table and each counter from the most to the least frequent.
+        """
+        yield 'entries', 'entries', self.entries
+        yield 'entries', 'tokens', self.tokens
+        yield 'entries', 'words', self.words
+        for name in TABLES:
+            for key, count in mostCommon(getattr(self, name)):
+                yield name, str(key), count
+
+
+def lexicon_stats(lexicon, workers=1, chunksize=1000, encoding=DEFAULT_ENCODING,
+                  engine='table', frequencies=False):
+    """
+    Counts the syllable structure of every entry of a lexicon.
+
+    Args:
+        lexicon: Path to a CMUdict-format lexicon ('-' for standard input), or an
+        iterable of (word, pronunciation) tuples
+        workers: Number of worker processes (default 1, None for every CPU)
+        chunksize: Number of entries counted by a worker at a time
+        encoding: Encoding of the lexicon file (default latin-1)
+        engine: Name of the syllabification engine (default 'table')
+        frequencies: Boolean (default False) to weight each entry by a token
+        frequency: the last field of each line of a lexicon file (e.g.
+        'CAT  K AE1 T  1024'), or the third item of each tuple
+
+    Returns:
+        A SyllableStats.
+
+    Raises:
+        ValueError if frequencies is set and an entry has no integer frequency.
+    """
+    function = functools.partial(statsChunk, engine=engine, frequencies=frequencies)
+    stats = SyllableStats()
+    for chunk_stats in mapChunks(function, iterChunks(readEntries(lexicon, encoding), chunksize),
+                                 workers):
+        stats.merge(chunk_stats)
+    return stats
+
+
+def statsChunk(chunk, engine='table', frequencies=False):
+    """
+    Counts the syllable structure of a list of lexicon entries.
+
+    Returns:
+        A SyllableStats.
+    """
+    split = getEngine(engine)
+    stats = SyllableStats()
+    for entry in chunk:
+        word, pron, weight = splitFrequency(entry) if frequencies else (entry[0], entry[1], 1)
+        phones, ids = tokenize(pron)
+        status, starts = scanPhoneIDs(ids, split)
+        stats.add(phones, ids, status, starts, weight)
+    return stats
+
+
+def splitFrequency(entry):
+    """
+    Returns the word, pronunciation and token frequency of an entry, which is
+    either a (word, pronunciation, frequency) tuple or a (word, pronunciation)
+    tuple whose pronunciation ends with the frequency.
+    """
+    if len(entry) == 3:
+        word, pron, frequency = entry
+    else:
+        word, pron = entry
+        fields = pron.rsplit(None, 1)
+        pron, frequency = fields if len(fields) == 2 else ('', pron)
+    try:
+        return word, pron, int(frequency)
+    except ValueError:
+        raise ValueError('Entry %s has no token frequency' % word)
+
+
+def mostCommon(counter):
+    """
+    Returns the items of a Counter from the most to the least frequent, ties in
+    key order.
+    """
+    return sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+
+
+def writeStats(f, stats, format='json'):
+    """
+    Writes a report of SyllableStats to a text file.
+
+    Args:
+        f: A text file object
+        stats: The SyllableStats
+        format: 'json' for a JSON object of the counters, or 'tsv' for one
+        tab-separated TABLE KEY COUNT line per count
+    """
+    if format == 'json':
+        import json
+        json.dump(stats.as_dict(), f, indent=2)
+        f.write('\n')
+    elif format == 'tsv':
+        for row in stats.rows():
+            f.write('%s\t%s\t%d\n' % row)
+    else:
+        raise ValueError('Unknown format %r, expected one of %s' % (format, ', '.join(FORMATS)))
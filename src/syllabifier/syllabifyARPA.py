@@ -3,37 +3,92 @@
 # syllabifyARPA:
 # Syllabify ARPABET transcriptions using General American English syllabification rules
 # as found in https://en.wikipedia.org/wiki/English_phonology#Syllable_structure
-# TODO:DOC caveat with morphological and word boundaries (e.g., mistreat, sesame street)
+# Morphological and word boundaries (e.g., mistreat, sesame street) are not detected;
+# mark them for syllabify_phrase in syllabifier.phrase
 
 # October 3rd, 2017
 
-import re
-import sys
+import enum
+import itertools
 
 from syllabifier.constants import VOICELESS
-from syllabifier.constants import VOICED
 from syllabifier.constants import STOPS
-from syllabifier.constants import FRICATIVES
 from syllabifier.constants import AFFRICATES
 from syllabifier.constants import NASALS
 from syllabifier.constants import APPROXIMANTS
 from syllabifier.constants import CONSONANTS
+from syllabifier.constants import VOICELESS_STOPS
+from syllabifier.constants import VOICELESS_FRICATIVES
 from syllabifier.constants import S_EXTENDED_CODAS
 from syllabifier.constants import Z_EXTENDED_CODAS
 from syllabifier.constants import T_EXTENDED_CODAS
 from syllabifier.constants import D_EXTENDED_CODAS
-from syllabifier.constants import PHONESET
-from syllabifier.constants import VOWELS_REGEX
-
-def syllabifyARPA(arpa_arr, silence_warnings=False):
+from syllabifier.constants import STRESSED_VOWELS
+from syllabifier.phones import CONSONANT_IDS
+from syllabifier.phones import ID_PHONES
+from syllabifier.phones import PHONE_IDS
+from syllabifier.phones import SYLLABIC_IDS
+from syllabifier.phones import SYLLABIC_PAIRS
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.phones import tokenize
+from syllabifier.result import Syllabification
+from syllabifier.rules import FINAL
+from syllabifier.rules import INITIAL
+from syllabifier.rules import MEDIAL
+from syllabifier.rules import RuleSet
+
+
+class Status(enum.IntEnum):
+    """
+    Outcome of syllabifying one transcription.
+    """
+    OK = 0
+    NON_ARPABET = 1
+    NO_VOWEL = 2
+    BAD_ONSET = 3
+    BAD_CODA = 4
+
+
+# Syllabification engines: the module and name of their splitRun function
+ENGINES = {
+    'table': ('syllabifier.syllabifyARPA', 'splitRun'),
+    'fsa': ('syllabifier.automaton', 'splitRun'),
+    'memo': ('syllabifier.memo', 'MEMO'),
+}
+LOADED_ENGINES = {}
+
+# Functions that useRules calls with the new RuleSet, registered on import by
+# the modules that build their own tables from the rules
+RULE_HOOKS = []
+
+# Failures that scanSyllabic may rescue, and the vowel that stands in for a
+# syllabic consonant when it rescans a word
+SYLLABIC_RESCUES = frozenset([Status.NO_VOWEL, Status.BAD_CODA])
+SYLLABIC_NUCLEUS = PHONE_IDS['AH0']
+
+ERROR_MESSAGES = {
+    Status.NON_ARPABET: 'Input %s contains non-ARPABET phones',
+    Status.NO_VOWEL: 'Input error - no vowel in %s',
+    Status.BAD_ONSET: 'Bad onset cluster in %s',
+    Status.BAD_CODA: 'Bad coda cluster in %s',
+}
+
+
+def syllabifyARPA(arpa_arr, silence_warnings=False, engine='table',
+                  syllabic_consonants=False):
     """
     Syllabifies ARPABET transcriptions according to General American English
     syllabification rules.
 
     Args:
-        arpa_arr: A string or array of ARPABET phones with optional stress markers
-        on the vowels.
+        arpa_arr: A string, ASCII bytes-like object or array of ARPABET phones
+        with optional stress markers on the vowels. Inputs are not modified.
         silence_warnings: Boolean (default False) to suppress ValueErrors
+        engine: Name of the syllabification engine (default 'table'), see
+        ENGINES. All engines give the same results.
+        syllabic_consonants: Boolean (default False) to let L, M, N and R be
+        the nucleus of a syllable in words that cannot be syllabified
+        otherwise, see scanSyllabic
 
     Returns:
         List of strings with syllables in each row.
@@ -44,61 +99,272 @@ def syllabifyARPA(arpa_arr, silence_warnings=False):
         cannot be syllabified according to English syllabification rules.
     """
 
-    def handleError(string):
+    phones, ids = tokenize(arpa_arr)
+    status, starts = scanPhoneIDs(ids, getEngine(engine))
+    if status in SYLLABIC_RESCUES and syllabic_consonants:
+        status, starts = scanSyllabic(ids, status, getEngine(engine))
+
+    if status:
         if not silence_warnings:
-            raise ValueError(string)
+            raise ValueError(ERROR_MESSAGES[status] % ' '.join(phones))
+        return []
 
-    ret = []
+    return joinSyllables(phones, starts)
+
+
+def syllabify(arpa_arr, silence_warnings=False, engine='table', syllabic_consonants=False):
+    """
+    Syllabifies an ARPABET transcription like syllabifyARPA, but returns a
+    compact Syllabification instead of a list of joined strings. Inputs are not
+    modified.
+
+    Args:
+        arpa_arr: A string or array of ARPABET phones with optional stress markers
+        on the vowels.
+        silence_warnings: Boolean (default False) to suppress ValueErrors
+        engine: Name of the syllabification engine (default 'table')
+        syllabic_consonants: Boolean (default False) to allow syllabic
+        consonants like syllabifyARPA
+
+    Returns:
+        A Syllabification, or None if the input is unsyllabifiable and
+        silence_warnings is set.
+
+    Raises:
+        ValueError like syllabifyARPA.
+    """
+    phones, ids = tokenize(arpa_arr)
+    status, starts = scanPhoneIDs(ids, getEngine(engine))
+    if status in SYLLABIC_RESCUES and syllabic_consonants:
+        status, starts = scanSyllabic(ids, status, getEngine(engine))
+
+    if status:
+        if not silence_warnings:
+            raise ValueError(ERROR_MESSAGES[status] % ' '.join(phones))
+        return None
+
+    # Phones from ID_PHONES are shared by every Syllabification
+    return Syllabification([ID_PHONES[phone_id] for phone_id in ids], starts)
+
+
+def syllabify_many(arpa_arrs, engine='table', syllabic_consonants=False):
+    """
+    Syllabifies many ARPABET transcriptions without raising on the ones that
+    cannot be syllabified. Results are yielded lazily in input order.
+
+    Args:
+        arpa_arrs: An iterable of strings or arrays of ARPABET phones with
+        optional stress markers on the vowels. Inputs are not modified.
+        engine: Name of the syllabification engine (default 'table')
+        syllabic_consonants: Boolean (default False) to allow syllabic
+        consonants like syllabifyARPA
+
+    Yields:
+        Tuples of a Status and the list of syllable strings that syllabifyARPA
+        would return, which is empty unless the status is Status.OK.
+    """
+    split = getEngine(engine)
+
+    for arpa_arr in arpa_arrs:
+        phones, ids = tokenize(arpa_arr)
+        status, starts = scanPhoneIDs(ids, split)
+        if status in SYLLABIC_RESCUES and syllabic_consonants:
+            status, starts = scanSyllabic(ids, status, split)
+        if status:
+            yield status, []
+        else:
+            yield status, joinSyllables(phones, starts)
+
+
+def joinSyllables(phones, starts):
+    """
+    Joins the phones of each syllable with spaces.
+
+    Args:
+        phones: A sequence of phones
+        starts: The offsets in phones at which each syllable starts
+
+    Returns:
+        List of strings with syllables in each row.
+    """
+    ends = starts[1:] + [len(phones)]
+    return [' '.join(phones[start:end]) for start, end in zip(starts, ends)]
+
+
+def syllabifyIDs(ids, silence_warnings=False, engine='table', syllabic_consonants=False):
+    """
+    Syllabifies a transcription encoded as phone IDs (see syllabifier.phones).
+
+    Args:
+        ids: A sequence of phone IDs
+        silence_warnings: Boolean (default False) to suppress ValueErrors
+        engine: Name of the syllabification engine (default 'table')
+        syllabic_consonants: Boolean (default False) to allow syllabic
+        consonants like syllabifyARPA
+
+    Returns:
+        List of the offsets in ids at which each syllable starts.
+        In case the input is unsyllabifiable, an empty list is returned.
+
+    Raises:
+        ValueError if input contains non-phone IDs, no vowels or if it cannot
+        be syllabified according to English syllabification rules.
+    """
+    status, starts = scanPhoneIDs(ids, getEngine(engine))
+    if status in SYLLABIC_RESCUES and syllabic_consonants:
+        status, starts = scanSyllabic(ids, status, getEngine(engine))
+
+    if status:
+        if not silence_warnings:
+            raise ValueError(ERROR_MESSAGES[status] % list(ids))
+        return []
+
+    return starts
+
+
+def scanPhoneIDs(ids, split=None):
+    """
+    Syllabifies phone IDs in a single left-to-right pass. Each run of consonants
+    is split when the vowel after it is reached: the longest legal onset goes to
+    the next syllable and the rest must be a legal coda of the previous one.
+
+    Args:
+        ids: A sequence of phone IDs. Entries that are not phone IDs (e.g. None
+        for an unknown phone) make the input non-ARPABET.
+        split: Function deciding where each run of consonants is split, with the
+        signature of splitRun (default splitRun). See getEngine.
+
+    Returns:
+        Tuple of a Status and the list of offsets at which each syllable starts,
+        which is None unless the status is Status.OK.
+    """
+    if split is None:
+        split = getEngine('table')
+    status = Status.OK
+    starts = []
+    run_start = 0
+
+    for i, phone_id in enumerate(ids):
+        if phone_id in VOWEL_IDS:
+            if status:
+                continue
+            onset = split(tuple(ids[run_start:i]), MEDIAL if starts else INITIAL)
+            if onset is None:
+                status = Status.BAD_CODA if starts else Status.BAD_ONSET
+                continue
+            starts.append(i - onset)
+            run_start = i + 1
+        elif phone_id not in CONSONANT_IDS:
+            return Status.NON_ARPABET, None
+
+    if status:
+        return status, None
+
+    if not starts:
+        return (Status.NO_VOWEL if run_start < len(ids) else Status.OK), starts
+
+    if split(tuple(ids[run_start:]), FINAL) is None:
+        return Status.BAD_CODA, None
+
+    return Status.OK, starts
+
+
+def scanSyllabic(ids, status, split=None):
+    """
+    Rescans phone IDs that scanPhoneIDs could not syllabify for lack of a vowel
+    or because of a bad coda, with syllabic consonants as nuclei. An L, M, N or
+    R is syllabic when it comes after an obstruent (see SYLLABIC_PAIRS) or
+    starts a word without vowels, and is not followed by a vowel, as in
+    B IY T L or HH M. Words that syllabify are never rescanned, so this costs
+    nothing for them.
+
+    Args:
+        ids: A sequence of phone IDs
+        status: The Status scanPhoneIDs returned for them
+        split: Function deciding where each run of consonants is split (default
+        splitRun)
+
+    Returns:
+        Tuple of a Status and the list of offsets at which each syllable starts,
+        like scanPhoneIDs. The original status is returned when there is no
+        syllabic consonant.
+    """
+    has_vowel = not VOWEL_IDS.isdisjoint(ids)
+    rescued = list(ids)
+    for i, phone_id in enumerate(ids):
+        if phone_id in SYLLABIC_IDS \
+                and ((ids[i - 1], phone_id) in SYLLABIC_PAIRS if i else not has_vowel) \
+                and (i + 1 == len(ids) or ids[i + 1] not in VOWEL_IDS):
+            rescued[i] = SYLLABIC_NUCLEUS
+
+    if rescued == list(ids):
+        return status, None
+    return scanPhoneIDs(rescued, split)
+
+
+def useRules(rules=None):
+    """
+    Switches every engine to another compiled rule set, e.g. to pick up an
+    edited rule file in a long-running worker. The 'table' engine, which every
+    function uses by default, is swapped with a single assignment, and so are
+    the tables that other modules build from the rules (see RULE_HOOKS): each
+    word is syllabified entirely with the rules it started with. Engines made
+    from a RuleSet directly, e.g. RuleSet.splitRun, keep their own rules.
+
+    Args:
+        rules: A RuleSet (see syllabifier.rules), or None for the default rules
+    """
+    global RULES, LEGAL_ONSETS, LEGAL_CODAS, ONSET_IDS, CODA_IDS, splitRun
+    if rules is None:
+        rules = RuleSet.load()
+    LEGAL_ONSETS, LEGAL_CODAS, ONSET_IDS, CODA_IDS = rules.tables()
+    RULES = rules
+    splitRun = rules.splitRun
+    if 'table' in LOADED_ENGINES:
+        LOADED_ENGINES['table'] = splitRun
+    for hook in RULE_HOOKS:
+        hook(rules)
+
+
+def engineRules(split):
+    """
+    Returns the RuleSet a splitRun function follows: its own for the splitRun
+    method of a RuleSet or for an engine with a rules attribute (e.g. a
+    SplitMemo), and the rules of the 'table' engine for any other.
+    """
+    rules = getattr(split, '__self__', None)
+    if isinstance(rules, RuleSet):
+        return rules
+    rules = getattr(split, 'rules', None)
+    return loadRules() if rules is None else rules
+
+
+def getEngine(engine):
+    """
+    Looks up the function a syllabification engine uses to split consonant runs.
+
+    Args:
+        engine: The name of an engine in ENGINES, or a function with the
+        signature of splitRun
+
+    Returns:
+        A function with the signature of splitRun.
+
+    Raises:
+        ValueError if there is no engine with that name.
+    """
+    if callable(engine):
+        return engine
+    if engine not in LOADED_ENGINES:
+        try:
+            module, name = ENGINES[engine]
+        except KeyError:
+            raise ValueError('Unknown engine %r, expected one of %s'
+                             % (engine, ', '.join(sorted(ENGINES))))
+        # Like importlib.import_module, without importing importlib
+        LOADED_ENGINES[engine] = getattr(__import__(module, fromlist=[name]), name)
+    return LOADED_ENGINES[engine]
 
-    try:
-        arpa_arr = arpa_arr.split() # Allows for phoneme array and string input
-    except:
-        pass
-
-    for i in range(len(arpa_arr)):
-        arpa_arr[i] = arpa_arr[i].upper()
-
-    word = ' '.join(arpa_arr)
-
-    if not (testInPhoneset(arpa_arr)):
-        handleError('Input %s contains non-ARPABET phones' % word)
-        return ret
-
-    final_arr = []
-    temp_arr = []
-
-    # Append till and including vowels
-    for i in range(len(arpa_arr)):
-        temp_arr.append(arpa_arr[i])
-        if re.match(VOWELS_REGEX, arpa_arr[i]):
-            final_arr.append(temp_arr)
-            temp_arr = []
-
-    # Handle potential remaining coda consonants
-    for i in range(len(temp_arr)):
-        if len(final_arr) < 1:
-            handleError('Input error - no vowel in %s' % word)
-            return ret
-        final_arr[-1].append(temp_arr[i])
-
-    # All onsets are maximized, some are illegal - fixing that
-    for i in range(len(final_arr)):
-        while testLegalOnset(final_arr[i]):
-            if i == 0:
-                handleError('Bad onset cluster in %s' % word)
-                return ret
-            c = testLegalOnset(final_arr[i])
-            final_arr[i].remove(c)
-            final_arr[i-1].append(c)
-
-    for i in range(len(final_arr)):
-        if not testLegalCoda(final_arr[i]):
-            handleError('Bad coda cluster in %s' % word)
-            return ret
-
-    ret = [' '.join(syllable) for syllable in final_arr]
-
-    return ret
 
 def testInPhoneset(arr):
     """
@@ -113,102 +379,125 @@ def testInPhoneset(arr):
         stress markers.
     """
     for i in range(len(arr)):
-        if not (arr[i] in PHONESET or re.match(VOWELS_REGEX, arr[i])):
+        if arr[i] not in PHONE_IDS:
             return False
     return True
 
-def testLegalOnset(syllable):
+
+# Phones that cannot be codas by themselves
+NON_CODA_PHONES = frozenset(['HH', 'W', 'Y'])
+
+# Coda extensions: a final /s/, /z/, /t/ or /d/ and the phones it may follow
+CODA_EXTENSIONS = {
+    'S': frozenset(S_EXTENDED_CODAS),
+    'Z': frozenset(Z_EXTENDED_CODAS),
+    'T': frozenset(T_EXTENDED_CODAS),
+    'D': frozenset(D_EXTENDED_CODAS),
+}
+
+# Legal 3-phone codas that are not an extension of a 2-phone coda, by first phone
+THREE_PHONE_CODAS = {
+    # e.g., Alps, milked
+    'L': frozenset([('P', 'T'), ('P', 'S'), ('F', 'TH'), ('T', 'S'), ('K', 'T'), ('K', 'S'),
+                    ('S', 'T')]),
+    # e.g., carts, worst
+    'R': frozenset([('P', 'T'), ('P', 'S'), ('M', 'TH'), ('T', 'S'), ('K', 'T'), ('S', 'T')]),
+    # e.g., mumps
+    'M': frozenset([('P', 'T'), ('P', 'S')]),
+    # e.g., thousandth
+    'N': frozenset([('D', 'TH')]),
+    # e.g., angst
+    'NG': frozenset([('K', 'T'), ('K', 'S'), ('K', 'TH'), ('S', 'T')]),
+    # e.g., sixth
+    'K': frozenset([('S', 'TH'), ('S', 'T')]),
+}
+
+# Legal 2-phone codas that are not an extension of a 1-phone coda, by first phone
+TWO_PHONE_CODAS = {
+    # e.g., elk, health
+    'L': frozenset(STOPS.difference(['G']).union(AFFRICATES)
+                   .union(['F', 'S', 'SH', 'TH', 'V']).union(NASALS.difference(['NG']))),
+    # e.g., arc, yarn
+    'R': frozenset(STOPS.union(AFFRICATES).union(['F', 'S', 'SH', 'TH', 'V', 'Z'])
+                   .union(NASALS.difference(['NG'])).union(['L'])),
+    # e.g., bent, ink
+    'M': frozenset(['P', 'F', 'TH', 'B']),
+    'N': frozenset(['T', 'D', 'CH', 'JH', 'TH', 'S', 'Z', 'F']),
+    'NG': frozenset(['K', 'TH', 'G']),
+    # e.g., pact, width
+    'F': frozenset(['T', 'TH']),
+    'S': frozenset(['P', 'T', 'K']),
+    'P': frozenset(['T', 'TH', 'S', 'F']),
+    'K': frozenset(['T', 'S', 'SH']),
+    'T': frozenset(['S', 'TH']),
+    'D': frozenset(['TH']),
+}
+
+# Second phones of legal 2-phone onsets, by first phone
+TWO_PHONE_ONSET_APPROXIMANT_HEADS = frozenset(
+    STOPS.union(VOICELESS_FRICATIVES).union(['V', 'M']))
+S_ONSET_TAILS = frozenset(VOICELESS.difference(AFFRICATES).union(NASALS.difference(['NG']))
+                          .union(['V']))
+
+
+def isLegalOnsetCluster(cluster):
     """
-    Function to test for legal onset clusters.
+    Applies the English onset rules to a consonant cluster. This is the slow,
+    rule-by-rule reference that the default rules in english.json are tested
+    against; use testLegalOnset on syllables.
 
     Args:
-        syllable: An array of phones in a transcription containing a vowel
+        cluster: A sequence of consonant phones
 
     Returns:
-        None if the input's onset is legal. Otherwise, returns the first
-        phone of the onset for removal and subsequent appendage to the previous
-        syllable's coda.
+        True if the cluster is a legal syllable onset.
     """
 
-    cluster = []
-
-    for i in range(len(syllable)):
-        if re.match(VOWELS_REGEX, syllable[i]):
-            break
-        else:
-            cluster.append(syllable[i])
-
     length = len(cluster)
 
     if length > 3:
-        return cluster[0]
+        return False
 
     elif length == 3:
-        # Only s-clusters can be length 3
-        if not (cluster[0] == 'S'):
-            return cluster[0]
-        # Clusters beginning with s can only be of the forms
+        # Only s-clusters can be length 3, and they can only be of the forms
         # s-voiceless_stop-approximant or s-voiceless_fricative-r
-        elif not (
-        (cluster[1] in VOICELESS.intersection(STOPS) and cluster[2] in APPROXIMANTS)
-            or
-        (cluster[1] in VOICELESS.intersection(FRICATIVES) and cluster[2] == 'R')):
-            return cluster[0]
+        return cluster[0] == 'S' and (
+            (cluster[1] in VOICELESS_STOPS and cluster[2] in APPROXIMANTS) or
+            (cluster[1] in VOICELESS_FRICATIVES and cluster[2] == 'R'))
 
     elif length == 2:
-        if not (
         # Valid length-2 consonant clusters are consonant-Y, stop-approximant
-        # and voiceless_fricative_or_V-approximant
-        (cluster[0] in CONSONANTS and cluster[1] == 'Y')
-            or
-        (cluster[0] in STOPS and cluster[1] in APPROXIMANTS)
-            or
-        (cluster[0] in VOICELESS.intersection(FRICATIVES).union(['V']) and
-        cluster[1] in APPROXIMANTS)
-            or
+        # and voiceless_fricative_or_V-approximant (M-approximant and N-W are
+        # normalized through loanwords)
         # Only s-voiceless_stop, s-voiceless_fricative and s-non_NG_nasals
-        # are valid length-2 s-clusters
-        (cluster[0] == 'S' and cluster[1] in VOICELESS.difference(AFFRICATES))
-            or
-        (cluster[0] == 'S' and cluster[1] in NASALS.difference(['NG']))
-            or
-        # Other clusters normalized through loanwords, e.g. SH-N, S-V, NW, MR
-        (cluster[0] == 'SH' and cluster[1] in NASALS and cluster != 'NG')
-            or
-        (cluster[0] == 'S' and cluster[1] == 'V')
-            or
-        (cluster[0] == 'M' and cluster[1] in APPROXIMANTS)
-            or
-        (cluster[0] == 'N' and cluster[1] == 'W')):
-            return cluster[0]
-
-    elif length == 1 and cluster[0] == 'NG':
+        # are valid length-2 s-clusters (plus S-V and SH-nasal from loanwords)
+        return (
+            (cluster[0] in CONSONANTS and cluster[1] == 'Y') or
+            (cluster[0] in TWO_PHONE_ONSET_APPROXIMANT_HEADS and cluster[1] in APPROXIMANTS) or
+            (cluster[0] == 'S' and cluster[1] in S_ONSET_TAILS) or
+            (cluster[0] == 'SH' and cluster[1] in NASALS) or
+            (cluster[0] == 'N' and cluster[1] == 'W'))
+
+    elif length == 1:
         # Single-consonant-onsets are valid except for NG
-        return cluster[0]
+        return cluster[0] != 'NG'
+
+    return True
 
-    return None
 
-def testLegalCoda(syllable):
+def isLegalCodaCluster(cluster):
     """
-    Function to test for legal coda clusters.
+    Applies the English coda rules to a consonant cluster. This is the slow,
+    rule-by-rule reference that the default rules in english.json are tested
+    against; use testLegalCoda on syllables.
 
     Args:
-        syllable: An array of phones in a transcription containing a vowel
+        cluster: A sequence of consonant phones
 
     Returns:
-        True if the coda cluster (phones after the vowel in the syllable) is
-        legal according to English syllabification rules.
+        True if the cluster is a legal syllable coda.
     """
 
-    cluster = []
-
-    postvowel = False
-    for i in range(len(syllable)):
-        if postvowel:
-            cluster.append(syllable[i])
-        if re.match(VOWELS_REGEX, syllable[i]):
-            postvowel = True
-
     length = len(cluster)
 
     if length == 0:
@@ -218,153 +507,139 @@ def testLegalCoda(syllable):
     elif length > 4:
         return False
 
+    # 4-phone codas must be a 3-phone coda with /s/, /z/, /t/ or /d/ at the end
     elif length == 4:
-        # 4-phoneme codas must have /s/, /z/, /t/ or /d/ at the end
-        if ((cluster[3] == 'S' and cluster[2] in S_EXTENDED_CODAS)
-            or
-        (cluster[3] == 'Z' and cluster[2] in Z_EXTENDED_CODAS)
-            or
-        (cluster[3] == 'T' and cluster[2] in T_EXTENDED_CODAS)
-            or
-        (cluster[3] == 'D' and cluster[2] in D_EXTENDED_CODAS)):
-            length -= 1
-        else:
-            return False
+        return isExtendedCoda(cluster) and isLegalCodaCluster(cluster[:3])
 
-    # if instead of elif to check s-, z-, t-, d-appended clusters
-
-    if length == 3:
-        if ((cluster[2] == 'S' and cluster[1] in S_EXTENDED_CODAS)
-            or
-        (cluster[2] == 'Z' and cluster[1] in Z_EXTENDED_CODAS)
-            or
-        (cluster[2] == 'T' and cluster[1] in T_EXTENDED_CODAS)
-            or
-        (cluster[2] == 'D' and cluster[1] in D_EXTENDED_CODAS)):
-            length -= 1
-
-        # 3-phone clusters beginning with L, e.g., Alps, milked
-        elif cluster[0] == 'L' and (
-        (cluster[1] == 'P' and cluster[2] == 'T')
-            or
-        (cluster[1] == 'P' and cluster[2] == 'S')
-            or
-        (cluster[1] == 'F' and cluster[2] == 'TH')
-            or
-        (cluster[1] == 'T' and cluster[2] == 'S')
-            or
-        (cluster[1] == 'K' and cluster[2] == 'T')
-            or
-        (cluster[1] == 'K' and cluster[2] == 'S')
-            or
-        (cluster[1] == 'S' and cluster[2] == 'T')):
-            return True
+    elif length == 3:
+        if isExtendedCoda(cluster):
+            return isLegalCodaCluster(cluster[:2])
+        return tuple(cluster[1:]) in THREE_PHONE_CODAS.get(cluster[0], ())
 
-        # 3-phone clusters beginning with R, e.g., carts, worst
-        elif cluster[0] == 'R' and (
-        (cluster[1] == 'P' and cluster[2] == 'T')
-            or
-        (cluster[1] == 'P' and cluster[2] == 'S')
-            or
-        (cluster[1] == 'M' and cluster[2] == 'TH')
-            or
-        (cluster[1] == 'T' and cluster[2] == 'S')
-            or
-        (cluster[1] == 'K' and cluster[2] == 'T')
-            or
-        (cluster[1] == 'S' and cluster[2] == 'T')):
+    elif length == 2:
+        if cluster[1] in TWO_PHONE_CODAS.get(cluster[0], ()):
             return True
+        return isExtendedCoda(cluster) and isLegalCodaCluster(cluster[:1])
 
-        # 3-phone clusters beginning with M, e.g., mumps
-        elif cluster[0] == 'M' and (
-        (cluster[1] == 'P' and cluster[2] == 'T')
-            or
-        (cluster[1] == 'P' and cluster[2] == 'S')):
-            return True
+    # These phonemes cannot exist as codas by themselves
+    return cluster[0] not in NON_CODA_PHONES
 
-        # 3-phone clusters beginning with N, e.g., thousandth
-        elif cluster[0] == 'N' and (
-        (cluster[1] == 'D' and cluster[2] == 'TH')):
-            return True
 
-        # 3-phone clusters beginning with NG, e.g., angst
-        elif cluster[0] == 'NG' and (
-        (cluster[1] == 'K' and cluster[2] == 'T')
-            or
-        (cluster[1] == 'K' and cluster[2] == 'S')
-            or
-        (cluster[1] == 'K' and cluster[2] == 'TH')
-            or
-        (cluster[1] == 'S' and cluster[2] == 'T')):
-            return True
+def isExtendedCoda(cluster):
+    """
+    Tests if the last phone of a coda cluster is an /s/, /z/, /t/ or /d/ that may
+    follow the phone before it.
+    """
+    return cluster[-2] in CODA_EXTENSIONS.get(cluster[-1], ())
 
-        # 3-phone clusters beginning with K, e.g., sixth
-        elif (
-        (cluster[0] == 'K' and cluster[1] == 'S' and cluster[2] == 'TH')
-            or
-        (cluster[0] == 'K' and cluster[1] == 'S' and cluster[2] == 'T')):
-            return True
 
-    if length == 2:
-        if ((cluster[1] == 'S' and cluster[0] in S_EXTENDED_CODAS)
-            or
-        (cluster[1] == 'Z' and cluster[0] in Z_EXTENDED_CODAS)
-            or
-        (cluster[1] == 'T' and cluster[0] in T_EXTENDED_CODAS)
-            or
-        (cluster[1] == 'D' and cluster[0] in D_EXTENDED_CODAS)):
-            length -= 1
-
-        # 2-phone clusters beginning with L, e.g., elk, health
-        if cluster[0] == 'L' and (
-        cluster[1] in STOPS.difference(['G'])
-            or
-        cluster[1] in AFFRICATES
-            or
-        cluster[1] in set(['F', 'S', 'SH', 'TH', 'V'])
-            or
-        cluster[1] in NASALS.difference(['NG'])):
-            return True
+def buildLegalOnsets():
+    """
+    Lists every legal onset cluster, up to the 3-phone limit of the onset rules.
 
-        # 2-phone clusters beginning with R, e.g., arc, yarn
-        elif cluster[0] == 'R' and (
-        cluster[1] in STOPS
-            or
-        cluster[1] in AFFRICATES
-            or
-        cluster[1] in set(['F', 'S', 'SH', 'TH', 'V', 'Z'])
-            or
-        cluster[1] in NASALS.difference(['NG'])
-            or
-        cluster[1] == 'L'):
-            return True
+    Returns:
+        A frozenset of tuples of phones.
+    """
+    consonants = sorted(CONSONANTS)
+    return frozenset(cluster for length in range(4)
+                     for cluster in itertools.product(consonants, repeat=length)
+                     if isLegalOnsetCluster(cluster))
 
-        # 2-phone clusters beginning with nasals, e.g., bent, ink
-        elif cluster[0] == 'M' and cluster[1] in set(['P', 'F', 'TH', 'B']):
-            return True
-        elif cluster[0] == 'N' and cluster[1] in set(['T', 'D', 'CH', 'JH', 'TH', 'S', 'Z', 'F']):
-            return True
-        elif cluster[0] == 'NG' and cluster[1] in set(['K', 'TH', 'G']):
-            return True
 
-        # 2-phone clusters beginning with stops, e.g., pact, width
-        elif (
-        (cluster[0] == 'F' and cluster[1] in set(['T', 'TH']))
-            or
-        (cluster[0] == 'S' and cluster[1] in set(['P', 'T', 'K']))
-            or
-        (cluster[0] == 'P' and cluster[1] in set(['T', 'TH', 'S', 'F']))
-            or
-        (cluster[0] == 'K' and cluster[1] in set(['T', 'S', 'SH']))
-            or
-        (cluster[0] == 'T' and cluster[1] in set(['S', 'TH']))
-            or
-        (cluster[0] == 'D' and cluster[1] == 'TH')):
-            return True
+def buildLegalCodas():
+    """
+    Lists every legal coda cluster, up to the 4-phone limit of the coda rules.
+    4-phone codas are only built as extensions of legal 3-phone codas, which
+    keeps this cheap enough to run on import.
 
-    if length == 1:
-        # These phonemes cannot exist as codas by themselves
-        if cluster[0] not in set(['HH', 'W', 'Y']):
-            return True
+    Returns:
+        A frozenset of tuples of phones.
+    """
+    consonants = sorted(CONSONANTS)
+    codas = set(cluster for length in range(4)
+                for cluster in itertools.product(consonants, repeat=length)
+                if isLegalCodaCluster(cluster))
+    codas.update(cluster + (extension,) for cluster in list(codas) if len(cluster) == 3
+                 for extension in CODA_EXTENSIONS if cluster[2] in CODA_EXTENSIONS[extension])
+    return frozenset(codas)
+
+
+# The rules of the 'table' engine and the globals made from them (see useRules),
+# compiled from english.json or loaded from the disk cache on first use, so
+# importing the package does not pay for them
+RULE_NAMES = frozenset(['RULES', 'LEGAL_ONSETS', 'LEGAL_CODAS', 'ONSET_IDS', 'CODA_IDS',
+                        'splitRun'])
+
+
+def loadRules():
+    """
+    Returns the RuleSet of the 'table' engine, loading the default rules on
+    first use.
+    """
+    try:
+        return RULES
+    except NameError:
+        useRules()
+        return RULES
+
+
+def __getattr__(name):
+    if name not in RULE_NAMES:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    loadRules()
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()).union(RULE_NAMES))
+
+
+def isVowel(phone):
+    """
+    Tests if a phone is a vowel with an optional stress marker.
+    """
+    return phone in STRESSED_VOWELS
+
+
+def testLegalOnset(syllable):
+    """
+    Function to test for legal onset clusters.
+
+    Args:
+        syllable: An array of phones in a transcription containing a vowel
+
+    Returns:
+        None if the input's onset is legal. Otherwise, returns the first
+        phone of the onset for removal and subsequent appendage to the previous
+        syllable's coda.
+    """
+
+    for i in range(len(syllable)):
+        if isVowel(syllable[i]):
+            break
+    else:
+        i = len(syllable)
+
+    if i == 0 or tuple(syllable[:i]) in loadRules().legal_onsets:
+        return None
+
+    return syllable[0]
+
+
+def testLegalCoda(syllable):
+    """
+    Function to test for legal coda clusters.
 
-    return False
+    Args:
+        syllable: An array of phones in a transcription containing a vowel
+
+    Returns:
+        True if the coda cluster (phones after the vowel in the syllable) is
+        legal according to English syllabification rules.
+    """
+
+    for i in range(len(syllable)):
+        if isVowel(syllable[i]):
+            return tuple(syllable[i + 1:]) in loadRules().legal_codas
+
+    return True
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+# vectorized:
+# NumPy syllabification of whole batches of padded phone ID arrays. Every step of
+# scanPhoneIDs (vowel detection, onset maximization and the onset and coda
+# legality checks) is done with array operations and lookup tables built from the
+# same legality tables, so there is no Python loop over rows or phones. The tables
+# are rebuilt when useRules switches rules.
+# Requires the optional numpy dependency (pip install syllabifier[numpy]).
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError('syllabifier.vectorized requires numpy; '
+                      'install it with pip install syllabifier[numpy]')
+
+import sys
+
+from syllabifier.phones import CONSONANT_IDS
+from syllabifier.phones import PHONE_IDS
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.syllabifyARPA import Status
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+# Consonants are numbered 0-23 in the tables below; NONE marks a position that is
+# not part of the consonant cluster being looked up
+CONSONANT_INDICES = {phone_id: index for index, phone_id in enumerate(sorted(CONSONANT_IDS))}
+NONE = len(CONSONANT_INDICES)
+
+# Longest clusters the tables can hold
+MAX_ONSET = 3
+MAX_CODA = 4
+
+
+def buildPhoneTables():
+    """
+    Builds lookup tables over all byte values.
+
+    Returns:
+        Tuple of a boolean array marking vowel IDs, a boolean array marking
+        consonant IDs and an array mapping consonant IDs to consonant indices
+        (NONE for any other value).
+    """
+    is_vowel = np.zeros(256, dtype=bool)
+    is_vowel[sorted(VOWEL_IDS)] = True
+    is_consonant = np.zeros(256, dtype=bool)
+    is_consonant[sorted(CONSONANT_IDS)] = True
+    consonant_index = np.full(256, NONE, dtype=np.intp)
+    for phone_id, index in CONSONANT_INDICES.items():
+        consonant_index[phone_id] = index
+    return is_vowel, is_consonant, consonant_index
+
+
+def clusterIndices(cluster):
+    """
+    Converts a cluster of phones into a tuple of consonant indices.
+    """
+    return tuple(CONSONANT_INDICES[PHONE_IDS[phone]] for phone in cluster)
+
+
+def buildOnsetTable(legal_onsets):
+    """
+    Builds the longest-legal-onset table: entry [a, b, c] is the length of the
+    longest legal onset that ends with the consonant indices a b c, counting
+    only the indices after the last NONE.
+    """
+    onsets = set(clusterIndices(onset) for onset in legal_onsets)
+    table = np.zeros((NONE + 1,) * MAX_ONSET, dtype=np.intp)
+    for key in np.ndindex(*table.shape):
+        length = 0
+        while length < MAX_ONSET and key[-length - 1] != NONE:
+            length += 1
+        table[key] = max(onset for onset in range(length + 1)
+                         if onset == 0 or key[-onset:] in onsets)
+    return table
+
+
+def buildCodaTable(legal_codas):
+    """
+    Builds the legal coda table: entry [a, b, c, d] is True if the consonant
+    indices before the first NONE form a legal coda.
+    """
+    table = np.zeros((NONE + 1,) * MAX_CODA, dtype=bool)
+    for coda in legal_codas:
+        cluster = clusterIndices(coda)
+        table[cluster + (NONE,) * (MAX_CODA - len(cluster))] = True
+    return table
+
+
+def buildLegalityTables(rules):
+    """
+    Builds the onset and coda tables of a RuleSet.
+
+    Returns:
+        Tuple of the longest-legal-onset table and the legal coda table, or
+        None if the rules have onsets longer than MAX_ONSET or codas longer
+        than MAX_CODA phones.
+    """
+    if rules.max_onset > MAX_ONSET or rules.max_coda > MAX_CODA:
+        return None
+    return buildOnsetTable(rules.legal_onsets), buildCodaTable(rules.legal_codas)
+
+
+def useRules(rules):
+    """
+    Rebuilds the onset and coda tables for the rules that
+    syllabifyARPA.useRules switched to.
+    """
+    global LEGALITY_TABLES
+    LEGALITY_TABLES = buildLegalityTables(rules)
+
+
+IS_VOWEL, IS_CONSONANT, CONSONANT_INDEX = buildPhoneTables()
+LEGALITY_TABLES = buildLegalityTables(CORE.RULES)
+CORE.RULE_HOOKS.append(useRules)
+
+
+def syllabify_array(ids, lengths=None):
+    """
+    Syllabifies a batch of phone ID sequences, with the same results as
+    syllabifyIDs on each row.
+
+    Args:
+        ids: 2-D integer array of shape (batch, max_len) of phone IDs, padded
+        with any value
+        lengths: Optional 1-D array with the number of phones in each row
+        (default max_len for every row)
+
+    Returns:
+        Tuple of an int32 array of the same shape as ids, holding the index of
+        the syllable each phone belongs to (-1 for padding and for rows that
+        cannot be syllabified), and a uint8 array with the Status of each row.
+
+    Raises:
+        ValueError if the rules in use have onsets longer than MAX_ONSET or
+        codas longer than MAX_CODA phones.
+    """
+    tables = LEGALITY_TABLES
+    if tables is None:
+        raise ValueError('The rules in use have clusters longer than %d-phone onsets '
+                         'and %d-phone codas' % (MAX_ONSET, MAX_CODA))
+    onset_lengths, legal_coda_table = tables
+    ids = np.asarray(ids)
+    if ids.ndim != 2:
+        raise ValueError('Expected a 2-D array of phone IDs, got shape %s' % (ids.shape,))
+    batch, max_len = ids.shape
+    positions = np.arange(max_len)
+    rows = np.arange(batch)
+    if lengths is None:
+        lengths = np.full(batch, max_len)
+    lengths = np.asarray(lengths)
+    if max_len == 0:
+        status = np.full(batch, Status.OK, dtype=np.uint8)
+        return np.zeros(ids.shape, dtype=np.int32), status
+
+    in_word = positions < lengths[:, None]
+
+    # Phone classes; anything outside 0-255 is not a phone ID
+    in_range = (ids >= 0) & (ids < 256)
+    safe_ids = np.where(in_word & in_range, ids, 0)
+    vowels = in_word & IS_VOWEL[safe_ids]
+    invalid = in_word & ~(vowels | (in_range & IS_CONSONANT[safe_ids]))
+    consonants = np.where(in_word & ~vowels & ~invalid, CONSONANT_INDEX[safe_ids], NONE)
+
+    # Longest legal onset before each position, from the three phones before it
+    padded = np.concatenate([np.full((batch, MAX_ONSET), NONE), consonants], axis=1)
+    onsets = onset_lengths[padded[:, :-3], padded[:, 1:-2], padded[:, 2:-1]]
+
+    # Number of consonants right before each position
+    not_consonant = np.where(consonants == NONE, positions, -1)
+    last_not_consonant = np.maximum.accumulate(not_consonant, axis=1)
+    run_lengths = positions - np.concatenate(
+        [np.full((batch, 1), -1), last_not_consonant[:, :-1]], axis=1) - 1
+
+    # Syllables start at each vowel's onset; the first vowel's onset must take
+    # every consonant before it
+    has_vowel = vowels.any(axis=1)
+    first_vowel = np.argmax(vowels, axis=1)
+    bad_onset = has_vowel & (run_lengths[rows, first_vowel] != onsets[rows, first_vowel])
+
+    vowel_rows, vowel_positions = np.nonzero(vowels)
+    starts = np.zeros(ids.shape, dtype=bool)
+    starts[vowel_rows, vowel_positions - onsets[vowel_rows, vowel_positions]] = True
+    starts[:, 0] |= has_vowel
+
+    # Each vowel's coda runs up to the next syllable start or the end of the word
+    next_start = np.where(starts, positions, max_len)
+    next_start = np.minimum.accumulate(next_start[:, ::-1], axis=1)[:, ::-1]
+    next_start = np.concatenate([next_start, np.full((batch, 1), max_len)], axis=1)
+    coda_ends = np.minimum(next_start[vowel_rows, vowel_positions + 1], lengths[vowel_rows])
+    coda_lengths = coda_ends - vowel_positions - 1
+
+    offsets = np.arange(MAX_CODA)
+    coda_positions = np.minimum(vowel_positions[:, None] + 1 + offsets, max_len - 1)
+    codas = np.where(offsets < coda_lengths[:, None],
+                     consonants[vowel_rows[:, None], coda_positions], NONE)
+    bad_codas = (coda_lengths > MAX_CODA) | ~legal_coda_table[
+        codas[:, 0], codas[:, 1], codas[:, 2], codas[:, 3]]
+    bad_coda = np.zeros(batch, dtype=bool)
+    bad_coda[vowel_rows[bad_codas]] = True
+
+    # Errors in the same order of precedence as scanPhoneIDs
+    status = np.full(batch, Status.OK, dtype=np.uint8)
+    status[bad_coda] = Status.BAD_CODA
+    status[bad_onset] = Status.BAD_ONSET
+    status[~has_vowel & (lengths > 0)] = Status.NO_VOWEL
+    status[invalid.any(axis=1)] = Status.NON_ARPABET
+
+    syllables = np.cumsum(starts, axis=1, dtype=np.int32) - 1
+    syllables[~in_word | (status != Status.OK)[:, None]] = -1
+    return syllables, status
+
+
+def pad(sequences, fill=0):
+    """
+    Packs phone ID sequences into a padded array for syllabify_array.
+
+    Args:
+        sequences: A list of sequences of phone IDs
+        fill: Padding value (default 0)
+
+    Returns:
+        Tuple of a uint8 array of shape (len(sequences), longest length) and an
+        array with the length of each sequence.
+    """
+    lengths = np.array([len(sequence) for sequence in sequences], dtype=np.intp)
+    ids = np.full((len(sequences), max(lengths, default=0)), fill, dtype=np.uint8)
+    for row, sequence in enumerate(sequences):
+        ids[row, :len(sequence)] = sequence
+    return ids, lengths
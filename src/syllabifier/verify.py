@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+# verify:
+# Differential verification of a whole lexicon: every entry is syllabified with
+# one engine and compared against another engine or against a reference file of
+# syllabifications (e.g. the output of an earlier version). Entries are compared
+# in worker processes and only the differences come back, in input order, each
+# with the consonant cluster that caused it, so rule changes can be checked for
+# unintended differences over the full lexicon.
+
+import collections
+import functools
+
+from syllabifier.io import DEFAULT_ENCODING
+from syllabifier.io import SYLLABLE_SEPARATOR
+from syllabifier.io import readSyllabified
+from syllabifier.lexicon import iterChunks
+from syllabifier.lexicon import mapChunks
+from syllabifier.lexicon import readEntries
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import FINAL
+from syllabifier.syllabifyARPA import INITIAL
+from syllabifier.syllabifyARPA import MEDIAL
+from syllabifier.syllabifyARPA import Status
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import joinSyllables
+from syllabifier.syllabifyARPA import scanPhoneIDs
+
+# Cluster of a difference that cannot be traced to a consonant cluster, e.g. an
+# entry left out of the reference file
+UNKNOWN_CLUSTER = '?'
+
+Diff = collections.namedtuple('Diff', ['word', 'pron', 'cluster', 'expected', 'actual'])
+Diff.__doc__ = """
+An entry syllabified differently: the word, its pronunciation, the consonant
+cluster where the syllabifications first differ (phones joined by spaces, the
+name of a Status for words without a cluster to blame, or UNKNOWN_CLUSTER), and
+the expected and actual lists of syllable strings, which are empty for entries
+that could not be syllabified.
+"""
+
+
+def verify_lexicon(lexicon, reference=None, engine='table', reference_engine=None,
+                   workers=1, chunksize=1000, encoding=DEFAULT_ENCODING,
+                   separator=SYLLABLE_SEPARATOR):
+    """
+    Compares the syllabification of every entry of a lexicon with engine against
+    a reference file or a reference engine.
+
+    Args:
+        lexicon: Path to a CMUdict-format lexicon ('-' for standard input), or an
+        iterable of (word, pronunciation) tuples
+        reference: Path to a syllabified lexicon as written by writeLexicon (the
+        output of the syllabifier command), with its entries in the same order
+        as lexicon. Entries missing from it are expected to be unsyllabifiable.
+        engine: Name of the engine being verified (default 'table')
+        reference_engine: Name of the engine to compare against, instead of a
+        reference file
+        workers: Number of worker processes (default 1, None for every CPU)
+        chunksize: Number of entries sent to a worker at a time
+        encoding: Encoding of the lexicon and reference files (default latin-1)
+        separator: String between syllables in the reference file
+
+    Yields:
+        A Diff for each entry that is syllabified differently, in input order.
+
+    Raises:
+        ValueError if not exactly one of reference and reference_engine is
+        given, or if the reference has entries that are not in the lexicon, in
+        the lexicon's order.
+    """
+    if (reference is None) == (reference_engine is None):
+        raise ValueError('Expected either a reference file or a reference engine')
+
+    entries = readEntries(lexicon, encoding)
+    if reference is not None:
+        entries = mergeReference(entries, readSyllabified(reference, separator, encoding))
+    else:
+        entries = ((word, pron, None) for word, pron in entries)
+
+    function = functools.partial(verifyChunk, engine=engine, reference_engine=reference_engine)
+    for diffs in mapChunks(function, iterChunks(entries, chunksize), workers):
+        yield from diffs
+
+
+def mergeReference(entries, reference):
+    """
+    Pairs lexicon entries with their reference syllabifications. Both are
+    streamed, so the reference must list its words in lexicon order.
+
+    Yields:
+        Tuples of a word, its pronunciation and its reference syllables, which
+        are empty for words missing from the reference.
+    """
+    reference = iter(reference)
+    pending = next(reference, None)
+    for word, pron in entries:
+        if pending is not None and pending[0] == word:
+            yield word, pron, pending[1]
+            pending = next(reference, None)
+        else:
+            yield word, pron, []
+    if pending is not None:
+        raise ValueError('Reference entry %s is not in the lexicon, or not in lexicon order'
+                         % pending[0])
+
+
+def verifyChunk(chunk, engine='table', reference_engine=None):
+    """
+    Syllabifies a list of (word, pronunciation, expected syllables) tuples,
+    computing the expected syllables with reference_engine where they are None.
+
+    Returns:
+        List of Diffs for the entries that differ.
+    """
+    split = getEngine(engine)
+    reference_split = None if reference_engine is None else getEngine(reference_engine)
+    diffs = []
+    for word, pron, expected in chunk:
+        phones, ids = tokenize(pron)
+        status, starts = scanPhoneIDs(ids, split)
+        actual = joinSyllables(phones, starts) if status == Status.OK else []
+        if expected is None:
+            expected_status, expected_starts = scanPhoneIDs(ids, reference_split)
+            expected = (joinSyllables(phones, expected_starts)
+                        if expected_status == Status.OK else [])
+        if actual != expected:
+            cluster = findCluster(phones, ids, expected, actual, reference_split, split)
+            diffs.append(Diff(word, pron, cluster, expected, actual))
+    return diffs
+
+
+def findCluster(phones, ids, expected, actual, expected_split, actual_split):
+    """
+    Finds the consonant cluster where two syllabifications of a word differ.
+
+    Args:
+        phones: The upper-case phones of the word
+        ids: Their phone IDs
+        expected: The expected list of syllable strings
+        actual: The actual list of syllable strings
+        expected_split: The engine that gave expected, or None if it came from
+        a reference file
+        actual_split: The engine that gave actual
+
+    Returns:
+        The phones of the cluster joined by spaces, the name of a Status, or
+        UNKNOWN_CLUSTER.
+    """
+    if None in ids:
+        return Status.NON_ARPABET.name
+    vowels = [i for i, phone_id in enumerate(ids) if phone_id in VOWEL_IDS]
+    if not vowels:
+        return Status.NO_VOWEL.name
+
+    if expected and actual:
+        # A reference file may transcribe the word differently
+        if ' '.join(expected).split() != list(phones):
+            return UNKNOWN_CLUSTER
+        for i, (before, after) in enumerate(zip(syllableStarts(expected),
+                                                syllableStarts(actual))):
+            if before != after:
+                return ' '.join(phones[vowels[i - 1] + 1:vowels[i]])
+        return UNKNOWN_CLUSTER
+
+    # One side could not be syllabified: blame the cluster its engine rejects
+    split = actual_split if not actual else expected_split
+    if split is None:
+        return UNKNOWN_CLUSTER
+    bounds = [-1] + vowels + [len(ids)]
+    for i in range(len(bounds) - 1):
+        position = INITIAL if i == 0 else FINAL if i == len(vowels) else MEDIAL
+        run = tuple(ids[bounds[i] + 1:bounds[i + 1]])
+        if split(run, position) is None:
+            return ' '.join(phones[bounds[i] + 1:bounds[i + 1]])
+    return UNKNOWN_CLUSTER
+
+
+def syllableStarts(syllables):
+    """
+    Returns the offsets at which each syllable of a list of syllable strings
+    starts.
+    """
+    starts = []
+    offset = 0
+    for syllable in syllables:
+        starts.append(offset)
+        offset += len(syllable.split())
+    return starts
+
+
+def summarizeDiffs(diffs, examples=3):
+    """
+    Groups differences by the cluster that caused them.
+
+    Args:
+        diffs: An iterable of Diffs
+        examples: Number of example words kept for each cluster (default 3)
+
+    Returns:
+        List of (cluster, count, example words) tuples, most frequent first.
+    """
+    counts = collections.Counter()
+    words = collections.defaultdict(list)
+    for diff in diffs:
+        counts[diff.cluster] += 1
+        if len(words[diff.cluster]) < examples:
+            words[diff.cluster].append(diff.word)
+    return [(cluster, count, words[cluster]) for cluster, count in
+            sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
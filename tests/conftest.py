@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import tempfile
+import pytest
+from syllabifier import Status
+from syllabifier.constants import PHONESET
+from syllabifier.constants import STRESSED_VOWELS
+from syllabifier.io import readLexicon
+from syllabifier.syllabifyARPA import isLegalCodaCluster
+from syllabifier.syllabifyARPA import isLegalOnsetCluster
+
+CMUDICT = os.path.join(os.path.dirname(__file__), 'cmudict.txt')
+
+
+def pytest_configure(config):
+    # Covers the rules loaded while collecting the test modules
+    directory = tempfile.mkdtemp(prefix='syllabifier-cache-')
+    config.add_cleanup(lambda: shutil.rmtree(directory, ignore_errors=True))
+    os.environ['SYLLABIFIER_CACHE_DIR'] = directory
+
+
+@pytest.fixture(autouse=True)
+def cacheDir(tmp_path, monkeypatch):
+    """
+    Keeps the on-disk rule cache of each test out of the user's cache directory.
+    """
+    monkeypatch.setenv('SYLLABIFIER_CACHE_DIR', str(tmp_path / 'cache'))
+
+
+def referenceSyllabify(phones):
+    """
+    The original syllabification algorithm, with the rule-by-rule legality tests
+    of isLegalOnsetCluster and isLegalCodaCluster instead of tables: every
+    syllable takes all consonants before its vowel, then gives phones from the
+    front of its onset to the previous syllable until the onset is legal.
+
+    Args:
+        phones: A list of upper-case phones
+
+    Returns:
+        Tuple of a Status and the list of offsets at which each syllable starts,
+        like scanPhoneIDs.
+    """
+    if not all(phone in PHONESET or phone in STRESSED_VOWELS for phone in phones):
+        return Status.NON_ARPABET, None
+
+    syllables = []
+    rest = []
+    for phone in phones:
+        rest.append(phone)
+        if phone in STRESSED_VOWELS:
+            syllables.append(rest)
+            rest = []
+    if rest:
+        if not syllables:
+            return Status.NO_VOWEL, None
+        syllables[-1].extend(rest)
+
+    for i, syllable in enumerate(syllables):
+        while not isLegalOnsetCluster(syllable[:onsetLength(syllable)]):
+            if i == 0:
+                return Status.BAD_ONSET, None
+            syllables[i - 1].append(syllable.pop(0))
+
+    for syllable in syllables:
+        if not isLegalCodaCluster(syllable[onsetLength(syllable) + 1:]):
+            return Status.BAD_CODA, None
+
+    starts = []
+    offset = 0
+    for syllable in syllables:
+        starts.append(offset)
+        offset += len(syllable)
+    return Status.OK, starts
+
+
+def onsetLength(syllable):
+    return next(i for i, phone in enumerate(syllable) if phone in STRESSED_VOWELS)
+
+
+@pytest.fixture(scope='session')
+def cmudict_reference():
+    """
+    Every pronunciation in tests/cmudict.txt as a list of phones, with the
+    result of referenceSyllabify.
+    """
+    entries = []
+    for word, pron, variant in readLexicon(CMUDICT):
+        phones = pron.split()
+        entries.append((phones,) + referenceSyllabify(phones))
+    return entries
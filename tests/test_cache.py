@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import json
+import pytest
+from syllabifier import CachedSyllabifier
+from syllabifier import syllabifyARPA
+from syllabifier.rules import DEFAULT_RULES
+from syllabifier.rules import RuleSet
+from syllabifier.syllabifyARPA import useRules
+
+
+def test_cached_results():
+    syllabify = CachedSyllabifier(maxsize=2)
+    assert syllabify('HH AE NG M AE N') == ('HH AE NG', 'M AE N')
+    assert syllabify(['hh', 'ae', 'ng', 'm', 'ae', 'n']) == ('HH AE NG', 'M AE N')
+    assert syllabify.cache_info().hits == 1
+    assert syllabify.cache_info().misses == 1
+
+
+def test_eviction():
+    syllabify = CachedSyllabifier(maxsize=2)
+    for pron in ['K AE T', 'D AO G', 'K AE T', 'F IH SH', 'D AO G']:
+        assert list(syllabify(pron)) == syllabifyARPA(pron)
+    info = syllabify.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+    syllabify.cache_clear()
+    assert syllabify.cache_info().currsize == 0
+
+
+def test_input_not_mutated():
+    syllabify = CachedSyllabifier()
+    phones = ['k', 'ae', 't']
+    assert syllabify(phones) == ('K AE T',)
+    assert phones == ['k', 'ae', 't']
+
+
+def test_cached_errors():
+    syllabify = CachedSyllabifier()
+    for _ in range(2):
+        with pytest.raises(ValueError, match='Bad coda cluster in AE G R P'):
+            syllabify('AE G R P')
+    assert syllabify('AE G R P', silence_warnings=True) == ()
+    assert syllabify.cache_info().hits == 2
+
+
+def test_options():
+    syllabify = CachedSyllabifier()
+    assert syllabify('B IY1 T L', silence_warnings=True) == ()
+    assert syllabify('B IY1 T L', syllabic_consonants=True) == ('B IY1', 'T L')
+    assert syllabify('B IY1 T L', syllabic_consonants=True, engine='fsa') == ('B IY1', 'T L')
+    assert syllabify('K AE1 T', engine=RuleSet.load().splitRun) == ('K AE1 T',)
+    assert syllabify.cache_info().misses == 4
+    with pytest.raises(ValueError, match='Unknown engine'):
+        syllabify('K AE1 T', engine='nope')
+
+
+def test_use_rules():
+    syllabify = CachedSyllabifier()
+    assert syllabify('T S UW0', silence_warnings=True) == ()
+    with open(DEFAULT_RULES) as f:
+        rules = json.load(f)
+    rules['onsets'].append(['T', 'S'])
+    try:
+        useRules(RuleSet(rules))
+        assert syllabify('T S UW0') == ('T S UW0',)
+    finally:
+        useRules()
+    assert syllabify('T S UW0', silence_warnings=True) == ()
+    assert syllabify.cache_info().hits == 1
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import os
+import subprocess
+import sys
+import syllabifier
+from syllabifier.diskcache import MAX_ENTRIES
+from syllabifier.diskcache import loadCached
+from syllabifier.diskcache import pruneCache
+from syllabifier.diskcache import sourceKey
+from syllabifier.rules import COMPILER_SOURCES
+from syllabifier.rules import DEFAULT_RULES
+from syllabifier.rules import compileRules
+from syllabifier.rules import parseRules
+from syllabifier.syllabifyARPA import LEGAL_CODAS
+
+
+def test_cached_tables(tmp_path, monkeypatch):
+    monkeypatch.setenv('SYLLABIFIER_CACHE_DIR', str(tmp_path))
+    with open(DEFAULT_RULES, 'rb') as f:
+        data = f.read()
+    tables = loadCached('rules', COMPILER_SOURCES, lambda: compileRules(parseRules(data)), data)
+    assert tables[1] == LEGAL_CODAS
+    [path] = tmp_path.iterdir()
+
+    # Loaded without building
+    assert loadCached('rules', COMPILER_SOURCES, lambda: None, data) == tables
+
+    # A damaged entry is rebuilt
+    path.write_bytes(b'\0')
+    assert loadCached('rules', COMPILER_SOURCES, lambda: 'rebuilt', data) == 'rebuilt'
+    assert loadCached('rules', COMPILER_SOURCES, lambda: None, data) == 'rebuilt'
+
+
+def test_source_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv('SYLLABIFIER_CACHE_DIR', str(tmp_path / 'cache'))
+    source = tmp_path / 'rules.py'
+    source.write_text('A = 1\n')
+    assert loadCached('rules', [str(source)], lambda: 1) == 1
+    source.write_text('A = 2\n')
+    assert loadCached('rules', [str(source)], lambda: 2) == 2
+    assert len(os.listdir(str(tmp_path / 'cache'))) == 2
+
+
+def test_given_key(tmp_path, monkeypatch):
+    monkeypatch.setenv('SYLLABIFIER_CACHE_DIR', str(tmp_path))
+    key = sourceKey(COMPILER_SOURCES, b'data')
+    assert loadCached('rules', COMPILER_SOURCES, lambda: 1, b'data', key) == 1
+    assert os.listdir(str(tmp_path)) == ['rules-%s.marshal' % key]
+    assert loadCached('rules', COMPILER_SOURCES, lambda: 2, b'data') == 1
+
+
+def test_prune(tmp_path):
+    for i in range(MAX_ENTRIES + 2):
+        path = tmp_path / ('rules-%02d.marshal' % i)
+        path.write_bytes(b'')
+        os.utime(str(path), (i, i))
+    other = tmp_path / 'other-00.marshal'
+    other.write_bytes(b'')
+    os.utime(str(other), (0, 0))
+
+    pruneCache(str(tmp_path), 'rules')
+    assert sorted(os.listdir(str(tmp_path))) == (
+        ['other-00.marshal'] + ['rules-%02d.marshal' % i for i in range(2, MAX_ENTRIES + 2)])
+
+
+def test_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv('SYLLABIFIER_CACHE_DIR', '')
+    assert loadCached('rules', COMPILER_SOURCES, lambda: 1) == 1
+    assert loadCached('rules', COMPILER_SOURCES, lambda: 2) == 2
+
+
+def test_lazy_names():
+    assert 'CachedSyllabifier' in dir(syllabifier)
+    assert syllabifier.CachedSyllabifier()('K AE1 T') == ('K AE1 T',)
+
+
+def test_lazy_rules():
+    # A fresh interpreter, as the tests have loaded the rules already
+    code = ('import sys, syllabifier\n'
+            'core = sys.modules["syllabifier.syllabifyARPA"]\n'
+            'assert "RULES" not in vars(core)\n'
+            'assert syllabifier.syllabifyARPA("K AE1 T") == ["K AE1 T"]\n'
+            'assert core.splitRun.__self__ is core.RULES\n')
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(syllabifier.__file__)))
+    subprocess.run([sys.executable, '-c', code], env=env, check=True)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import os
+import pytest
+from syllabifier import IncrementalSyllabifier
+from syllabifier import Status
+from syllabifier import syllabifyARPA
+from syllabifier.io import readLexicon
+
+CMUSUBSET = os.path.join(os.path.dirname(__file__), 'cmusubset.txt')
+
+
+def syllabifyStream(syllabifier, pron):
+    syllables = []
+    for phone in pron.split():
+        syllables.extend(syllabifier.push(phone))
+    return syllables + syllabifier.flush()
+
+
+def test_emits_syllables_early():
+    syllabifier = IncrementalSyllabifier()
+    assert syllabifier.push('HH') == []
+    assert syllabifier.push('ae1') == []
+    assert syllabifier.push('NG') == []
+    assert syllabifier.push('M') == []
+    assert syllabifier.push('AE2') == ['HH AE1 NG']
+    assert syllabifier.push('N') == []
+    assert syllabifier.flush() == ['M AE2 N']
+    assert syllabifier.flush() == []
+
+
+def test_same_as_syllabifyARPA():
+    syllabifier = IncrementalSyllabifier(silence_warnings=True)
+    for word, pron, variant in readLexicon(CMUSUBSET):
+        assert syllabifyStream(syllabifier, pron) == syllabifyARPA(pron)
+
+
+def test_errors():
+    syllabifier = IncrementalSyllabifier()
+    syllabifier.push('AE1')
+    with pytest.raises(ValueError, match='contains non-ARPABET phones'):
+        syllabifier.push('XX')
+    assert syllabifier.status == Status.NON_ARPABET
+    assert syllabifier.push('T') == []
+    assert syllabifier.flush() == []
+    assert syllabifier.status == Status.OK
+
+    with pytest.raises(ValueError, match='Input error - no vowel in'):
+        syllabifyStream(syllabifier, 'T S K T')
+    with pytest.raises(ValueError, match='Bad onset cluster in NG AE1'):
+        syllabifyStream(syllabifier, 'NG AE1')
+    syllabifier.flush()
+    with pytest.raises(ValueError, match='Bad coda cluster in'):
+        syllabifyStream(syllabifier, 'AE1 HH HH IY0')
+
+
+def test_silence_warnings():
+    syllabifier = IncrementalSyllabifier(silence_warnings=True)
+    assert syllabifyStream(syllabifier, 'AE1 K S T S T R K S T') == []
+    assert syllabifier.push('AE1 T') == []
+    assert syllabifier.status == Status.NON_ARPABET
+    assert syllabifier.flush() == []
+    assert syllabifyStream(syllabifier, 'K AE1 T') == ['K AE1 T']
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import os
+import pytest
+from syllabifier import syllabifyARPA
+from syllabifier.__main__ import main
+from syllabifier.index import SyllabifiedLexicon
+from syllabifier.index import buildIndex
+from syllabifier.io import readLexicon
+
+CMUSUBSET = os.path.join(os.path.dirname(__file__), 'cmusubset.txt')
+
+
+def test_lookup(tmp_path):
+    path = str(tmp_path / 'lexicon.idx')
+    lines = ['HANGMAN  HH AE1 NG M AE2 N\n', 'ABTS  AE1 B T S\n', 'A  AH0\n', 'A(2)  EY1\n']
+    assert buildIndex(lines, path) == (3, 1)
+    with SyllabifiedLexicon(path) as lexicon:
+        assert len(lexicon) == 2
+        assert lexicon.lookup('HANGMAN') == [['HH AE1 NG', 'M AE2 N']]
+        assert lexicon.lookup('A') == [['AH0'], ['EY1']]
+        assert lexicon.variants('A') == {1: ['AH0'], 2: ['EY1']}
+        assert lexicon.lookup('ABTS') == []
+        assert 'A' in lexicon
+        assert 'B' not in lexicon
+
+
+def test_cmusubset(tmp_path):
+    path = str(tmp_path / 'cmusubset.idx')
+    assert main(['index', CMUSUBSET, path]) == 0
+    with SyllabifiedLexicon(path) as lexicon:
+        for word, pron, variant in readLexicon(CMUSUBSET):
+            assert lexicon.variants(word)[variant] == syllabifyARPA(pron)
+
+
+def test_skipped_variant(tmp_path):
+    path = str(tmp_path / 'lexicon.idx')
+    lines = ['ABS  AE1 B Z\n', 'ABS(2)  AE1 B T S\n', 'ABS(3)  EY1 B IY1 EH1 S\n']
+    assert buildIndex(lines, path) == (2, 1)
+    with SyllabifiedLexicon(path) as lexicon:
+        assert lexicon.variants('ABS') == {1: ['AE1 B Z'], 3: ['EY1', 'B IY1', 'EH1 S']}
+        assert lexicon.lookup('ABS') == [['AE1 B Z'], ['EY1', 'B IY1', 'EH1 S']]
+        assert lexicon.variants('ABTS') == {}
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / 'lexicon.txt'
+    path.write_bytes(b'A  AH0\n')
+    with pytest.raises(ValueError, match='not a syllabified lexicon index'):
+        SyllabifiedLexicon(str(path))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import array
+import pytest
+from syllabifier import SyllableInventory
+from syllabifier import syllabifyARPA
+
+
+def test_syllabify():
+    inventory = SyllableInventory()
+    hangman = inventory.syllabify('HH AE1 NG M AE2 N')
+    assert hangman == array.array('H', [0, 1])
+    assert inventory.syllabify('m ae2 n') == array.array('H', [1])
+    assert inventory.syllabify('M AE1 N') == array.array('H', [2])
+    assert len(inventory) == 3
+    assert inventory.decode(hangman) == syllabifyARPA('HH AE1 NG M AE2 N')
+    assert inventory[1] == 'M AE2 N'
+    assert 'M AE2 N' in inventory
+    assert inventory.get('M AE0 N') is None
+
+
+def test_syllabify_errors():
+    inventory = SyllableInventory()
+    with pytest.raises(ValueError, match='Input error - no vowel in S'):
+        inventory.syllabify('S')
+    assert inventory.syllabify('AE1 B T S', silence_warnings=True) == array.array('H')
+    assert inventory.syllabify('B IY1 T L', syllabic_consonants=True) == array.array('H', [0, 1])
+    assert inventory.decode([1]) == ['T L']
+    with pytest.raises(ValueError, match='not all in the inventory'):
+        inventory.decode([2])
+
+
+def test_encode():
+    inventory = SyllableInventory(['K AE1 T'])
+    assert inventory.encode(['D AO1 G', 'K AE1 T']) == array.array('H', [1, 0])
+    assert inventory.syllabify('K AE1 T D AO1 G') == array.array('H', [0, 1])
+
+    inventory = SyllableInventory(str(i) for i in range(1 << 16))
+    assert inventory.typecode == 'H'
+    assert inventory.encode(['K AE1 T']).typecode == 'I'
+
+
+def test_save_load(tmp_path):
+    inventory = SyllableInventory()
+    inventory.syllabify('K AA1 N S T R AH0 K SH AH0 N')
+    path = str(tmp_path / 'inventory.txt')
+    inventory.save(path)
+    loaded = SyllableInventory.load(path)
+    assert loaded.syllables == inventory.syllables
+    assert loaded.syllabify('SH AH0 N') == array.array('H', [2])
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import io
+import os
+import pytest
+from syllabifier import Status
+from syllabifier.__main__ import main
+from syllabifier.io import Entry
+from syllabifier.io import formatWord
+from syllabifier.io import readLexicon
+from syllabifier.io import writeLexicon
+
+CMUSUBSET = os.path.join(os.path.dirname(__file__), 'cmusubset.txt')
+
+
+def test_readLexicon():
+    lines = [';;; comment\n', '## Date:  9-7-94\n', '\n', 'A(2)  EY1\n', 'ARID(2) EH1 R AH0 D\n',
+             'FAZIO(2)\tF AA1 Z IY0 OW0\t\r\n', '#SHARP-SIGN  SH AA1 R P\n']
+    assert list(readLexicon(lines)) == [
+        Entry('A', 'EY1', 2),
+        Entry('ARID', 'EH1 R AH0 D', 2),
+        Entry('FAZIO', 'F AA1 Z IY0 OW0', 2),
+        Entry('#SHARP-SIGN', 'SH AA1 R P', 1),
+    ]
+
+
+def test_missing_pronunciation():
+    lines = ['CAT  K AE1 T\n', 'DOG\n', 'BIRD  B ER1 D\n']
+    with pytest.warns(UserWarning, match='line 2 with no pronunciation'):
+        assert list(readLexicon(lines)) == [Entry('CAT', 'K AE1 T', 1),
+                                            Entry('BIRD', 'B ER1 D', 1)]
+
+
+def test_encodings():
+    lines = io.BytesIO('CAFÉ  K AE0 F EY1\n'.encode('utf-8'))
+    assert list(readLexicon(lines, encoding='utf-8')) == [Entry('CAFÉ', 'K AE0 F EY1', 1)]
+    entries = list(readLexicon(CMUSUBSET))
+    assert entries[0] == Entry('A', 'AH0', 1)
+    assert formatWord(entries[2].word, entries[2].variant) == 'A(2)'
+
+
+def test_writeLexicon():
+    out, errors = io.StringIO(), io.StringIO()
+    results = [('HANGMAN', 'HH AE NG M AE N', Status.OK, ['HH AE NG', 'M AE N']),
+               ('ABTS', 'AE1 B T S', Status.BAD_CODA, [])]
+    assert writeLexicon(out, results, errors=errors) == 1
+    assert out.getvalue() == 'HANGMAN  HH AE NG - M AE N\n'
+    assert errors.getvalue() == 'ABTS: Bad coda cluster in AE1 B T S\n'
+
+
+def test_main(capsys):
+    assert main([CMUSUBSET, '--separator', '.']) == 0
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == len(list(readLexicon(CMUSUBSET)))
+    assert 'AACHEN  AA1.K AH0 N' in out
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import pytest
+from syllabifier import syllabifyARPA
+from syllabifier import syllabify_lattice
+
+
+def test_every_legal_split():
+    lattice = syllabify_lattice('M IH0 S T R IY1 T')
+    assert lattice.options == ((2, 3, 4),)
+    assert len(lattice) == 3
+    assert list(lattice) == [
+        ['M IH0', 'S T R IY1 T'], ['M IH0 S', 'T R IY1 T'], ['M IH0 S T', 'R IY1 T']]
+
+
+def test_onset_maximal_first():
+    for pron in ['K AA1 N S T R AH0 K SH AH0 N', 'HH AE1 NG M AE2 N', 'AH0 B AW1 T', 'K AE1 T']:
+        lattice = syllabify_lattice(pron)
+        assert next(iter(lattice)) == syllabifyARPA(pron)
+        assert lattice.best() == [syllabifyARPA(pron)]
+
+
+def test_ranked():
+    lattice = syllabify_lattice('K AA1 N S T R AH0 K SH AH0 N')
+    assert len(lattice) == 6
+    ranked = list(lattice.ranked())
+    assert [score for score, syllables in ranked] == [4, 3, 3, 2, 2, 1]
+    assert sorted(syllables for score, syllables in ranked) == sorted(lattice)
+    assert lattice.best(2, score=lambda coda, onset: len(coda)) == [
+        ['K AA1 N S T', 'R AH0 K SH', 'AH0 N'], ['K AA1 N S T', 'R AH0 K', 'SH AH0 N']]
+
+
+def test_no_clusters():
+    assert list(syllabify_lattice('')) == [[]]
+    assert list(syllabify_lattice('S T R IY1 T')) == [['S T R IY1 T']]
+    assert list(syllabify_lattice('IY1 AA0')) == [['IY1', 'AA0']]
+
+
+def test_lattice_errors():
+    with pytest.raises(ValueError, match='Input error - no vowel in S T'):
+        syllabify_lattice('S T')
+    with pytest.raises(ValueError, match='contains non-ARPABET phones'):
+        syllabify_lattice('K AE1 XX')
+    assert syllabify_lattice('NG AE1', silence_warnings=True) is None
+    assert syllabify_lattice('AE1 HH HH IY0', silence_warnings=True) is None
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import concurrent.futures
+import functools
+import json
+import multiprocessing
+import os
+from syllabifier import Status
+from syllabifier import lexicon
+from syllabifier import syllabify_lexicon
+from syllabifier.rules import DEFAULT_RULES
+from syllabifier.rules import RuleSet
+from syllabifier.syllabifyARPA import useRules
+
+CMUSUBSET = os.path.join(os.path.dirname(__file__), 'cmusubset.txt')
+
+
+def test_syllabify_lexicon():
+    entries = [('HANGMAN', 'HH AE NG M AE N'), ('ABTS', 'AE1 B T S'), ('CAT', 'K AE T')]
+    assert list(syllabify_lexicon(entries, chunksize=2)) == [
+        ('HANGMAN', 'HH AE NG M AE N', Status.OK, ['HH AE NG', 'M AE N']),
+        ('ABTS', 'AE1 B T S', Status.BAD_CODA, []),
+        ('CAT', 'K AE T', Status.OK, ['K AE T']),
+    ]
+
+
+def test_variants():
+    results = list(syllabify_lexicon(CMUSUBSET))
+    assert ('A(2)', 'EY1', Status.OK, ['EY1']) in results
+
+
+def test_parallel_order():
+    serial = list(syllabify_lexicon(CMUSUBSET))
+    assert len(serial) > 50
+    assert list(syllabify_lexicon(CMUSUBSET, workers=2, chunksize=7)) == serial
+
+
+def test_syllabic_consonants():
+    entries = [('BEETLE', 'B IY1 T L'), ('CAT', 'K AE1 T')]
+    assert list(syllabify_lexicon(entries, syllabic_consonants=True)) == [
+        ('BEETLE', 'B IY1 T L', Status.OK, ['B IY1', 'T L']),
+        ('CAT', 'K AE1 T', Status.OK, ['K AE1 T']),
+    ]
+
+
+def test_dedup(monkeypatch):
+    entries = [('READ', 'R EH1 D'), ('RED', 'r eh1 d'), ('REDO', 'R IY0 D UW1'),
+               ('REDO(2)', ['R', 'IY2', 'D', 'UW1']), ('ABTS', 'AE1 B T S'), ('RED', 'R EH1 D')]
+    expected = list(syllabify_lexicon(entries))
+    assert expected[3] == ('REDO(2)', ['R', 'IY2', 'D', 'UW1'], Status.OK, ['R IY2', 'D UW1'])
+    assert list(syllabify_lexicon(entries, dedup=True, chunksize=2)) == expected
+    assert list(syllabify_lexicon(CMUSUBSET, dedup=True, workers=2, chunksize=7)) == list(
+        syllabify_lexicon(CMUSUBSET))
+
+    # Each distinct pronunciation is syllabified once
+    syllabified = []
+    syllabifyKeys = lexicon.syllabifyKeys
+    monkeypatch.setattr(lexicon, 'syllabifyKeys',
+                        lambda keys, **kwargs: syllabifyKeys(syllabified.extend(keys) or keys))
+    assert list(syllabify_lexicon(entries, dedup=True, ignore_stress=True)) == expected
+    assert len(syllabified) == 3
+
+
+def test_dedup_invalid_stress():
+    entries = [('A', 'K1 AE T'), ('B', 'AH01 B'), ('C', 'K AE1 T'), ('D', 'K AE0 T')]
+    expected = list(syllabify_lexicon(entries))
+    assert [status for word, pron, status, syllables in expected] == [
+        Status.NON_ARPABET, Status.NON_ARPABET, Status.OK, Status.OK]
+    assert list(syllabify_lexicon(entries, dedup=True)) == expected
+    assert list(syllabify_lexicon(entries, dedup=True, ignore_stress=True)) == expected
+
+
+def test_workers_use_rules(monkeypatch):
+    # Spawned workers start from the default rules, unlike forked ones
+    monkeypatch.setattr(lexicon.concurrent.futures, 'ProcessPoolExecutor', functools.partial(
+        concurrent.futures.ProcessPoolExecutor, mp_context=multiprocessing.get_context('spawn')))
+    with open(DEFAULT_RULES) as f:
+        rules = json.load(f)
+    rules['onsets'].append(['T', 'S'])
+    entries = [('TSUNAMI', 'T S UW0 N AA1 M IY0'), ('CAT', 'K AE1 T')]
+    try:
+        useRules(RuleSet(rules))
+        assert list(syllabify_lexicon(entries, workers=2, chunksize=1)) == [
+            ('TSUNAMI', 'T S UW0 N AA1 M IY0', Status.OK, ['T S UW0', 'N AA1', 'M IY0']),
+            ('CAT', 'K AE1 T', Status.OK, ['K AE1 T'])]
+    finally:
+        useRules()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import collections
+import json
+import sys
+import pytest
+from syllabifier import syllabifyARPA
+from syllabifier.memo import SplitMemo
+from syllabifier.phones import PHONE_IDS
+from syllabifier.rules import DEFAULT_RULES
+from syllabifier.rules import RuleSet
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import useRules
+
+WORDS = ['K AA1 N S T R AH0 K SH AH0 N', 'HH AE1 NG M AE2 N', 'M IH0 S T R IY1 T', 'AE1 B T S']
+
+
+def test_memo_engine():
+    assert getEngine('memo') is sys.modules['syllabifier.memo'].MEMO
+    memo = SplitMemo()
+    for pron in WORDS:
+        assert (syllabifyARPA(pron, silence_warnings=True, engine=memo)
+                == syllabifyARPA(pron, silence_warnings=True))
+    hits, misses = memo.hits, memo.misses
+    assert syllabifyARPA('M IH0 S T R IY1 T', engine=memo) == ['M IH0', 'S T R IY1 T']
+    assert memo.cache_info() == (hits + 3, misses, 65536, len(memo))
+    assert 0 < memo.hit_rate < 1
+
+    memo.cache_clear()
+    assert memo.cache_info() == (0, 0, 65536, 0)
+    assert memo.hit_rate == 0.0
+
+
+def test_bounded():
+    memo = SplitMemo(engine='fsa', maxsize=2)
+    syllabifyARPA('K AE1 T S', engine=memo)
+    syllabifyARPA('D AO1 G', engine=memo)
+    assert len(memo) == 2
+    assert list(memo.splits) == [((PHONE_IDS['D'],), 0), ((PHONE_IDS['G'],), 2)]
+
+
+def test_concurrent_eviction():
+    # Other threads evict every run right after it is looked up, and empty the
+    # table right after its size is checked
+    class RacingSplits(collections.OrderedDict):
+        def __getitem__(self, key):
+            onset = super().__getitem__(key)
+            del self[key]
+            return onset
+
+        def __len__(self):
+            size = super().__len__()
+            self.clear()
+            return size
+
+    memo = SplitMemo(maxsize=0)
+    memo.splits = RacingSplits()
+    for i in range(2):
+        assert syllabifyARPA('M IH0 S T R IY1 T', engine=memo) == ['M IH0', 'S T R IY1 T']
+    memo.splits[(PHONE_IDS['K'],), 0] = 1
+    assert syllabifyARPA('K AE1 T', engine=memo) == ['K AE1 T']
+    assert memo.hits == 1
+
+
+def test_warm_save_load(tmp_path):
+    memo = SplitMemo()
+    memo.warm([('WORD%d' % i, pron) for i, pron in enumerate(WORDS)])
+    assert memo.cache_info()[:2] == (0, 0)
+    path = str(tmp_path / 'memo')
+    memo.save(path)
+
+    loaded = SplitMemo(maxsize=None)
+    loaded.load(path)
+    assert loaded.splits == memo.splits
+    for pron in WORDS:
+        syllabifyARPA(pron, silence_warnings=True, engine=loaded)
+    assert loaded.misses == 0
+
+    with pytest.raises(ValueError, match='another engine'):
+        SplitMemo(engine='fsa').load(path)
+    (tmp_path / 'bad').write_bytes(b'\0')
+    with pytest.raises(ValueError, match='not a split memo'):
+        loaded.load(str(tmp_path / 'bad'))
+
+
+def test_use_rules(tmp_path):
+    with open(DEFAULT_RULES) as f:
+        rules = json.load(f)
+    rules['onsets'].append(['T', 'S'])
+    path = str(tmp_path / 'memo')
+    memo = SplitMemo()
+    memo.warm([('TSUNAMI', 'T S UW0 N AA1 M IY0')])
+    shared = getEngine('memo')
+    try:
+        useRules(RuleSet(rules))
+        # The memo keeps the rules it was made with, and says so when saved
+        memo.save(path)
+        assert not syllabifyARPA('T S UW0', silence_warnings=True, engine=memo)
+        with pytest.raises(ValueError, match='other rules'):
+            SplitMemo().load(path)
+        assert getEngine('memo') is not shared
+        assert syllabifyARPA('T S UW0', engine='memo') == ['T S UW0']
+    finally:
+        useRules()
+    SplitMemo().load(path)
+    assert not syllabifyARPA('T S UW0', silence_warnings=True, engine='memo')
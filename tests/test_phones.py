@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+import pytest
+from syllabifier import decode
+from syllabifier import encode
+from syllabifier.phones import CONSONANT_IDS
+from syllabifier.phones import PHONE_IDS
+from syllabifier.phones import VOWEL_IDS
+from syllabifier.phones import tokenize
+
+
+def test_round_trip():
+    test_string = 'HH AE1 NG M AE2 N'
+    assert decode(encode(test_string)) == test_string.split()
+    assert decode(encode(['k', 'Ae', 'T'])) == ['K', 'AE', 'T']
+
+
+def test_phone_ids():
+    assert len(PHONE_IDS) == 24 + 15 * 4
+    assert max(PHONE_IDS.values()) < 256
+    assert not VOWEL_IDS.intersection(CONSONANT_IDS)
+    assert PHONE_IDS['AH1'] & 3 == 2
+    assert PHONE_IDS['AH1'] & ~3 == PHONE_IDS['AH']
+
+
+def test_non_ARPABET_phones():
+    with pytest.raises(ValueError, match='contains non-ARPABET phones'):
+        encode('B AE1 N AH4')
+    with pytest.raises(ValueError, match='not a phone ID'):
+        decode([PHONE_IDS['B'] + 1])
+
+
+def test_tokenize():
+    phones = ('K', 'AE1', 'T')
+    assert tokenize(phones) == (phones, encode(phones))
+    assert tokenize(phones)[0] is phones
+    assert tokenize('k ae1 t') == (list(phones), encode(phones))
+    assert tokenize(memoryview(b'K AE1 T'))[0] == list(phones)
+    assert tokenize(['K', 'XX'])[1] == [PHONE_IDS['K'], None]
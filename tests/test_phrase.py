@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+import pytest
+from syllabifier import Status
+from syllabifier import syllabifyARPA
+from syllabifier import syllabify_phrase
+from syllabifier import syllabify_phrases
+
+
+def test_word_boundaries():
+    assert syllabifyARPA('M IH S T R IY T') == ['M IH', 'S T R IY T']
+    assert syllabify_phrase('M IH S + T R IY T') == [['M IH S', 'T R IY T']]
+    assert syllabify_phrase('S W IY P + S T EY K S') == [['S W IY P', 'S T EY K S']]
+    assert syllabify_phrase('S EH S AH M IY # S T R IY T') == [
+        ['S EH', 'S AH', 'M IY'], ['S T R IY T']]
+
+
+def test_phrase_words():
+    assert syllabify_phrase(['#', 'k', 'ae1', 't', '#', '#', 'D', 'AO1', 'G', '#']) == [
+        ['K AE1 T'], ['D AO1 G']]
+    assert syllabify_phrase('') == []
+    assert syllabify_phrase('HH AE1 NG + M AE2 N') == syllabify_phrase('HH AE1 NG M AE2 N')
+
+
+def test_phrase_errors():
+    with pytest.raises(ValueError, match='Input error - no vowel in S'):
+        syllabify_phrase('K AE1 T + S')
+    with pytest.raises(ValueError, match='contains non-ARPABET phones'):
+        syllabify_phrase('K AE1 T # XX')
+    assert syllabify_phrase('NG AE1 # K AE1 T', silence_warnings=True) == []
+
+
+def test_syllabify_phrases():
+    phrases = ['S EH S AH M IY # S T R IY T', 'AE1 B T S # K AE1 T', 'K AE1 T']
+    assert list(syllabify_phrases(phrases, engine='fsa')) == [
+        (Status.OK, [['S EH', 'S AH', 'M IY'], ['S T R IY T']]),
+        (Status.BAD_CODA, []),
+        (Status.OK, [['K AE1 T']]),
+    ]
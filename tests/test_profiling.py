@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import sys
+import pytest
+from syllabifier import syllabifyARPA
+from syllabifier import lexicon_stats
+from syllabifier import syllabify_many
+from syllabifier.profiling import PROFILE
+from syllabifier.profiling import disable
+from syllabifier.profiling import enable
+from syllabifier.profiling import isEnabled
+from syllabifier.profiling import profiling
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+
+def test_counters():
+    with profiling() as profile:
+        assert syllabifyARPA('HH AE1 NG M AE2 N') == ['HH AE1 NG', 'M AE2 N']
+        list(syllabify_many(['K AE1 T', 'NG AE1', 'AE1 HH HH IY0', 'T S K T'],
+                            engine='fsa'))
+    snapshot = profile.as_dict()
+    assert snapshot['words'] == 5
+    assert snapshot['rejections'] == {'BAD_ONSET': 1, 'BAD_CODA': 1, 'NO_VOWEL': 1}
+    assert snapshot['cluster_lengths']['medial'] == {2: 2}
+    assert snapshot['onset_repairs'] == {1: 1}
+    assert snapshot['rejected_clusters'] == {'initial': 1, 'medial': 1}
+    assert all(seconds > 0 for seconds in snapshot['seconds'].values())
+
+
+def test_rescans_counted_once():
+    with profiling() as profile:
+        assert syllabifyARPA('B IY1 T L', syllabic_consonants=True) == ['B IY1', 'T L']
+        assert not syllabifyARPA('T S K T', silence_warnings=True, syllabic_consonants=True)
+        assert not syllabifyARPA('B IY1 T L Z K', silence_warnings=True,
+                                 syllabic_consonants=True)
+    snapshot = profile.as_dict()
+    assert snapshot['words'] == 3
+    assert snapshot['rejections'] == {'NO_VOWEL': 1, 'BAD_CODA': 1}
+
+
+def test_modules_importing_by_name():
+    with profiling() as profile:
+        stats = lexicon_stats([('CAT', 'K AE1 T'), ('NGA', 'NG AE1')])
+    assert stats.words == 1
+    assert profile.as_dict()['words'] == 2
+    assert profile.as_dict()['rejections'] == {'BAD_ONSET': 1}
+    assert sys.modules['syllabifier.stats'].scanPhoneIDs is CORE.scanPhoneIDs
+
+
+def test_prometheus():
+    with profiling() as profile:
+        syllabifyARPA('HH AE1 NG M AE2 N')
+    text = profile.prometheus()
+    assert '# TYPE syllabifier_cluster_length histogram\n' in text
+    assert 'syllabifier_words_total 1\n' in text
+    assert 'syllabifier_cluster_length_bucket{position="medial",le="+Inf"} 1\n' in text
+    assert 'syllabifier_onset_repair_consonants_sum 1\n' in text
+
+
+def test_disabled():
+    originals = (CORE.tokenize, CORE.scanPhoneIDs, CORE.getEngine)
+    profile = enable()
+    try:
+        assert profile is PROFILE
+        assert isEnabled()
+        with pytest.raises(RuntimeError):
+            enable()
+    finally:
+        disable()
+        PROFILE.reset()
+    assert not isEnabled()
+    assert (CORE.tokenize, CORE.scanPhoneIDs, CORE.getEngine) == originals
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+import pytest
+from syllabifier import Syllabification
+from syllabifier import syllabify
+from syllabifier import syllabifyARPA
+
+
+def test_syllabify():
+    result = syllabify('f l ae1 jh ah0 l ey1 sh ah0 n z')
+    assert len(result) == 4
+    assert result.syllables() == (('F', 'L', 'AE1'), ('JH', 'AH0'), ('L', 'EY1'),
+                                  ('SH', 'AH0', 'N', 'Z'))
+    assert result.as_strings() == syllabifyARPA('F L AE1 JH AH0 L EY1 SH AH0 N Z')
+    assert result.onset(0) == ('F', 'L')
+    assert result.nucleus(0) == 'AE1'
+    assert result.coda(0) == ()
+    assert result.coda(-1) == ('N', 'Z')
+    assert [result.stress(i) for i in range(len(result))] == [1, 0, 1, 0]
+
+
+def test_unstressed():
+    result = syllabify(['S', 'T', 'R', 'IH', 'NG', 'Z'])
+    assert result.onset(0) == ('S', 'T', 'R')
+    assert result.stress(0) is None
+    with pytest.raises(IndexError):
+        result.nucleus(1)
+
+
+def test_errors():
+    with pytest.raises(ValueError, match='Bad coda cluster in AE G R P'):
+        syllabify('ae g r p')
+    assert syllabify('AE G R P', silence_warnings=True) is None
+
+
+def test_equality():
+    assert syllabify('K AE T') == Syllabification(['K', 'AE', 'T'], [0])
+    assert syllabify('K AE T') != syllabify('K AE1 T')
+    assert len({syllabify('K AE T'), syllabify('k ae t')}) == 1
+    assert repr(syllabify('HH AE NG M AE N')) == "Syllabification(['HH AE NG', 'M AE N'])"
+
+
+def test_syllabic_nucleus():
+    result = syllabify('B AA1 T L Z', syllabic_consonants=True)
+    assert (result.onset(1), result.nucleus(1), result.coda(1)) == (('T',), 'L', ('Z',))
+    assert result.stress(1) is None
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import json
+import pickle
+import sys
+import pytest
+from syllabifier import syllabifyARPA
+from syllabifier import syllabify_lattice
+from syllabifier import syllabify_many
+from syllabifier.__main__ import main
+from syllabifier.incremental import IncrementalSyllabifier
+from syllabifier.rules import DEFAULT_RULES
+from syllabifier.phones import PHONE_IDS
+from syllabifier.rules import RuleSet
+from syllabifier.syllabifyARPA import buildLegalCodas
+from syllabifier.syllabifyARPA import buildLegalOnsets
+from syllabifier.syllabifyARPA import useRules
+
+CORE = sys.modules['syllabifier.syllabifyARPA']
+
+
+def loanwordRules():
+    with open(DEFAULT_RULES) as f:
+        rules = json.load(f)
+    # e.g. tsunami
+    rules['onsets'].append(['T', 'S'])
+    return rules
+
+
+def test_default_rules():
+    # The rule file matches the reference rules in syllabifyARPA
+    onsets = buildLegalOnsets()
+    codas = buildLegalCodas()
+    tables = (onsets, codas,
+              frozenset(tuple(PHONE_IDS[phone] for phone in onset) for onset in onsets),
+              frozenset(tuple(PHONE_IDS[phone] for phone in coda) for coda in codas))
+    assert RuleSet.load().tables() == tables
+    assert CORE.RULES.tables() == tables
+
+
+def test_custom_rules():
+    rules = RuleSet(loanwordRules())
+    assert ('T', 'S') in rules.legal_onsets
+    assert ('T', 'S') not in CORE.LEGAL_ONSETS
+    assert syllabifyARPA('T S UW0 N AA1 M IY0', engine=rules.splitRun) == [
+        'T S UW0', 'N AA1', 'M IY0']
+    assert not syllabifyARPA('T S UW0 N AA1 M IY0', silence_warnings=True)
+    assert pickle.loads(pickle.dumps(rules.splitRun))((1, 2), 0) is None
+    assert pickle.loads(pickle.dumps(rules)).tables() == rules.tables()
+
+
+def test_use_rules():
+    try:
+        useRules(RuleSet(loanwordRules()))
+        assert syllabifyARPA('T S UW0 N AA1 M IY0') == ['T S UW0', 'N AA1', 'M IY0']
+        assert list(syllabify_many(['T S UW0'])) == [(0, ['T S UW0'])]
+    finally:
+        useRules()
+    assert not syllabifyARPA('T S UW0 N AA1 M IY0', silence_warnings=True)
+
+
+def test_use_rules_engines():
+    tsunami = 'T S UW0 N AA1 M IY0'
+    syllabifier = IncrementalSyllabifier(silence_warnings=True)
+    assert [syllable for phone in 'K AE1 T'.split()
+            for syllable in syllabifier.push(phone)] + syllabifier.flush() == ['K AE1 T']
+    try:
+        useRules(RuleSet(loanwordRules()))
+        assert syllabifyARPA(tsunami, engine='fsa') == ['T S UW0', 'N AA1', 'M IY0']
+        assert syllabify_lattice(tsunami).best() == [['T S UW0', 'N AA1', 'M IY0']]
+        syllables = [syllable for phone in tsunami.split() for syllable in syllabifier.push(phone)]
+        assert syllables + syllabifier.flush() == ['T S UW0', 'N AA1', 'M IY0']
+    finally:
+        useRules()
+    assert not syllabifyARPA(tsunami, engine='fsa', silence_warnings=True)
+    assert syllabify_lattice(tsunami, silence_warnings=True) is None
+    assert not [syllable for phone in tsunami.split()
+                for syllable in syllabifier.push(phone)] + syllabifier.flush()
+
+
+def test_malformed_rules():
+    with pytest.raises(ValueError, match='XX is neither a consonant nor a phone class'):
+        RuleSet({'onsets': [['XX']], 'codas': []})
+    with pytest.raises(ValueError, match='AA is neither'):
+        RuleSet({'onsets': [], 'codas': [['AA']]})
+    with pytest.raises(ValueError, match='Malformed rules'):
+        RuleSet({'codas': []})
+    with pytest.raises(ValueError):
+        RuleSet(b'[1, 2')
+
+
+def test_main_rules(tmp_path, capsys):
+    rules = tmp_path / 'rules.json'
+    rules.write_text(json.dumps(loanwordRules()))
+    lexicon = tmp_path / 'lexicon.txt'
+    lexicon.write_text('TSUNAMI  T S UW0 N AA1 M IY0\n')
+    assert main([str(lexicon), '--rules', str(rules)]) == 0
+    assert capsys.readouterr().out == 'TSUNAMI  T S UW0 - N AA1 - M IY0\n'
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import pytest
+from syllabifier import Status
+from syllabifier import syllabifyARPA
+from syllabifier.service import AsyncSyllabifier
+from syllabifier.service import startServer
+
+PRONS = ['HH AE NG M AE N', 'K AE T', 'AH S F IH K S IY EY T AH D', 'AE G R P']
+
+
+def test_batching():
+    async def run():
+        async with AsyncSyllabifier(max_batch=3, max_delay=0.01) as syllabifier:
+            results = await asyncio.gather(*[syllabifier.submit(pron) for pron in PRONS * 5])
+            with pytest.raises(ValueError, match='Bad coda cluster in AE G R P'):
+                await syllabifier.syllabify('ae g r p')
+            assert await syllabifier.syllabify(['k', 'ae', 't']) == ['K AE T']
+            assert await syllabifier.syllabify(b'K AE1 T') == ['K AE1 T']
+            assert await syllabifier.syllabify([b'K', b'AE1', 'T']) == ['K AE1 T']
+            with pytest.raises(TypeError):
+                await syllabifier.submit([1, 2])
+            return results
+
+    results = asyncio.run(run())
+    for pron, (status, syllables) in zip(PRONS * 5, results):
+        assert syllables == syllabifyARPA(pron, silence_warnings=True)
+        assert (status == Status.OK) == bool(syllables)
+
+
+def test_close_flushes_queue():
+    async def run():
+        syllabifier = AsyncSyllabifier(max_batch=2, max_delay=10)
+        tasks = [asyncio.ensure_future(syllabifier.submit(pron)) for pron in PRONS]
+        await asyncio.sleep(0)
+        await syllabifier.close()
+        return await asyncio.gather(*tasks)
+
+    assert [syllables for status, syllables in asyncio.run(run())] == [
+        syllabifyARPA(pron, silence_warnings=True) for pron in PRONS]
+
+
+def test_close_wakes_waiters():
+    async def run():
+        syllabifier = AsyncSyllabifier(max_pending=1, max_delay=10)
+        tasks = [asyncio.ensure_future(syllabifier.submit(pron)) for pron in PRONS[:3]]
+        await asyncio.sleep(0)
+        await syllabifier.close()
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+        with pytest.raises(RuntimeError, match='closed'):
+            await syllabifier.submit('K AE1 T')
+        return results
+
+    first, *waiters = asyncio.run(run())
+    assert first == (Status.OK, ['HH AE NG', 'M AE N'])
+    assert [type(error) for error in waiters] == [RuntimeError, RuntimeError]
+
+
+def test_server():
+    async def run():
+        async with AsyncSyllabifier() as syllabifier:
+            server = await startServer(syllabifier, port=0, max_requests=2)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for i, pron in enumerate(PRONS):
+                writer.write(json.dumps({'id': i, 'pron': pron}).encode() + b'\n')
+            writer.write(b'not json\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(len(PRONS) + 1)]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return responses
+
+    responses = asyncio.run(run())
+    by_id = {response['id']: response for response in responses}
+    assert by_id[0] == {'id': 0, 'status': 'OK', 'syllables': ['HH AE NG', 'M AE N']}
+    assert by_id[3]['status'] == 'BAD_CODA'
+    assert 'error' in by_id[None]
+
+
+def exchange(syllabifier, lines, count):
+    async def run():
+        server = await startServer(syllabifier, port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.writelines(lines)
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(count)]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await syllabifier.close()
+        return responses
+
+    return asyncio.run(run())
+
+
+def test_server_errors():
+    lines = [b'\xff\xfe\n', b'{"id": 7, "pron": 5}\n', b'{"pron": "' + b'K ' * 50000 + b'"}\n',
+             b'{"id": 8, "pron": "K AE1 T"}\n']
+    responses = exchange(AsyncSyllabifier(), lines, 4)
+    by_id = {response['id']: response for response in responses}
+    assert by_id[7]['error'].startswith('Malformed request')
+    assert by_id[8] == {'id': 8, 'status': 'OK', 'syllables': ['K AE1 T']}
+    assert sorted(response['error'] for response in responses if response['id'] is None) == [
+        "Malformed request '��'", 'Request line too long']
+
+
+def test_server_closed():
+    async def closed():
+        syllabifier = AsyncSyllabifier()
+        await syllabifier.close()
+        return syllabifier
+
+    syllabifier = asyncio.run(closed())
+    assert exchange(syllabifier, [b'{"id": 1, "pron": "K AE1 T"}\n'], 1) == [
+        {'id': 1, 'error': 'AsyncSyllabifier is closed'}]
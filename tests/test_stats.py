@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import io
+import json
+import os
+import pytest
+from syllabifier import lexicon_stats
+from syllabifier.__main__ import main
+from syllabifier.stats import SyllableStats
+from syllabifier.stats import writeStats
+
+CMUSUBSET = os.path.join(os.path.dirname(__file__), 'cmusubset.txt')
+
+ENTRIES = [('STRICT', 'S T R IH1 K T'), ('ABTS', 'AE1 B T S'), ('HANGMAN', 'HH AE1 NG M AE2 N')]
+
+
+def test_lexicon_stats():
+    stats = lexicon_stats(ENTRIES)
+    assert (stats.entries, stats.tokens, stats.words) == (3, 3, 2)
+    assert stats.rejections == {'BAD_CODA': 1}
+    assert stats.syllables_per_word == {1: 1, 2: 1}
+    assert stats.templates == {'CCCVCC': 1, 'CVC': 2}
+    assert stats.onsets == {'S T R': 1, 'HH': 1, 'M': 1}
+    assert stats.codas == {'K T': 1, 'NG': 1, 'N': 1}
+    assert stats.syllables['HH AE1 NG'] == 1
+
+
+def test_frequencies():
+    weighted = [('STRICT', 'S T R IH1 K T 10'), ('HANGMAN', 'HH AE1 NG M AE2 N', 3)]
+    stats = lexicon_stats(weighted, frequencies=True)
+    assert (stats.entries, stats.tokens, stats.words) == (2, 13, 13)
+    assert stats.templates == {'CCCVCC': 10, 'CVC': 6}
+    with pytest.raises(ValueError, match='Entry CAT has no token frequency'):
+        lexicon_stats([('CAT', 'K AE1 T')], frequencies=True)
+
+
+def test_merge():
+    serial = lexicon_stats(CMUSUBSET)
+    assert lexicon_stats(CMUSUBSET, workers=2, chunksize=7).as_dict() == serial.as_dict()
+    merged = lexicon_stats(ENTRIES[:1]).merge(lexicon_stats(ENTRIES[1:]))
+    assert merged.as_dict() == lexicon_stats(ENTRIES).as_dict()
+    assert SyllableStats().merge(serial).as_dict() == serial.as_dict()
+
+
+def test_reports():
+    stats = lexicon_stats(ENTRIES)
+    f = io.StringIO()
+    writeStats(f, stats, 'json')
+    report = json.loads(f.getvalue())
+    assert report['entries'] == 3
+    assert list(report['templates'].items()) == [('CVC', 2), ('CCCVCC', 1)]
+
+    f = io.StringIO()
+    writeStats(f, stats, 'tsv')
+    lines = f.getvalue().splitlines()
+    assert lines[:4] == ['entries\tentries\t3', 'entries\ttokens\t3', 'entries\twords\t2',
+                         'syllables_per_word\t1\t1']
+    assert 'onsets\tS T R\t1' in lines
+    with pytest.raises(ValueError, match='Unknown format'):
+        writeStats(f, stats, 'xml')
+
+
+def test_main(tmp_path, capsys):
+    assert main(['stats', CMUSUBSET, CMUSUBSET, '--format', 'tsv']) == 0
+    assert 'entries\tentries\t%d' % (2 * lexicon_stats(CMUSUBSET).entries) in \
+        capsys.readouterr().out
+    output = tmp_path / 'stats.json'
+    assert main(['stats', CMUSUBSET, '-o', str(output)]) == 0
+    assert json.loads(output.read_text()) == json.loads(
+        json.dumps(lexicon_stats(CMUSUBSET).as_dict()))
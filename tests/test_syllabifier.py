@@ -1,9 +1,21 @@
 #!/usr/bin/env python3
 import itertools
 import pytest
+from syllabifier import Status
+from syllabifier import encode
 from syllabifier import syllabifyARPA
+from syllabifier import syllabifyIDs
+from syllabifier import syllabify_many
 from syllabifier.constants import CONSONANTS
 from syllabifier.constants import PHONESET
+from syllabifier.phones import PHONE_IDS
+from syllabifier.phones import tokenize
+from syllabifier.syllabifyARPA import LEGAL_CODAS
+from syllabifier.syllabifyARPA import LEGAL_ONSETS
+from syllabifier.syllabifyARPA import getEngine
+from syllabifier.syllabifyARPA import isLegalCodaCluster
+from syllabifier.syllabifyARPA import isLegalOnsetCluster
+from syllabifier.syllabifyARPA import scanPhoneIDs
 
 VOWELS = PHONESET - CONSONANTS
 legal_codas = CONSONANTS - {'HH', 'W', 'Y'}
@@ -105,6 +117,22 @@ def test_weird_array():
     assert not syllabifyARPA(test_array, silence_warnings=True)
 
 
+def test_input_not_modified():
+    test_array = ['k', 'ae', 'T']
+    assert syllabifyARPA(test_array) == ['K AE T']
+    assert test_array == ['k', 'ae', 'T']
+    with pytest.raises(ValueError, match='Bad coda cluster in K AE T NG'):
+        syllabifyARPA(test_array + ['ng'])
+    assert test_array == ['k', 'ae', 'T']
+
+
+def test_bytes():
+    assert syllabifyARPA(b'hh ae1 ng m ae2 n') == ['HH AE1 NG', 'M AE2 N']
+    assert syllabifyARPA(memoryview(b'K AE T')) == ['K AE T']
+    assert syllabifyARPA([b'K', b'ae', 'T']) == ['K AE T']
+    assert not syllabifyARPA(b'K \xc3\xa6 T', silence_warnings=True)
+
+
 def test_CVC_syllables():
     for syllable in itertools.product(legal_onsets, VOWELS, legal_codas):
         assert syllabifyARPA(list(syllable))
@@ -205,12 +233,80 @@ def test_long_words():
         assert syllabifyARPA(pron) == syllabification
 
 
-# def test_word_boundaries():
-# TODO:ADD this feature
-#        'S W IY P S T EY K S': ['S W IY P', 'S T EY K S']
-#        'S EH S AH M IY S T R IY T': ['S EH', 'S AH', 'M IY', 'S T R IY T'
-
-# def test_syllabic_consonant_nuclei():
-# TODO: ADD this feature
-# len(syllabifyARPA('B IY T L') == len(syllabifyARPA('B IY T AH L')
-# syllabifyARPA('B IY T L') == ['B IY', 'T L']
+def test_syllabifyIDs():
+    assert syllabifyIDs(encode('HH AE NG M AE N')) == [0, 3]
+    assert syllabifyIDs(encode('AH S F IH K S IY EY T AH D')) == [0, 1, 5, 7, 8]
+    assert syllabifyIDs([]) == []
+    with pytest.raises(ValueError, match='Bad coda cluster'):
+        syllabifyIDs(encode('AE G R P'))
+    assert not syllabifyIDs(encode('NG OW'), silence_warnings=True)
+    assert not syllabifyIDs([PHONE_IDS['AA1'], 255], silence_warnings=True)
+
+
+def test_syllabify_many():
+    prons = ['HH AE NG M AE N', 'banana', 'K S', 'M G L AA', 'AE G R P', ['k', 'ae', 't'], '']
+    results = syllabify_many(iter(prons))
+    assert next(results) == (Status.OK, ['HH AE NG', 'M AE N'])
+    assert list(results) == [
+        (Status.NON_ARPABET, []),
+        (Status.NO_VOWEL, []),
+        (Status.BAD_ONSET, []),
+        (Status.BAD_CODA, []),
+        (Status.OK, ['K AE T']),
+        (Status.OK, []),
+    ]
+    assert prons[5] == ['k', 'ae', 't']
+
+
+def test_engines():
+    prons = ['HH AE NG M AE N', 'AH S F IH K S IY EY T AH D', 'M G L AA', 'AE G R P',
+             'S IH K S TH S', 'JH AH M P T B AE K', 'K R UW S CH Y AO F']
+    for pron in prons:
+        assert (syllabifyARPA(pron, silence_warnings=True, engine='fsa') ==
+                syllabifyARPA(pron, silence_warnings=True))
+    consonants = sorted(CONSONANTS)
+    for cluster in itertools.product(consonants, repeat=3):
+        pron = ['AA'] + list(cluster) + ['AA']
+        assert (list(syllabify_many([pron], engine='fsa')) ==
+                list(syllabify_many([pron], engine='table')))
+    with pytest.raises(ValueError, match='Unknown engine'):
+        syllabifyARPA('K AE T', engine='regex')
+
+
+@pytest.mark.parametrize('engine', ['table', 'fsa', 'memo'])
+def test_cmudict(cmudict_reference, engine):
+    split = getEngine(engine)
+    for phones, status, starts in cmudict_reference:
+        result = scanPhoneIDs(tokenize(phones)[1], split)
+        assert result[0] == status, phones
+        assert status or result[1] == starts, phones
+
+
+def test_legality_tables():
+    consonants = sorted(CONSONANTS)
+    for length in range(4):
+        for cluster in itertools.product(consonants, repeat=length):
+            assert (cluster in LEGAL_ONSETS) == isLegalOnsetCluster(cluster)
+    for length in range(5):
+        for cluster in itertools.product(consonants, repeat=length):
+            assert (cluster in LEGAL_CODAS) == isLegalCodaCluster(cluster)
+    assert ('S', 'T', 'R') in LEGAL_ONSETS
+    assert ('NG',) not in LEGAL_ONSETS
+    assert ('K', 'S', 'TH', 'S') in LEGAL_CODAS
+    assert ('N', 'S', 'G', 'F') not in LEGAL_CODAS
+
+
+def test_syllabic_consonant_nuclei():
+    assert not syllabifyARPA('B IY T L', silence_warnings=True)
+    assert syllabifyARPA('B IY T L', syllabic_consonants=True) == ['B IY', 'T L']
+    assert len(syllabifyARPA('B IY T L', syllabic_consonants=True)) == \
+        len(syllabifyARPA('B IY T AH L'))
+    assert syllabifyARPA('B AA1 T L Z', syllabic_consonants=True) == ['B AA1', 'T L Z']
+    assert syllabifyARPA('HH M', syllabic_consonants=True) == ['HH M']
+    assert syllabifyIDs(encode('D IH1 D N T'), syllabic_consonants=True) == [0, 2]
+    # Only after obstruents, and only for words that fail otherwise
+    assert not syllabifyARPA('AA1 R L T', silence_warnings=True, syllabic_consonants=True)
+    assert syllabifyARPA('K AE1 T L IY0', syllabic_consonants=True) == \
+        syllabifyARPA('K AE1 T L IY0')
+    assert list(syllabify_many(['T S K', 'IH1 T L'], syllabic_consonants=True)) == [
+        (Status.NO_VOWEL, []), (Status.OK, ['IH1', 'T L'])]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import itertools
+import json
+import os
+import pytest
+from syllabifier import Status
+from syllabifier import encode
+from syllabifier.constants import CONSONANTS
+from syllabifier.io import readLexicon
+from syllabifier.rules import DEFAULT_RULES
+from syllabifier.rules import RuleSet
+from syllabifier.syllabifyARPA import scanPhoneIDs
+from syllabifier.syllabifyARPA import useRules
+
+np = pytest.importorskip('numpy')
+from syllabifier.vectorized import pad  # noqa: E402
+from syllabifier.vectorized import syllabify_array  # noqa: E402
+
+CMUSUBSET = os.path.join(os.path.dirname(__file__), 'cmusubset.txt')
+
+
+def syllable_indices(starts, length):
+    if starts is None:
+        return [-1] * length
+    return [sum(1 for start in starts if start <= i) - 1 for i in range(length)]
+
+
+def check_matches_syllabifyIDs(prons):
+    sequences = [encode(pron) for pron in prons]
+    ids, lengths = pad(sequences, fill=255)
+    syllables, status = syllabify_array(ids, lengths)
+    for row, sequence in enumerate(sequences):
+        expected_status, starts = scanPhoneIDs(sequence)
+        assert status[row] == expected_status
+        assert list(syllables[row, :len(sequence)]) == syllable_indices(starts, len(sequence))
+        assert (syllables[row, len(sequence):] == -1).all()
+
+
+def test_syllabify_array():
+    ids, lengths = pad([encode('HH AE NG M AE N'), encode('K AE T')])
+    syllables, status = syllabify_array(ids, lengths)
+    assert syllables.tolist() == [[0, 0, 0, 1, 1, 1], [0, 0, 0, -1, -1, -1]]
+    assert status.tolist() == [Status.OK, Status.OK]
+
+
+def test_statuses():
+    prons = ['K R F JH', 'M G L AA', 'AE G R P', 'AE N G L S F', '', 'S IH K S TH S']
+    ids, lengths = pad([encode(pron) for pron in prons])
+    ids[0, 3] = 200
+    syllables, status = syllabify_array(ids, lengths)
+    assert status.tolist() == [Status.NON_ARPABET, Status.BAD_ONSET, Status.BAD_CODA,
+                               Status.BAD_CODA, Status.OK, Status.OK]
+    assert (syllables[:5] == -1).all()
+
+
+def test_cmusubset():
+    check_matches_syllabifyIDs([pron for word, pron, variant in readLexicon(CMUSUBSET)])
+
+
+def test_cmudict(cmudict_reference):
+    entries = [entry for entry in cmudict_reference if entry[1] != Status.NON_ARPABET]
+    ids, lengths = pad([encode(phones) for phones, status, starts in entries], fill=255)
+    syllables, statuses = syllabify_array(ids, lengths)
+    for (phones, status, starts), row, row_status in zip(entries, syllables.tolist(),
+                                                         statuses.tolist()):
+        assert row_status == status, phones
+        assert row[:len(phones)] == syllable_indices(starts, len(phones)), phones
+
+
+def test_clusters():
+    consonants = sorted(CONSONANTS)
+    prons = [' '.join(('AA',) + cluster + ('AA',))
+             for length in range(4) for cluster in itertools.product(consonants, repeat=length)]
+    prons += [' '.join(cluster + ('AA',) + cluster)
+              for cluster in itertools.product(consonants, repeat=2)]
+    check_matches_syllabifyIDs(prons)
+
+
+def test_use_rules():
+    rules = json.loads(open(DEFAULT_RULES).read())
+    rules['onsets'].append(['T', 'S'])
+    ids, lengths = pad([encode('T S UW0 N AA1 M IY0')])
+    try:
+        useRules(RuleSet(rules))
+        syllables, status = syllabify_array(ids, lengths)
+        assert list(status) == [Status.OK]
+        assert list(syllables[0]) == [0, 0, 0, 1, 1, 2, 2]
+        rules['onsets'].append(['S', 'T', 'R', 'Y'])
+        useRules(RuleSet(rules))
+        with pytest.raises(ValueError, match='clusters longer'):
+            syllabify_array(ids, lengths)
+    finally:
+        useRules()
+    assert list(syllabify_array(ids, lengths)[1]) == [Status.BAD_ONSET]
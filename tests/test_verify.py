@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import json
+import os
+import pytest
+from syllabifier.__main__ import main
+from syllabifier.rules import DEFAULT_RULES
+from syllabifier.verify import Diff
+from syllabifier.verify import UNKNOWN_CLUSTER
+from syllabifier.verify import summarizeDiffs
+from syllabifier.verify import verify_lexicon
+
+CMUSUBSET = os.path.join(os.path.dirname(__file__), 'cmusubset.txt')
+
+LEXICON = [
+    ('HANGMAN', 'HH AE1 NG M AE2 N'),
+    ('ABTS', 'AE1 B T S'),
+    ('CAT', 'K AE1 T'),
+    ('EXTRA', 'EH1 K S T R AH0'),
+]
+
+REFERENCE = [
+    'HANGMAN  HH AE1 - NG M AE2 N\n',
+    'ABTS  AE1 B T S\n',
+    'EXTRA  EH1 K - S T R AH0\n',
+]
+
+
+def test_engines_agree():
+    assert list(verify_lexicon(CMUSUBSET, reference_engine='fsa', workers=2, chunksize=7)) == []
+
+
+def test_reference():
+    diffs = list(verify_lexicon(LEXICON, REFERENCE))
+    assert diffs == [
+        Diff('HANGMAN', 'HH AE1 NG M AE2 N', 'NG M', ['HH AE1', 'NG M AE2 N'],
+             ['HH AE1 NG', 'M AE2 N']),
+        Diff('ABTS', 'AE1 B T S', 'B T S', ['AE1 B T S'], []),
+        Diff('CAT', 'K AE1 T', UNKNOWN_CLUSTER, [], ['K AE1 T']),
+    ]
+    assert summarizeDiffs(diffs + diffs[:1], examples=1) == [
+        ('NG M', 2, ['HANGMAN']), ('?', 1, ['CAT']), ('B T S', 1, ['ABTS'])]
+
+
+def test_reference_order():
+    with pytest.raises(ValueError, match='HANGMAN is not in the lexicon'):
+        list(verify_lexicon(LEXICON[1:], REFERENCE))
+    with pytest.raises(ValueError, match='Expected either'):
+        list(verify_lexicon(LEXICON))
+
+
+def test_main(tmp_path, capsys):
+    reference = tmp_path / 'reference.txt'
+    reference.write_text(''.join(REFERENCE))
+    lexicon = tmp_path / 'lexicon.txt'
+    lexicon.write_text(''.join('%s  %s\n' % entry for entry in LEXICON))
+    diffs = tmp_path / 'diffs.tsv'
+
+    assert main(['verify', str(lexicon), '--reference', str(reference),
+                 '--diffs', str(diffs)]) == 1
+    out = capsys.readouterr().out
+    assert out.startswith('3 entries differ in 3 clusters\n')
+    assert 'NG M' in out
+    assert diffs.read_text().splitlines()[0] == \
+        'HANGMAN\tNG M\tHH AE1 - NG M AE2 N\tHH AE1 NG - M AE2 N'
+
+    assert main(['verify', str(lexicon), '--reference-engine', 'fsa']) == 0
+
+
+def test_main_rules(tmp_path, capsys):
+    with open(DEFAULT_RULES) as f:
+        rules = json.load(f)
+    rules['onsets'].append(['T', 'S'])
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps(rules))
+    lexicon = tmp_path / 'lexicon.txt'
+    lexicon.write_text('CAT  K AE1 T\nTSUNAMI  T S UW0 N AA1 M IY0\n')
+
+    assert main(['verify', str(lexicon), '--reference-engine', 'table',
+                 '--rules', str(path)]) == 1
+    assert capsys.readouterr().out.startswith('1 entries differ in 1 clusters\n')
+    assert main(['verify', str(lexicon), '--reference-engine', 'table',
+                 '--rules', DEFAULT_RULES]) == 0